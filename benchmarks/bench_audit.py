@@ -0,0 +1,51 @@
+# benchmarks/bench_audit.py
+"""
+/predict latency with the audit log off vs on (in-process load generator,
+same as run_benchmarks.py). With auditing on, records are written to a
+temporary directory with fsync enabled, and the run ends with a stop() that
+must persist every record.
+
+Usage: python benchmarks/bench_audit.py [--requests 4000] [--clients 1 32]
+"""
+import argparse
+import asyncio
+import tempfile
+
+from common import resample_dataset, print_table
+from run_benchmarks import drive_predict, quiet
+
+from src.app import main as api
+from src.monitoring.audit import AuditLog, SegmentWriter
+
+
+def run(n_clients: int, total_requests: int, patients: list, audit_dir=None) -> dict:
+    # A fresh log per run; the endpoints look `audit_log` up at call time
+    api.audit_log = AuditLog(api.INPUT_COLUMNS, SegmentWriter(audit_dir or "."))
+    if audit_dir is not None:
+        api.audit_log.start()
+    with quiet():
+        stats = asyncio.run(drive_predict(n_clients, total_requests, patients))
+    if audit_dir is not None:
+        api.audit_log.stop()
+        audit = api.audit_log.stats()
+        stats.update(written=audit["written"], dropped=audit["dropped"], segments=audit["segments"])
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 32])
+    args = parser.parse_args()
+
+    patients = resample_dataset(args.requests, seed=7, drop_outcome=True).to_dict(orient="records")
+    results = {}
+    for n_clients in args.clients:
+        results[f"audit off clients={n_clients}"] = run(n_clients, args.requests, patients)
+        with tempfile.TemporaryDirectory() as tmp:
+            results[f"audit on  clients={n_clients}"] = run(n_clients, args.requests, patients, tmp)
+    print_table("/predict with and without the audit log", results)
+
+
+if __name__ == "__main__":
+    main()
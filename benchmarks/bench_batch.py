@@ -0,0 +1,49 @@
+# benchmarks/bench_batch.py
+"""
+Rows/sec of /predict (one request per patient) vs /predict/batch
+(one request per batch) through the in-process FastAPI test client.
+
+Usage: python benchmarks/bench_batch.py [--sizes 1 10 100 1000 5000]
+"""
+import argparse
+import time
+
+from common import resample_dataset, print_table
+
+from fastapi.testclient import TestClient
+from src.app.main import app
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 5000])
+    parser.add_argument("--single-requests", type=int, default=200)
+    args = parser.parse_args()
+
+    records = resample_dataset(max(args.sizes), drop_outcome=True).to_dict("records")
+    results = {}
+
+    with TestClient(app) as client:
+        client.post("/predict", json=records[0])  # warm-up
+
+        start = time.perf_counter()
+        for record in records[:args.single_requests]:
+            client.post("/predict", json=record)
+        elapsed = time.perf_counter() - start
+        results["/predict x1 per request"] = {
+            "rows": args.single_requests, "rows_per_s": args.single_requests / elapsed
+        }
+
+        for size in args.sizes:
+            batch = records[:size]
+            start = time.perf_counter()
+            response = client.post("/predict/batch", json=batch)
+            elapsed = time.perf_counter() - start
+            assert response.status_code == 200, response.text
+            results[f"/predict/batch n={size}"] = {"rows": size, "rows_per_s": size / elapsed}
+
+    print_table("Throughput", results)
+
+
+if __name__ == "__main__":
+    main()
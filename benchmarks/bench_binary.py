@@ -0,0 +1,80 @@
+# benchmarks/bench_binary.py
+"""
+Bulk scoring round trip, JSON vs binary bodies: /predict/batch with a
+columnar JSON body vs /predict/binary with the float32 matrix and Arrow IPC
+layouts. Each request body is encoded once up front. The timing covers the
+in-process request (body parse, validation, scoring, response encoding) plus
+the client-side decode of the response.
+
+Usage: python benchmarks/bench_binary.py [--sizes 1000 100000]
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pyarrow as pa
+
+# JSON must be allowed to carry the large batches too; every row should hit the model
+os.environ.setdefault("MAX_BATCH_ROWS", "1000000")
+os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi.testclient import TestClient
+
+from common import resample_dataset, time_calls, print_table
+
+from src.app.main import app, INPUT_COLUMNS
+from src.app.binary_format import ARROW_MEDIA_TYPE, MATRIX_MEDIA_TYPE, decode_matrix_response, encode_matrix
+
+
+def arrow_body(X: np.ndarray) -> bytes:
+    sink = pa.BufferOutputStream()
+    table = pa.table({col: X[:, j] for j, col in enumerate(INPUT_COLUMNS)})
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000])
+    args = parser.parse_args()
+    client = TestClient(app)
+
+    def post_json(body):
+        response = client.post("/predict/batch", content=body, headers={"Content-Type": "application/json"})
+        response.raise_for_status()
+        return response.json()
+
+    def post_matrix(body):
+        response = client.post("/predict/binary", content=body, headers={"Content-Type": MATRIX_MEDIA_TYPE})
+        response.raise_for_status()
+        return decode_matrix_response(response.content)
+
+    def post_arrow(body):
+        response = client.post("/predict/binary", content=body, headers={"Content-Type": ARROW_MEDIA_TYPE})
+        response.raise_for_status()
+        return pa.ipc.open_stream(response.content).read_all()
+
+    results = {}
+    for size in args.sizes:
+        X = resample_dataset(size, drop_outcome=True)[INPUT_COLUMNS].to_numpy(dtype=np.float32)
+        bodies = {
+            "json columnar": (post_json, json.dumps(
+                {col: X[:, j].astype(np.float64).tolist() for j, col in enumerate(INPUT_COLUMNS)}
+            ).encode()),
+            "binary matrix": (post_matrix, encode_matrix(X, INPUT_COLUMNS)),
+            "arrow ipc": (post_arrow, arrow_body(X)),
+        }
+        n_iter = 20 if size <= 10_000 else 3
+        for name, (post, body) in bodies.items():
+            stats = time_calls(lambda: post(body), n_iter=n_iter, warmup=1)
+            stats["rows_per_s"] = size / (stats["mean_ms"] / 1000)
+            stats["request_kb"] = len(body) / 1024
+            results[f"{name} n={size}"] = stats
+    print_table("Bulk scoring round trip: JSON vs binary", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_client.py
+"""
+Front-end client overhead against a live API: a fresh requests.post per
+call (the old Gradio client) vs. the pooled PredictionClient vs. the
+AsyncPredictionClient with concurrent sessions, and N single calls vs.
+one /predict/batch/csv upload for the same patients.
+
+Usage: python benchmarks/bench_client.py [--calls 300] [--sessions 16] [--rows 500]
+"""
+import argparse
+import asyncio
+import time
+
+import requests
+
+from common import SAMPLE_PATIENT, resample_dataset, summarize, print_table
+from load_test import start_server
+
+from src.app.api_client import PredictionClient, AsyncPredictionClient
+
+
+def timed(fn, n_calls: int) -> dict:
+    samples = []
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    stats = summarize(samples)
+    stats["req_per_s"] = n_calls / (time.perf_counter() - start)
+    return stats
+
+
+async def concurrent_sessions(url: str, n_sessions: int, n_calls: int) -> dict:
+    samples = []
+    async with AsyncPredictionClient(url, pool_size=n_sessions) as client:
+        async def session():
+            for _ in range(n_calls // n_sessions):
+                t0 = time.perf_counter()
+                await client.predict(SAMPLE_PATIENT)
+                samples.append(time.perf_counter() - t0)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(session() for _ in range(n_sessions)))
+        elapsed = time.perf_counter() - start
+    stats = summarize(samples)
+    stats["req_per_s"] = len(samples) / elapsed
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8012)
+    args = parser.parse_args()
+
+    # The cache would turn repeated identical rows into lookups
+    server = start_server(args.port, {"PREDICTION_CACHE_SIZE": "0"})
+    url = f"http://127.0.0.1:{args.port}"
+    results = {}
+    try:
+        results["requests.post (new conn)"] = timed(
+            lambda: requests.post(f"{url}/predict", json=SAMPLE_PATIENT, timeout=15).json(), args.calls
+        )
+        with PredictionClient(url) as client:
+            results["pooled session"] = timed(lambda: client.predict(SAMPLE_PATIENT), args.calls)
+
+            patients = resample_dataset(args.rows, drop_outcome=True)
+            records = patients.to_dict(orient="records")
+            start = time.perf_counter()
+            for record in records:
+                client.predict(record)
+            single_s = time.perf_counter() - start
+            csv_body = patients.to_csv(index=False).encode()
+            start = time.perf_counter()
+            client.predict_csv(csv_body)
+            batch_s = time.perf_counter() - start
+        results[f"async x{args.sessions} sessions"] = asyncio.run(
+            concurrent_sessions(url, args.sessions, args.calls)
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+    print_table("/predict client", results)
+    print_table(f"{args.rows} patients", {
+        "single calls": {"seconds": single_s, "rows_per_s": args.rows / single_s},
+        "one CSV batch call": {"seconds": batch_s, "rows_per_s": args.rows / batch_s},
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_decision.py
+"""
+Early-exit decisions vs full scoring on data/diabetes.csv: the average number
+of trees evaluated per row, whether every label matches
+`predict_proba >= threshold`, and the time per call for InferencePipeline.decide
+vs InferencePipeline.predict_proba. Both the default tree order and an order
+fitted on the dataset (as run_pipeline does) are reported, for the whole
+file in one call and for one row per call (the /predict/decision path).
+
+Usage: python benchmarks/bench_decision.py [--artifacts diabetes-model-artifacts] [--threshold 0.4]
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from common import ROOT_DIR, resample_dataset, time_calls, print_table
+
+from src.models.early_exit import EarlyExitPlan
+from src.models.registry import load_artifact_set
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--artifacts", default=os.path.join(ROOT_DIR, "diabetes-model-artifacts"))
+    parser.add_argument("--threshold", type=float, default=0.40)
+    args = parser.parse_args()
+    pipeline = load_artifact_set(args.artifacts, artifact_format="pickle").pipeline
+    n_trees = pipeline.forest.n_trees
+
+    X = pd.read_csv(os.path.join(ROOT_DIR, "data", "diabetes.csv"))[pipeline.input_columns].to_numpy(dtype=np.float64)
+    exact = pipeline.predict_proba(X) >= args.threshold
+    plans = {
+        "default order": EarlyExitPlan(pipeline.forest),
+        "fitted order": EarlyExitPlan.fit(pipeline.forest, pipeline.transform(X).copy()),
+    }
+    print(f"🌲 {n_trees} trees, threshold {args.threshold}, {X.shape[0]} rows")
+    for name, plan in plans.items():
+        pipeline.exit_plan = plan
+        labels, lower, upper, trees_used = pipeline.decide(X, args.threshold)
+        print(f"  {name}, whole file: labels identical={np.array_equal(labels, exact)}  "
+              f"avg trees={trees_used.mean():.1f} ({trees_used.mean() / n_trees:.0%})  "
+              f"full evaluations={int((trees_used == n_trees).sum())}  "
+              f"checkpoints={plan.schedule(args.threshold)[:4]}...")
+        # One row per call: the per-row walk, checked after every tree
+        rows = [pipeline.decide(X[i:i + 1], args.threshold) for i in range(X.shape[0])]
+        labels, _, _, trees_used = (np.concatenate(column) for column in zip(*rows))
+        print(f"  {name}, row by row: labels identical={np.array_equal(labels, exact)}  "
+              f"avg trees={trees_used.mean():.1f} ({trees_used.mean() / n_trees:.0%})")
+
+    results = {}
+    for size in (1, 64, 256, X.shape[0], 10_000):
+        batch = X if size == X.shape[0] else resample_dataset(size, drop_outcome=True)[
+            pipeline.input_columns].to_numpy(dtype=np.float64)
+        n_iter = 200 if size <= 256 else 50
+        results[f"predict_proba n={size}"] = time_calls(lambda: pipeline.predict_proba(batch), n_iter=n_iter)
+        results[f"decide n={size}"] = time_calls(lambda: pipeline.decide(batch, args.threshold), n_iter=n_iter)
+        results[f"decide n={size}"]["speedup"] = (
+            results[f"predict_proba n={size}"]["mean_ms"] / results[f"decide n={size}"]["mean_ms"]
+        )
+    print_table("Early-exit decisions vs full scoring (fitted order)", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_drift.py
+"""
+Cost of drift monitoring on the request path: DriftMonitor.observe for a
+single row (the /predict case, amortized over buffer folds) and for bulk
+batches, plus a closing snapshot (PSI/KS over every feature). Also checks
+that the monitor's memory stays flat while rows stream through.
+
+Usage: python benchmarks/bench_drift.py [--rows 200000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from common import resample_dataset, time_calls, print_table
+
+from src.data.preprocess import create_missing_indicators
+from src.monitoring.drift import DriftMonitor, build_reference_profile
+
+
+def state_bytes(monitor: DriftMonitor) -> int:
+    return sum(a.nbytes for a in (monitor.counts, monitor.count, monitor.mean, monitor.m2, monitor._buffer))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000, help="single-row observe calls to stream")
+    args = parser.parse_args()
+
+    reference = resample_dataset(768, drop_outcome=True)
+    profile = build_reference_profile(create_missing_indicators(reference))
+    live = resample_dataset(args.rows, seed=3, drop_outcome=True)
+    columns = list(live.columns)
+    X = live.to_numpy(dtype=np.float64)
+    monitor = DriftMonitor()
+    monitor.set_reference(profile, columns)
+
+    # --- Single rows, as /predict sends them: every row, including the periodic buffer fold ---
+    rows = [X[i:i + 1] for i in range(X.shape[0])]
+    before = state_bytes(monitor)
+    start = time.perf_counter()
+    for row in rows:
+        monitor.observe(row)
+    per_row_us = (time.perf_counter() - start) / len(rows) * 1e6
+    results = {"observe 1 row (streamed)": {"mean_us": per_row_us, "state_bytes": state_bytes(monitor)}}
+    assert state_bytes(monitor) == before, "monitor state grew with traffic"
+
+    for size in (100, 1000, 10_000):
+        batch = X[:size]
+        stats = time_calls(lambda: monitor.observe(batch), n_iter=50 if size <= 1000 else 10)
+        stats["us_per_row"] = stats["mean_ms"] * 1000 / size
+        results[f"observe batch={size}"] = stats
+    results["snapshot (8 features)"] = time_calls(lambda: monitor.snapshot(), n_iter=200)
+    print_table("DriftMonitor overhead", results)
+
+
+if __name__ == "__main__":
+    main()
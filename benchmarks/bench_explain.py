@@ -0,0 +1,55 @@
+# benchmarks/bench_explain.py
+"""
+Cost of explaining vs predicting with the production pipeline:
+InferencePipeline.predict_proba vs InferencePipeline.explain (table lookup),
+next to a per-request decomposition that walks sklearn's decision paths.
+
+Usage: python benchmarks/bench_explain.py [--artifacts diabetes-model-artifacts]
+"""
+import argparse
+import os
+
+import numpy as np
+
+from common import ROOT_DIR, resample_dataset, time_calls, print_table
+
+from src.models.registry import load_artifact_set
+
+
+def decision_path_explain(model, features: np.ndarray) -> np.ndarray:
+    """Baseline: Saabas contributions recomputed from each tree's decision path on every call."""
+    contributions = np.zeros(features.shape)
+    X32 = features.astype(np.float32)
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        value = tree.value[:, 0, 1] / tree.value[:, 0, :].sum(axis=1)
+        paths = estimator.decision_path(X32)
+        for i in range(features.shape[0]):
+            nodes = paths.indices[paths.indptr[i]:paths.indptr[i + 1]]
+            np.add.at(contributions[i], tree.feature[nodes[:-1]], np.diff(value[nodes]))
+    return contributions / len(model.estimators_)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--artifacts", default=os.path.join(ROOT_DIR, "diabetes-model-artifacts"))
+    args = parser.parse_args()
+    pipeline = load_artifact_set(args.artifacts, artifact_format="pickle").pipeline
+    pipeline.explain(np.zeros((1, pipeline.n_inputs)))  # builds the table if the artifacts predate it
+
+    results = {}
+    for size in (1, 100, 1000):
+        X = resample_dataset(size, drop_outcome=True)[pipeline.input_columns].to_numpy(dtype=np.float64)
+        n_iter = 200 if size == 1 else 20
+        results[f"predict_proba n={size}"] = time_calls(lambda: pipeline.predict_proba(X), n_iter=n_iter)
+        results[f"explain n={size}"] = time_calls(lambda: pipeline.explain(X), n_iter=n_iter)
+        if size <= 100 and pipeline.model is not None:
+            features = pipeline.transform(X).copy()
+            results[f"decision_path walk n={size}"] = time_calls(
+                lambda: decision_path_explain(pipeline.model, features), n_iter=10, warmup=1
+            )
+    print_table("Explaining vs predicting", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_features.py
+"""
+Microbenchmark: pandas feature_engineering + reindex vs. the compiled
+NumPy FeatureKernel (preallocated output), for 1, 1k and 1M rows.
+
+Usage: python benchmarks/bench_features.py [--sizes 1 1000 1000000]
+"""
+import argparse
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from common import DATA_PATH, resample_dataset, time_calls, print_table
+
+from src.data.preprocess import create_missing_indicators
+from src.features.build_features import feature_engineering, compile_feature_kernel
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1000, 1_000_000])
+    args = parser.parse_args()
+
+    # The training layout (same as columns.pkl) comes from the full bundled dataset
+    with contextlib.redirect_stdout(io.StringIO()):
+        train_X = create_missing_indicators(pd.read_csv(DATA_PATH).drop(columns=['Outcome'])).astype(float)
+        saved_cols = list(feature_engineering(train_X).columns)
+
+    results = {}
+    for size in args.sizes:
+        X = create_missing_indicators(resample_dataset(size, drop_outcome=True)).astype(float)
+        X_values = X.to_numpy()
+        kernel = compile_feature_kernel(X.columns, saved_cols)
+        out = np.empty((size, kernel.n_features), order='F')
+        n_iter = 200 if size <= 1000 else 3
+
+        def pandas_path():
+            with contextlib.redirect_stdout(io.StringIO()):
+                feature_engineering(X, drop_first=False).reindex(columns=saved_cols, fill_value=0)
+
+        def kernel_path():
+            kernel.transform(X_values, out=out)
+
+        results[f"pandas   n={size}"] = time_calls(pandas_path, n_iter, warmup=1)
+        results[f"kernel   n={size}"] = time_calls(kernel_path, n_iter, warmup=1)
+
+    print_table("feature_engineering latency", results)
+
+
+if __name__ == "__main__":
+    main()
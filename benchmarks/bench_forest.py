@@ -0,0 +1,44 @@
+# benchmarks/bench_forest.py
+"""
+Latency of RandomForestClassifier.predict_proba vs. the flat-array
+FlatForest evaluator for batch sizes 1 to 10k (and a parity check).
+
+Usage: python benchmarks/bench_forest.py [--artifacts-dir diabetes-model-artifacts]
+"""
+import argparse
+import os
+import warnings
+
+import joblib
+import numpy as np
+
+from common import time_calls, print_table
+
+from src.models.flat_forest import FlatForest
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--artifacts-dir", default="diabetes-model-artifacts")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    model = joblib.load(os.path.join(args.artifacts_dir, "model.pkl"))
+    forest = FlatForest.from_sklearn(model)
+    # Scaled features are ~N(0, 1), so standard normal rows exercise every split
+    X_all = np.random.default_rng(42).normal(size=(max(args.sizes), model.n_features_in_))
+
+    results = {}
+    for size in args.sizes:
+        X = X_all[:size]
+        n_iter = 200 if size <= 100 else 20
+        results[f"sklearn  n={size}"] = time_calls(lambda: model.predict_proba(X), n_iter)
+        stats = time_calls(lambda: forest.predict_proba(X), n_iter)
+        stats["identical"] = bool(np.array_equal(forest.predict_proba(X), model.predict_proba(X)))
+        results[f"flat     n={size}"] = stats
+    print_table("predict_proba latency", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_impute.py
+"""
+IterativeImputer.transform vs. FastImputer (exact / fixed_point) on
+a complete single row, a single row with missing values and 1k mixed rows.
+
+Usage: python benchmarks/bench_impute.py [--artifacts-dir diabetes-model-artifacts]
+"""
+import argparse
+import os
+import warnings
+
+import joblib
+import numpy as np
+
+from common import SAMPLE_PATIENT, resample_dataset, time_calls, print_table
+
+import pandas as pd
+from src.data.fast_impute import FastImputer
+from src.data.preprocess import create_missing_indicators, MISSING_COLS
+
+
+def imputer_input(df: pd.DataFrame) -> pd.DataFrame:
+    X = create_missing_indicators(df)
+    for col in MISSING_COLS:
+        X[col] = X[col].replace(0, np.nan)
+    return X
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--artifacts-dir", default="diabetes-model-artifacts")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    imputer = joblib.load(os.path.join(args.artifacts_dir, "mice_imputer.pkl"))
+    engines = {
+        "IterativeImputer": imputer,
+        "FastImputer exact": FastImputer(imputer, mode="exact"),
+        "FastImputer fixed_point": FastImputer(imputer, mode="fixed_point"),
+    }
+    cases = {
+        "1 row, complete": imputer_input(pd.DataFrame([SAMPLE_PATIENT])),
+        "1 row, missing": imputer_input(pd.DataFrame([{**SAMPLE_PATIENT, "Insulin": 0, "SkinThickness": 0}])),
+        "1k rows, mixed": imputer_input(resample_dataset(1000, drop_outcome=True)),
+    }
+
+    results = {}
+    for case, X in cases.items():
+        reference = imputer.transform(X)
+        for name, engine in engines.items():
+            stats = time_calls(lambda: engine.transform(X), n_iter=200)
+            stats["max_abs_err"] = float(np.max(np.abs(engine.transform(X) - reference)))
+            results[f"{case} | {name}"] = stats
+    print_table("Imputation latency", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/bench_ingest.py
+"""
+Bulk request parsing: Pydantic (TypeAdapter(List[DiabetesInput]) + per-row
+matrix build) vs. the vectorized BulkParser on row JSON, columnar JSON and
+CSV bodies. Parsing + validation + raw matrix only, no scoring.
+
+Usage: python benchmarks/bench_ingest.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import json
+from typing import List
+
+from pydantic import TypeAdapter
+
+from common import resample_dataset, time_calls, print_table
+
+from src.app.main import DiabetesInput, INPUT_COLUMNS, bulk_parser, records_to_matrix
+
+ADAPTER = TypeAdapter(List[DiabetesInput])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        df = resample_dataset(size, drop_outcome=True)
+        rows_body = df.to_json(orient="records").encode()
+        columnar_body = json.dumps({col: df[col].tolist() for col in INPUT_COLUMNS}).encode()
+        csv_body = df.to_csv(index=False).encode()
+        n_iter = 20 if size <= 10_000 else 3
+
+        runs = {
+            "pydantic rows": lambda: records_to_matrix(ADAPTER.validate_json(rows_body), INPUT_COLUMNS),
+            "bulk rows": lambda: bulk_parser.parse_json(rows_body).to_matrix(INPUT_COLUMNS),
+            "bulk columnar": lambda: bulk_parser.parse_json(columnar_body).to_matrix(INPUT_COLUMNS),
+            "bulk csv": lambda: bulk_parser.parse_csv(csv_body).to_matrix(INPUT_COLUMNS),
+        }
+        for label, fn in runs.items():
+            stats = time_calls(fn, n_iter, warmup=1)
+            results[f"{label:<14} n={size}"] = {
+                "p50_ms": stats["p50_ms"], "rows_per_s": size / (stats["p50_ms"] / 1000.0)
+            }
+
+    print_table("Bulk ingestion (parse + validate + matrix)", results)
+
+
+if __name__ == "__main__":
+    main()
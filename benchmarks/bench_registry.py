@@ -0,0 +1,62 @@
+# benchmarks/bench_registry.py
+"""
+Per-request latency of the /predict pipeline with artifacts read from disk
+on every call (old behaviour) vs. handed in by the in-memory registry.
+
+Usage: python benchmarks/bench_registry.py [--artifacts-dir diabetes-model-artifacts]
+Requires a trained artifact set (python run_pipeline.py).
+"""
+import argparse
+import os
+import pandas as pd
+
+from common import SAMPLE_PATIENT, time_calls, print_table
+
+import src.data.preprocess as preprocess
+import src.features.build_features as build_features_module
+from src.data.preprocess import preprocess_data
+from src.features.build_features import build_features
+from src.models.registry import ArtifactRegistry
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--artifacts-dir", default="diabetes-model-artifacts")
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    # The disk path reads from the module-level ARTIFACTS_DIR of each stage
+    preprocess.ARTIFACTS_DIR = args.artifacts_dir
+    build_features_module.ARTIFACTS_DIR = args.artifacts_dir
+
+    registry = ArtifactRegistry(args.artifacts_dir)
+    current = registry.get()
+    input_df = pd.DataFrame([SAMPLE_PATIENT])
+
+    def per_request_disk_load():
+        X_clean = preprocess_data(input_df, is_training=False)
+        X_scaled, _ = build_features(X_clean, is_training=False)
+        current.model.predict_proba(X_scaled)
+
+    def registry_by_reference():
+        X_clean = preprocess_data(input_df, is_training=False, imputer=current.imputer)
+        X_scaled, _ = build_features(
+            X_clean, is_training=False, scaler=current.scaler, columns=current.columns
+        )
+        current.model.predict_proba(X_scaled)
+
+    X_raw = input_df[current.pipeline.input_columns].to_numpy(dtype=float)
+
+    def fused_pipeline():
+        current.pipeline.predict_proba(X_raw)
+
+    results = {
+        "before (joblib.load/request)": time_calls(per_request_disk_load, args.iterations),
+        "after (registry)": time_calls(registry_by_reference, args.iterations),
+        "fused InferencePipeline": time_calls(fused_pipeline, args.iterations),
+    }
+    print_table(f"Per-request latency ({os.path.abspath(args.artifacts_dir)})", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# benchmarks/bench_score.py
+"""
+Throughput and scaling of the offline scorer (score.py) by worker count,
+on data/diabetes.csv resampled up to millions of rows.
+
+Usage: python benchmarks/bench_score.py [--rows 2000000] [--workers 1 2 4]
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+
+from common import ROOT_DIR, resample_dataset, print_table
+
+from score import score_file
+
+ARTIFACTS_DIR = os.path.join(ROOT_DIR, "diabetes-model-artifacts")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--shard-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, "patients.parquet")
+        resample_dataset(args.rows).to_parquet(input_path, index=False)
+        baseline = None
+        for workers in args.workers:
+            output_path = os.path.join(tmp_dir, f"scores_{workers}.parquet")
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = score_file(input_path, output_path, ARTIFACTS_DIR, workers, args.shard_size)
+            baseline = baseline or stats["rows_per_s"]
+            results[f"workers={workers}"] = {
+                "rows": stats["rows"],
+                "seconds": stats["seconds"],
+                "rows_per_s": stats["rows_per_s"],
+                "speedup": stats["rows_per_s"] / baseline,
+            }
+
+    print_table(f"Bulk scoring, {args.rows} rows (cores available: {os.cpu_count()})", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bench_startup.py
+"""
+API cold start, pickled pipeline vs. mmap artifact bundle (ARTIFACT_FORMAT).
+
+Every measurement uses a fresh interpreter:
+  * phases: `import src.app.main`, artifact load, first prediction
+  * server: process spawn -> /ready returns 200 -> first /predict answered
+
+Usage: python benchmarks/bench_startup.py [--repeats 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+from common import ROOT_DIR, SAMPLE_PATIENT, print_table
+
+PHASES_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import src.app.main as api
+imported = time.perf_counter()
+current = api.registry.get()
+loaded = time.perf_counter()
+api.warm_up(current)
+predicted = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - start, "load_s": loaded - imported, "first_pred_s": predicted - loaded,
+    "sklearn_loaded": "sklearn" in sys.modules,
+}))
+"""
+
+
+def measure_phases(env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PHASES_SCRIPT], cwd=ROOT_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure_server(env: dict, port: int) -> dict:
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/ready", timeout=1).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.perf_counter() - start > 60:
+                raise RuntimeError("API did not become ready")
+            time.sleep(0.01)
+        ready = time.perf_counter()
+        httpx.post(f"http://127.0.0.1:{port}/predict", json=SAMPLE_PATIENT).raise_for_status()
+        return {"ready_s": ready - start, "first_response_s": time.perf_counter() - start}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8013)
+    args = parser.parse_args()
+
+    # Make sure the bundle exists next to the pickled pipeline
+    subprocess.run([sys.executable, "src/models/bundle.py"], cwd=ROOT_DIR, check=True, stdout=subprocess.DEVNULL)
+
+    results = {}
+    for artifact_format in ("pickle", "bundle"):
+        env = {**os.environ, "ARTIFACT_FORMAT": artifact_format, "LOG_LEVEL": "WARNING"}
+        phases = [measure_phases(env) for _ in range(args.repeats)]
+        servers = [measure_server(env, args.port) for _ in range(args.repeats)]
+        row = {key: float(np.median([p[key] for p in phases])) for key in ("import_s", "load_s", "first_pred_s")}
+        row.update({key: float(np.median([s[key] for s in servers])) for key in ("ready_s", "first_response_s")})
+        row["sklearn"] = phases[0]["sklearn_loaded"]
+        results[artifact_format] = row
+
+    print_table(f"API cold start (median of {args.repeats})", results)
+
+
+if __name__ == "__main__":
+    main()
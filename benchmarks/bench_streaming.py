@@ -0,0 +1,106 @@
+# benchmarks/bench_streaming.py
+"""
+Chunked streaming ingestion vs. the in-memory path on synthetic files.
+
+For each size a CSV is generated (chunk by chunk) from data/diabetes.csv,
+then every mode runs in its own subprocess so its peak RSS is measured
+cleanly:
+  in-memory   one pd.read_csv + one transform of the whole matrix + one write
+  streaming   load_data_chunks -> pipeline chunk by chunk -> appended Parquet
+  fit         two-pass out-of-core fit of imputer/columns/scaler (fit_streaming)
+The in-memory baseline is skipped above --baseline-max-rows (it needs
+several GB at 10M rows, which is the problem streaming solves).
+
+Usage: python benchmarks/bench_streaming.py [--sizes 1000000 10000000] [--chunk-size 100000]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from common import DATA_PATH, ROOT_DIR, print_table
+
+ARTIFACTS_DIR = os.path.join(ROOT_DIR, "diabetes-model-artifacts")
+GENERATE_CHUNK = 500_000
+
+
+def generate_csv(path: str, n_rows: int, seed: int = 42):
+    source = pd.read_csv(DATA_PATH)
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, GENERATE_CHUNK):
+        size = min(GENERATE_CHUNK, n_rows - start)
+        sample = source.iloc[rng.integers(0, len(source), size=size)]
+        sample.to_csv(path, mode="a" if start else "w", header=start == 0, index=False)
+
+
+def run_mode(mode: str, input_path: str, output_path: str, chunk_size: int) -> dict:
+    """Runs inside the measurement subprocess."""
+    from src.models.registry import load_artifact_set
+    from src.data.streaming import stream_transform, ChunkWriter, transform_chunks, fit_streaming
+
+    pipeline = load_artifact_set(ARTIFACTS_DIR).pipeline
+    start = time.perf_counter()
+    if mode == "in-memory":
+        df = pd.read_csv(input_path)
+        with ChunkWriter(output_path) as writer:
+            for features in transform_chunks([df], pipeline):
+                writer.write(features)
+        rows = len(df)
+    elif mode == "fit":
+        rows = fit_streaming(input_path, os.path.dirname(output_path), chunk_size)["rows"]
+    else:
+        rows = stream_transform(input_path, output_path, pipeline=pipeline, chunk_size=chunk_size)["rows"]
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_s": rows / seconds,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+    }
+
+
+def measure(mode: str, input_path: str, output_path: str, chunk_size: int) -> dict:
+    proc = subprocess.run(
+        [sys.executable, __file__, "--worker", mode, input_path, output_path, str(chunk_size)],
+        capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        mode, input_path, output_path, chunk_size = sys.argv[2:6]
+        print(json.dumps(run_mode(mode, input_path, output_path, int(chunk_size))))
+        return
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--baseline-max-rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            input_path = os.path.join(tmp_dir, f"patients_{size}.csv")
+            generate_csv(input_path, size)
+            modes = ["in-memory", "streaming"] if size <= args.baseline_max_rows else ["streaming"]
+            for mode in modes + ["fit"]:
+                output_path = os.path.join(tmp_dir, f"features_{size}_{mode}.parquet")
+                results[f"{mode:<10} n={size}"] = measure(mode, input_path, output_path, args.chunk_size)
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+            os.remove(input_path)
+
+    print_table(f"Streaming ingestion (chunk_size={args.chunk_size})", results)
+
+
+if __name__ == "__main__":
+    main()
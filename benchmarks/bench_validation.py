@@ -0,0 +1,56 @@
+# benchmarks/bench_validation.py
+"""
+Validation time: Great Expectations suite vs. the native vectorized engine
+(in memory and streamed from CSV in chunks), on data/diabetes.csv
+resampled to millions of rows. GE is skipped above --ge-max-rows.
+
+Usage: python benchmarks/bench_validation.py [--sizes 1000000 10000000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from common import resample_dataset, print_table
+
+from src.data.validate_data import DIABETES_ENGINE, validate_data_with_ge, validate_file
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--ge-max-rows", type=int, default=10_000_000)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            df = resample_dataset(size)
+            path = os.path.join(tmp_dir, f"patients_{size}.csv")
+            df.to_csv(path, index=False)
+
+            if size <= args.ge_max_rows:
+                results[f"great_expectations n={size}"] = {"seconds": timed(lambda: validate_data_with_ge(df))}
+            results[f"native in-memory   n={size}"] = {"seconds": timed(lambda: DIABETES_ENGINE.validate(df))}
+            # Includes CSV parsing, which dominates
+            results[f"native streamed    n={size}"] = {
+                "seconds": timed(lambda: validate_file(path, args.chunk_size))
+            }
+            del df
+            os.remove(path)
+
+    print_table("Data validation", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_workers_rss.py
+"""
+Memory per worker for the pre-fork server (src/app/serve.py).
+
+Compares every worker loading its own artifacts (--no-preload) with loading
+once in the parent (copy-on-write), with and without ARTIFACT_MMAP_MODE=r.
+RSS counts shared pages in every process; PSS splits them between the
+processes sharing them, so sum(PSS) is the real footprint.
+
+Usage: python benchmarks/bench_workers_rss.py [--workers 2 4]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from common import ROOT_DIR, SAMPLE_PATIENT, print_table
+
+from src.app.serve import process_memory
+
+MODES = {
+    "per-worker load": (["--no-preload"], {}),
+    "preload (COW)": ([], {}),
+    "preload + mmap": ([], {"ARTIFACT_MMAP_MODE": "r"}),
+}
+
+
+def children_of(pid: int):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def measure(workers: int, flags, env, port: int) -> dict:
+    server = subprocess.Popen(
+        [sys.executable, "src/app/serve.py", "--workers", str(workers), "--port", str(port)] + flags,
+        cwd=ROOT_DIR, env={**os.environ, **env}, stdout=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/predict"
+        for _ in range(150):
+            try:
+                if httpx.post(url, json=SAMPLE_PATIENT).status_code == 200:
+                    break
+            except httpx.TransportError:
+                time.sleep(0.2)
+        # Warm every worker's code paths before measuring
+        with httpx.Client() as client:
+            for _ in range(50 * workers):
+                client.post(url, json=SAMPLE_PATIENT, headers={"Connection": "close"})
+        time.sleep(0.5)
+
+        per_worker = [process_memory(pid) for pid in children_of(server.pid)]
+        parent = process_memory(server.pid)
+        return {
+            "workers": len(per_worker),
+            "rss_per_worker_mb": sum(w["rss_mb"] for w in per_worker) / len(per_worker),
+            "pss_per_worker_mb": sum(w["pss_mb"] for w in per_worker) / len(per_worker),
+            "private_per_worker_mb": sum(w["private_mb"] for w in per_worker) / len(per_worker),
+            "total_pss_mb": parent["pss_mb"] + sum(w["pss_mb"] for w in per_worker),
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--port", type=int, default=8021)
+    args = parser.parse_args()
+
+    results = {}
+    for workers in args.workers:
+        for label, (flags, env) in MODES.items():
+            results[f"{label} x{workers}"] = measure(workers, flags, env, args.port)
+    print_table("Worker memory", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/common.py
+# Shared helpers for the benchmark scripts (timing, percentiles, synthetic data).
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT_DIR)
+
+DATA_PATH = os.path.join(ROOT_DIR, "data", "diabetes.csv")
+
+SAMPLE_PATIENT = {
+    "Pregnancies": 1, "Glucose": 100, "BloodPressure": 70,
+    "SkinThickness": 20, "Insulin": 50, "BMI": 23.0,
+    "DiabetesPedigreeFunction": 0.3, "Age": 25
+}
+
+
+def summarize(samples_s) -> dict:
+    """Latency summary in milliseconds for a list of per-call durations (seconds)."""
+    ms = np.asarray(samples_s, dtype=float) * 1000.0
+    return {
+        "n": int(ms.size),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+
+def time_calls(fn, n_iter: int = 200, warmup: int = 10) -> dict:
+    """Calls `fn()` repeatedly and returns its latency summary."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(n_iter):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def resample_dataset(n_rows: int, seed: int = 42, drop_outcome: bool = False) -> pd.DataFrame:
+    """Synthetic dataset of `n_rows` drawn with replacement from data/diabetes.csv."""
+    df = pd.read_csv(DATA_PATH)
+    rng = np.random.default_rng(seed)
+    sample = df.iloc[rng.integers(0, len(df), size=n_rows)].reset_index(drop=True)
+    if drop_outcome:
+        sample = sample.drop(columns=['Outcome'])
+    return sample
+
+
+def _fmt(value) -> str:
+    if not isinstance(value, float):
+        return str(value)
+    return f"{value:.3f}" if value == 0 or abs(value) >= 1e-3 else f"{value:.2e}"
+
+
+def print_table(title: str, rows: dict):
+    print(f"\n=== {title} ===")
+    for label, stats in rows.items():
+        cells = " | ".join(f"{k}={_fmt(v)}" for k, v in stats.items())
+        print(f"{label:<28} {cells}")
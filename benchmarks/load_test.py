@@ -0,0 +1,104 @@
+# benchmarks/load_test.py
+"""
+Concurrent-client load test for /predict (throughput + latency percentiles).
+
+By default it starts the API with uvicorn on a local port, once with
+micro-batching on and once with MICRO_BATCHING=0, and drives each with
+1, 50 and 500 concurrent clients. Pass --url to hit an already running server.
+
+Usage: python benchmarks/load_test.py [--clients 1 50 500] [--requests 2000] [--url http://127.0.0.1:8001]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from common import ROOT_DIR, SAMPLE_PATIENT, summarize, print_table
+
+
+async def run_clients(url: str, n_clients: int, total_requests: int) -> dict:
+    latencies, statuses = [], {}
+    per_client = max(1, total_requests // n_clients)
+    limits = httpx.Limits(max_connections=n_clients, max_keepalive_connections=n_clients)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        async def one_client():
+            for _ in range(per_client):
+                start = time.perf_counter()
+                try:
+                    response = await client.post("/predict", json=SAMPLE_PATIENT)
+                    status = response.status_code
+                except httpx.TransportError:
+                    status = "conn_error"
+                latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_client() for _ in range(n_clients)))
+        elapsed = time.perf_counter() - start
+
+    stats = summarize(latencies)
+    stats["req_per_s"] = len(latencies) / elapsed
+    stats["status"] = ",".join(f"{code}:{count}" for code, count in sorted(statuses.items(), key=str))
+    return stats
+
+
+def start_server(port: int, extra_env: dict) -> subprocess.Popen:
+    env = {**os.environ, **extra_env}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app.main:app", "--port", str(port),
+         "--log-level", "warning", "--timeout-keep-alive", "60"],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            if httpx.post(f"http://127.0.0.1:{port}/predict", json=SAMPLE_PATIENT).status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("API did not come up")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--requests", type=int, default=2000, help="total requests per level")
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--port", type=int, default=8011)
+    args = parser.parse_args()
+
+    if args.url:
+        targets = {"external": (args.url, None)}
+    else:
+        targets = {
+            "micro-batching": ({"MICRO_BATCHING": "1"}),
+            "inline": ({"MICRO_BATCHING": "0"}),
+        }
+
+    results = {}
+    for label, target in targets.items():
+        server = None
+        if args.url:
+            url = target[0]
+        else:
+            server = start_server(args.port, {**target, "PYTHONUNBUFFERED": "1"})
+            url = f"http://127.0.0.1:{args.port}"
+        try:
+            for n_clients in args.clients:
+                stats = asyncio.run(run_clients(url, n_clients, args.requests))
+                results[f"{label} clients={n_clients}"] = stats
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+    print_table("/predict load test", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# benchmarks/run_benchmarks.py
+"""
+Benchmark suite: every training / inference stage plus the HTTP service,
+with a JSON history and regression checks against a stored baseline.
+
+Stages, timed at each dataset size (rows resampled from data/diabetes.csv):
+  load_data, validate_data, preprocess_train, preprocess_infer,
+  feature_engineering, build_features, train_model (sizes <= --train-max-rows)
+HTTP: /predict throughput and p50/p95/p99 latency from an in-process load
+generator (httpx.AsyncClient over ASGITransport: no sockets, no server).
+
+Every run is appended to benchmarks/results/history.jsonl. --check compares
+it with benchmarks/results/baseline.json and exits 1 on a regression beyond
+--tolerance; --save-baseline makes this run the new baseline. Training
+stages write their artifacts (and MLflow runs) to a temporary directory.
+
+Usage: python benchmarks/run_benchmarks.py [--sizes 1000 10000 50000] [--repeats 3] [--check] [--save-baseline]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from common import ROOT_DIR, resample_dataset, summarize, print_table
+
+# Every request should run the model: distinct patients still repeat after resampling
+os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+# Per-request INFO logs (API + httpx) would dominate the in-process timings
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+HISTORY_PATH = os.path.join(RESULTS_DIR, "history.jsonl")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+REGRESSION_TOLERANCE = float(os.getenv("BENCH_REGRESSION_TOLERANCE", "0.25"))
+# Metric -> (direction, smallest absolute change that counts; below it is timer noise)
+CHECKED_METRICS = {
+    "median_s": ("lower", 0.005),
+    "p95_ms": ("lower", 1.0),
+    "req_per_s": ("higher", 0.0),
+}
+
+
+@contextlib.contextmanager
+def quiet():
+    """The pipeline stages print progress; keep it out of the report."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def scratch_workdir():
+    """Runs training stages in a temp dir: their relative artifacts/ and mlruns/ land there."""
+    previous_cwd, previous_uri = os.getcwd(), os.environ.get("MLFLOW_TRACKING_URI")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.environ["MLFLOW_TRACKING_URI"] = f"file:{os.path.join(tmp, 'mlruns')}"
+        try:
+            yield tmp
+        finally:
+            os.chdir(previous_cwd)
+            if previous_uri is None:
+                os.environ.pop("MLFLOW_TRACKING_URI", None)
+            else:
+                os.environ["MLFLOW_TRACKING_URI"] = previous_uri
+
+
+def time_stage(fn, repeats: int) -> dict:
+    """Median wall time of `fn()` over `repeats` calls; returns the last result too."""
+    samples, result = [], None
+    for _ in range(repeats):
+        with quiet():
+            start = time.perf_counter()
+            result = fn()
+            samples.append(time.perf_counter() - start)
+    return {"median_s": float(np.median(samples)), "min_s": float(np.min(samples))}, result
+
+
+def run_stage_benchmarks(sizes, repeats: int, train_max_rows: int) -> dict:
+    import mlflow
+    from data.load_data import load_data
+    from data.validate_data import validate_data
+    from data.preprocess import preprocess_data
+    from features.build_features import feature_engineering, build_features
+    from models.train_model import train_model
+
+    results = {}
+    with scratch_workdir() as tmp:
+        for size in sizes:
+            df = resample_dataset(size)
+            csv_path = os.path.join(tmp, f"diabetes_{size}.csv")
+            df.to_csv(csv_path, index=False)
+            X, y = df.drop(columns=["Outcome"]), df["Outcome"]
+
+            stages = {}
+            stages["load_data"], _ = time_stage(lambda: load_data(csv_path), repeats)
+            stages["validate_data"], _ = time_stage(lambda: validate_data(df), repeats)
+            stages["preprocess_train"], X_clean = time_stage(lambda: preprocess_data(X, is_training=True), repeats)
+            stages["preprocess_infer"], _ = time_stage(lambda: preprocess_data(X, is_training=False), repeats)
+            stages["feature_engineering"], _ = time_stage(lambda: feature_engineering(X_clean), repeats)
+            train_df = X_clean.assign(Outcome=y.to_numpy())
+            stages["build_features"], (X_scaled, y_scaled) = time_stage(
+                lambda: build_features(train_df, is_training=True), repeats
+            )
+            if size <= train_max_rows:
+                def fit():
+                    with mlflow.start_run(run_name=f"bench_train_{size}"):
+                        return train_model(X_scaled, y_scaled)
+                stages["train_model"], _ = time_stage(fit, repeats)
+
+            for stage, stats in stages.items():
+                stats["rows_per_s"] = size / stats["median_s"]
+                results[f"{stage} n={size}"] = stats
+    return results
+
+
+async def drive_predict(n_clients: int, total_requests: int, patients: list) -> dict:
+    import httpx
+    from src.app.main import app
+
+    latencies, errors = [], 0
+    per_client = max(1, total_requests // n_clients)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm-up: lazy artifact load, scratch buffers, batcher start
+        (await client.post("/predict", json=patients[0])).raise_for_status()
+
+        async def one_client(offset: int):
+            nonlocal errors
+            for i in range(per_client):
+                start = time.perf_counter()
+                response = await client.post("/predict", json=patients[(offset + i) % len(patients)])
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code != 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_client(c * per_client) for c in range(n_clients)))
+        elapsed = time.perf_counter() - start
+
+    stats = summarize(latencies)
+    stats["req_per_s"] = len(latencies) / elapsed
+    stats["errors"] = errors
+    return stats
+
+
+def run_http_benchmarks(clients, total_requests: int) -> dict:
+    patients = resample_dataset(max(total_requests, 1), seed=7, drop_outcome=True).to_dict(orient="records")
+    results = {}
+    for n_clients in clients:
+        with quiet():
+            stats = asyncio.run(drive_predict(n_clients, total_requests, patients))
+        results[f"http_predict clients={n_clients}"] = stats
+    return results
+
+
+# --- History / baseline ---
+def git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def make_record(results: dict, args) -> dict:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "sizes": args.sizes,
+        "repeats": args.repeats,
+        "results": results,
+    }
+
+
+def append_history(record: dict, path: str = HISTORY_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def find_regressions(current: dict, baseline: dict, tolerance: float = REGRESSION_TOLERANCE) -> list:
+    """(benchmark, metric, baseline value, current value, relative change) for every regression."""
+    regressions = []
+    for name, stats in current.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric, (direction, min_delta) in CHECKED_METRICS.items():
+            if metric not in stats or metric not in reference or not reference[metric]:
+                continue
+            old, new = reference[metric], stats[metric]
+            worse_by = (new - old) if direction == "lower" else (old - new)
+            if worse_by > min_delta and worse_by / old > tolerance:
+                regressions.append((name, metric, old, new, worse_by / old))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 50_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--train-max-rows", type=int, default=10_000, help="largest size train_model runs at")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 32])
+    parser.add_argument("--requests", type=int, default=2000, help="/predict calls per client level")
+    parser.add_argument("--skip-http", action="store_true")
+    parser.add_argument("--check", action="store_true", help="compare with the baseline, exit 1 on regression")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    # The training modules are imported the way run_pipeline.py imports them
+    sys.path.append(os.path.join(ROOT_DIR, "src"))
+
+    results = run_stage_benchmarks(args.sizes, args.repeats, args.train_max_rows)
+    print_table("Pipeline stages (median of repeats)", results)
+    if not args.skip_http:
+        http_results = run_http_benchmarks(args.clients, args.requests)
+        print_table("/predict, in-process load generator", http_results)
+        results.update(http_results)
+
+    record = make_record(results, args)
+    append_history(record, args.history)
+    print(f"\n📝 Appended run {record['commit']} to {args.history}")
+
+    exit_code = 0
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"⚠️ No baseline at {args.baseline}; run with --save-baseline first.")
+        else:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+            regressions = find_regressions(results, baseline["results"], args.tolerance)
+            print(f"\n=== Regression check vs {baseline['commit']} (tolerance {args.tolerance:.0%}) ===")
+            for name, metric, old, new, change in regressions:
+                print(f"❌ {name:<32} {metric}: {old:.4g} -> {new:.4g} ({change:+.0%} worse)")
+            if regressions:
+                exit_code = 1
+            else:
+                print("✅ No regressions.")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(record, f, indent=2)
+        print(f"📌 Baseline saved: {args.baseline}")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
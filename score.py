@@ -0,0 +1,135 @@
+# score.py
+"""
+Offline bulk scoring: patients file in, predictions + probabilities out.
+
+The artifact set is loaded once in the parent. The input is read in
+shards (compact-dtype chunks), each shard is scored as one vectorized
+batch by a process-pool worker, and results are written in shard order,
+so the output rows line up with the input rows. Only a bounded number of
+shards is in flight at a time, so memory doesn't grow with the file.
+
+Usage: python score.py data/diabetes.csv predictions.parquet --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data.constants import CLASSIFICATION_THRESHOLD
+from src.data.load_data import load_data_chunks, DEFAULT_CHUNK_SIZE
+from src.data.streaming import ChunkWriter
+from src.models.registry import load_artifact_set, DEFAULT_ARTIFACTS_DIR
+
+# Same decision threshold as the API
+DEFAULT_THRESHOLD = CLASSIFICATION_THRESHOLD
+SCORE_WORKERS = int(os.getenv("SCORE_WORKERS", "0")) or os.cpu_count() or 1
+SHARDS_IN_FLIGHT_PER_WORKER = 2
+
+# Set in the parent before the pool forks, so workers inherit it without reloading
+_pipeline = None
+
+
+def _init_worker(artifacts_dir: str):
+    global _pipeline
+    if _pipeline is None:  # spawn-based platforms: load once per worker
+        _pipeline = load_artifact_set(artifacts_dir).pipeline
+
+
+def score_shard(X_raw: np.ndarray) -> np.ndarray:
+    return _pipeline.predict_proba(X_raw)
+
+
+def read_shards(input_path: str, shard_size: int) -> Iterator[pd.DataFrame]:
+    if input_path.endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(input_path).iter_batches(batch_size=shard_size):
+            yield batch.to_pandas()
+    else:
+        yield from load_data_chunks(input_path, shard_size)
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    artifacts_dir: str = DEFAULT_ARTIFACTS_DIR,
+    workers: int = SCORE_WORKERS,
+    shard_size: int = DEFAULT_CHUNK_SIZE,
+    threshold: float = DEFAULT_THRESHOLD,
+    keep_columns: bool = False,
+) -> dict:
+    """Scores every row of `input_path` and writes `prediction`/`probability` in input order."""
+    global _pipeline
+    _pipeline = load_artifact_set(artifacts_dir).pipeline
+    print(f"✅ Pipeline {_pipeline.version} loaded. Scoring with {workers} worker(s), shards of {shard_size} rows...")
+
+    def to_output(shard: Optional[pd.DataFrame], probabilities: np.ndarray) -> pd.DataFrame:
+        out = shard.reset_index(drop=True) if shard is not None else pd.DataFrame(index=range(len(probabilities)))
+        out["prediction"] = (probabilities >= threshold).astype(np.int8)
+        out["probability"] = probabilities.astype(np.float32)
+        return out
+
+    start = time.perf_counter()
+    n_rows = n_shards = 0
+    with ChunkWriter(output_path) as writer:
+        if workers <= 1:
+            for shard in read_shards(input_path, shard_size):
+                probabilities = score_shard(shard[_pipeline.input_columns].to_numpy(np.float64))
+                writer.write(to_output(shard if keep_columns else None, probabilities))
+                n_rows += len(shard)
+                n_shards += 1
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(artifacts_dir,)) as pool:
+                pending = deque()
+                max_pending = workers * SHARDS_IN_FLIGHT_PER_WORKER
+
+                def drain_one():
+                    shard, future = pending.popleft()
+                    writer.write(to_output(shard, future.result()))
+
+                for shard in read_shards(input_path, shard_size):
+                    X_raw = shard[_pipeline.input_columns].to_numpy(np.float64)
+                    # Only hold on to the input rows while in flight if they go to the output
+                    pending.append((shard if keep_columns else None, pool.submit(score_shard, X_raw)))
+                    n_rows += len(shard)
+                    n_shards += 1
+                    if len(pending) >= max_pending:
+                        drain_one()
+                while pending:
+                    drain_one()
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "rows": n_rows,
+        "shards": n_shards,
+        "workers": workers,
+        "seconds": seconds,
+        "rows_per_s": n_rows / seconds if seconds > 0 else 0.0,
+    }
+    print(f"🏁 Scored {n_rows} rows in {seconds:.2f}s ({stats['rows_per_s']:,.0f} rows/s) -> {output_path}")
+    return stats
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Offline bulk scoring for the Diabetes model")
+    parser.add_argument("input_path", help="CSV or Parquet file with the 8 patient columns")
+    parser.add_argument("output_path", help=".csv or .parquet")
+    parser.add_argument("--artifacts-dir", default=DEFAULT_ARTIFACTS_DIR)
+    parser.add_argument("--workers", type=int, default=SCORE_WORKERS)
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--keep-columns", action="store_true", help="Copy the input columns into the output")
+    args = parser.parse_args(argv)
+    return score_file(
+        args.input_path, args.output_path, args.artifacts_dir, args.workers,
+        args.shard_size, args.threshold, args.keep_columns,
+    )
+
+
+if __name__ == "__main__":
+    main()
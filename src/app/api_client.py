@@ -0,0 +1,185 @@
+# src/app/api_client.py
+"""
+HTTP clients for the prediction API (used by the Gradio front end).
+
+Both clients keep a pool of keep-alive connections for their whole life
+instead of opening a TCP connection per request, and retry transient
+failures (connection refused while the API is still starting, timeouts,
+502/503/504) a bounded number of times with exponential backoff, honouring
+the API's Retry-After header. Every endpoint they call is a pure function
+of the request body, so retrying a POST is safe.
+
+- PredictionClient: blocking, requests.Session + HTTPAdapter/urllib3 Retry.
+- AsyncPredictionClient: httpx.AsyncClient with the same retry schedule,
+  so concurrent UI sessions don't each hold a worker thread while waiting.
+"""
+import asyncio
+import os
+from typing import Optional, Union
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Global Configuration
+API_BASE_URL = os.getenv("API_BASE_URL", "http://127.0.0.1:8001")
+API_TIMEOUT_S = float(os.getenv("API_TIMEOUT_S", "15"))
+API_CONNECT_TIMEOUT_S = float(os.getenv("API_CONNECT_TIMEOUT_S", "3"))
+API_RETRIES = int(os.getenv("API_RETRIES", "4"))
+API_BACKOFF_S = float(os.getenv("API_BACKOFF_S", "0.5"))  # waits 0, 2x, 4x, 8x ... this between retries
+API_BACKOFF_MAX_S = 10.0
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "16"))
+RETRY_STATUSES = (502, 503, 504)
+
+
+class PredictionAPIError(RuntimeError):
+    """The API answered with an error status (after any retries)."""
+
+    def __init__(self, status_code: int, detail):
+        super().__init__(f"API error {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+def backoff_delay(retry: int, backoff_s: float = API_BACKOFF_S, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before retry number `retry` (1-based), same schedule as urllib3's Retry."""
+    if retry_after is not None:
+        try:
+            return min(max(float(retry_after), 0.0), API_BACKOFF_MAX_S)
+        except ValueError:
+            pass
+    if retry <= 1:
+        return 0.0
+    return min(backoff_s * (2 ** (retry - 1)), API_BACKOFF_MAX_S)
+
+
+def _decode(status_code: int, content_type: str, body_json, body_text: str) -> dict:
+    if status_code >= 400:
+        detail = body_text
+        if "json" in content_type:
+            detail = body_json().get("detail", detail)
+        raise PredictionAPIError(status_code, detail)
+    return body_json()
+
+
+class PredictionClient:
+    """Blocking client with a pooled, retrying requests.Session."""
+
+    def __init__(
+        self,
+        base_url: str = API_BASE_URL,
+        timeout_s: float = API_TIMEOUT_S,
+        connect_timeout_s: float = API_CONNECT_TIMEOUT_S,
+        retries: int = API_RETRIES,
+        backoff_s: float = API_BACKOFF_S,
+        pool_size: int = API_POOL_SIZE,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout_s, timeout_s)
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_s,
+            backoff_max=API_BACKOFF_MAX_S,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post(self, path: str, **kwargs) -> dict:
+        response = self.session.post(f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        return _decode(
+            response.status_code, response.headers.get("content-type", ""), response.json, response.text
+        )
+
+    def predict(self, patient: dict) -> dict:
+        return self._post("/predict", json=patient)
+
+    def predict_batch(self, patients: Union[list, dict]) -> dict:
+        """A list of patient records, or a columnar {field: [values]} object."""
+        return self._post("/predict/batch", json=patients)
+
+    def predict_csv(self, csv_body: bytes) -> dict:
+        return self._post("/predict/batch/csv", data=csv_body, headers={"Content-Type": "text/csv"})
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncPredictionClient:
+    """Non-blocking client on a shared httpx connection pool, with the same retry policy."""
+
+    def __init__(
+        self,
+        base_url: str = API_BASE_URL,
+        timeout_s: float = API_TIMEOUT_S,
+        connect_timeout_s: float = API_CONNECT_TIMEOUT_S,
+        retries: int = API_RETRIES,
+        backoff_s: float = API_BACKOFF_S,
+        pool_size: int = API_POOL_SIZE,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self._client_kwargs = dict(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(timeout_s, connect=connect_timeout_s),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            transport=transport,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created on first use, inside the event loop that will drive it
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(**self._client_kwargs)
+        return self._client
+
+    async def _post(self, path: str, **kwargs) -> dict:
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            try:
+                response = await self.client.post(path, **kwargs)
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return _decode(
+                        response.status_code, response.headers.get("content-type", ""),
+                        response.json, response.text,
+                    )
+                retry_after = response.headers.get("retry-after")
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(backoff_delay(attempt + 1, self.backoff_s, retry_after))
+
+    async def predict(self, patient: dict) -> dict:
+        return await self._post("/predict", json=patient)
+
+    async def predict_batch(self, patients: Union[list, dict]) -> dict:
+        """A list of patient records, or a columnar {field: [values]} object."""
+        return await self._post("/predict/batch", json=patients)
+
+    async def predict_csv(self, csv_body: bytes) -> dict:
+        return await self._post("/predict/batch/csv", content=csv_body, headers={"Content-Type": "text/csv"})
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
@@ -0,0 +1,133 @@
+# src/app/batching.py
+"""
+Asyncio request coalescer for the /predict endpoint.
+
+Concurrent single-row requests are queued and collected into one matrix
+(up to `max_batch_size` rows, or whatever arrived within `max_wait_ms`
+of the first row). The wait window only opens once traffic is concurrent
+(the previous batch had more than one row), so a lone client never pays
+it. The batch is scored once in a worker thread, and each caller's
+future resolves with its own row's result. A bounded queue provides
+backpressure: when it is full, `submit` fails fast with
+QueueFullError instead of letting latency grow without limit.
+
+Rows submitted with a `context` (the pipeline the caller resolved) are
+only scored together with rows carrying the same context, as
+`score_fn(matrix, context)`. A hot reload between enqueue and flush then
+never scores a row with a model other than the one its caller caches and
+audits it under.
+"""
+import asyncio
+import os
+from typing import Callable, Optional
+
+import numpy as np
+
+# Global Configuration
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "64"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "2"))
+BATCH_QUEUE_DEPTH = int(os.getenv("BATCH_QUEUE_DEPTH", "1024"))
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the batching queue is at capacity (caller should back off)."""
+
+
+class MicroBatcher:
+    """Coalesces concurrent `submit(row)` calls into vectorized `score_fn(matrix)` calls."""
+
+    def __init__(
+        self,
+        score_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_size: int = BATCH_MAX_SIZE,
+        max_wait_ms: float = BATCH_MAX_WAIT_MS,
+        max_queue_depth: int = BATCH_QUEUE_DEPTH,
+    ):
+        self.score_fn = score_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max(0.0, max_wait_ms) / 1000.0
+        self.max_queue_depth = max_queue_depth
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._last_batch_size = 0
+
+    # --- Lifecycle (the queue and worker are bound to the running event loop) ---
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue_depth)
+            self._worker = loop.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    # --- Request side ---
+    async def submit(self, row: np.ndarray, context=None):
+        """Queues one input row and waits for its score."""
+        self._ensure_started()
+        future = self._loop.create_future()
+        try:
+            self._queue.put_nowait((row, future, context))
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Prediction queue is full ({self.max_queue_depth} pending requests).")
+        return await future
+
+    # --- Worker side ---
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        max_wait_s = self.max_wait_s if self._last_batch_size > 1 else 0.0
+        deadline = self._loop.time() + max_wait_s
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without yielding...
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            # ...then wait for stragglers until the window closes
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            self._last_batch_size = len(batch)
+            # Callers that gave up (client disconnect) don't need scoring
+            groups = {}
+            for row, future, context in batch:
+                if not future.done():
+                    groups.setdefault(id(context), (context, []))[1].append((row, future))
+            for context, group in groups.values():
+                await self._score_group(group, context)
+
+    async def _score_group(self, group: list, context):
+        X = np.vstack([row for row, _ in group])
+        args = (X,) if context is None else (X, context)
+        try:
+            results = await self._loop.run_in_executor(None, self.score_fn, *args)
+        except Exception as e:
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(group, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,162 @@
+# src/app/binary_format.py
+"""
+Binary request/response bodies for high-volume scoring clients.
+
+Two encodings of the same columnar data, chosen by Content-Type (request)
+and Accept (response):
+
+1. application/vnd.diabetes.matrix (fixed layout, little-endian):
+
+       request:  header | n_rows x n_cols float32, row-major, INPUT_COLUMNS order
+       response: header | n_rows float32 probabilities | n_rows uint8 predictions
+
+   header = magic (4s) | format version (uint16) | n_cols (uint16) |
+            n_rows (uint32) | schema id (uint32, CRC32 of the comma-joined column names)
+
+   A request body decodes into a zero-copy float32 view of the body bytes.
+
+2. application/vnd.apache.arrow.stream (Arrow IPC stream). The request has
+   one numeric, null-free column per input field. The response has
+   `probability` (float64) and `prediction` (int8) columns. pyarrow is
+   imported on first use only, so the API itself starts without it.
+"""
+import struct
+import zlib
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+MATRIX_MEDIA_TYPE = "application/vnd.diabetes.matrix"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+JSON_MEDIA_TYPE = "application/json"
+BINARY_MEDIA_TYPES = (MATRIX_MEDIA_TYPE, ARROW_MEDIA_TYPE)
+FORMAT_VERSION = 1  # bump when the header/body layout changes
+REQUEST_MAGIC = b"DBRQ"
+RESPONSE_MAGIC = b"DBRS"
+RESPONSE_COLUMNS = ("probability", "prediction")
+_HEADER = struct.Struct("<4sHHII")
+
+
+class BinaryFormatError(ValueError):
+    """The body doesn't match the declared binary format or the API's input schema."""
+
+
+def schema_id(columns: Sequence[str]) -> int:
+    return zlib.crc32(",".join(columns).encode())
+
+
+def media_type(header_value: Optional[str]) -> str:
+    """'application/x; charset=...' -> 'application/x'."""
+    return (header_value or "").split(";")[0].strip().lower()
+
+
+def negotiate(accept: Optional[str], default: str) -> Optional[str]:
+    """
+    Response media type for an Accept header: the highest-q supported type,
+    `default` (the request's own format) for a missing header or */*, and
+    None if nothing acceptable is supported.
+    """
+    if not accept:
+        return default
+    offers = []
+    for position, item in enumerate(accept.split(",")):
+        parts = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        offers.append((-q, position, parts[0].lower()))
+    for neg_q, _, offered in sorted(offers):
+        if neg_q == 0:
+            break
+        if offered in ("*/*", "application/*"):
+            return default
+        if offered in BINARY_MEDIA_TYPES or offered == JSON_MEDIA_TYPE:
+            return offered
+    return None
+
+
+# --- Fixed-layout matrix ---
+def encode_matrix(X: np.ndarray, columns: Sequence[str]) -> bytes:
+    """Client side: raw inputs (in `columns` order) -> request body."""
+    X = np.ascontiguousarray(X, dtype="<f4")
+    return _HEADER.pack(REQUEST_MAGIC, FORMAT_VERSION, X.shape[1], X.shape[0], schema_id(columns)) + X.tobytes()
+
+
+def _read_header(body: bytes, magic: bytes) -> Tuple[int, int, int]:
+    if len(body) < _HEADER.size:
+        raise BinaryFormatError(f"Body shorter than the {_HEADER.size}-byte header.")
+    found, version, n_cols, n_rows, schema = _HEADER.unpack_from(body)
+    if found != magic:
+        raise BinaryFormatError(f"Bad magic {found!r} (expected {magic!r}).")
+    if version != FORMAT_VERSION:
+        raise BinaryFormatError(f"Unsupported format version {version} (this server speaks {FORMAT_VERSION}).")
+    return n_cols, n_rows, schema
+
+
+def decode_matrix(body: bytes, columns: Sequence[str]) -> np.ndarray:
+    """Request body -> read-only (n_rows x n_cols) float32 view of `body` (no copy)."""
+    n_cols, n_rows, schema = _read_header(body, REQUEST_MAGIC)
+    if n_cols != len(columns) or schema != schema_id(columns):
+        raise BinaryFormatError(f"Schema mismatch: expected {len(columns)} columns ordered as {list(columns)}.")
+    expected = _HEADER.size + 4 * n_rows * n_cols
+    if len(body) != expected:
+        raise BinaryFormatError(f"Body is {len(body)} bytes; header declares {expected}.")
+    return np.frombuffer(body, dtype="<f4", count=n_rows * n_cols, offset=_HEADER.size).reshape(n_rows, n_cols)
+
+
+def encode_matrix_response(probabilities: np.ndarray, predictions: np.ndarray) -> bytes:
+    n_rows = probabilities.shape[0]
+    header = _HEADER.pack(RESPONSE_MAGIC, FORMAT_VERSION, len(RESPONSE_COLUMNS), n_rows, schema_id(RESPONSE_COLUMNS))
+    return b"".join((
+        header, probabilities.astype("<f4").tobytes(), predictions.astype(np.uint8).tobytes()
+    ))
+
+
+def decode_matrix_response(body: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Client side: response body -> (float32 probabilities, uint8 predictions)."""
+    n_cols, n_rows, schema = _read_header(body, RESPONSE_MAGIC)
+    if n_cols != len(RESPONSE_COLUMNS) or schema != schema_id(RESPONSE_COLUMNS):
+        raise BinaryFormatError("Unexpected response schema.")
+    probabilities = np.frombuffer(body, dtype="<f4", count=n_rows, offset=_HEADER.size)
+    predictions = np.frombuffer(body, dtype=np.uint8, count=n_rows, offset=_HEADER.size + 4 * n_rows)
+    return probabilities, predictions
+
+
+# --- Arrow IPC stream ---
+def decode_arrow(body: bytes, columns: Sequence[str]) -> np.ndarray:
+    """Arrow IPC stream -> (n_rows x n_cols) float64 matrix in `columns` order."""
+    import pyarrow as pa  # deferred: only Arrow clients pay for the import
+
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    except pa.ArrowInvalid as e:
+        raise BinaryFormatError(f"Unreadable Arrow stream: {e}")
+    missing = [col for col in columns if col not in table.column_names]
+    if missing:
+        raise BinaryFormatError(f"Missing columns: {missing}")
+    X = np.empty((table.num_rows, len(columns)), dtype=np.float64)
+    for j, col in enumerate(columns):
+        column = table.column(col)
+        if not (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)):
+            raise BinaryFormatError(f"Column {col} has type {column.type}; expected a numeric type.")
+        if column.null_count:
+            raise BinaryFormatError(f"Column {col} has {column.null_count} nulls.")
+        X[:, j] = column.to_numpy()
+    return X
+
+
+def encode_arrow_response(probabilities: np.ndarray, predictions: np.ndarray, metadata: Optional[dict] = None) -> bytes:
+    import pyarrow as pa
+
+    table = pa.table(
+        {"probability": probabilities.astype(np.float64), "prediction": predictions.astype(np.int8)},
+        metadata={key: str(value) for key, value in (metadata or {}).items()},
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
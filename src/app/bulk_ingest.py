@@ -0,0 +1,233 @@
+# src/app/bulk_ingest.py
+"""
+Bulk request parsing straight into typed NumPy arrays.
+
+Turns a JSON array of patient objects, a columnar JSON object
+({"Glucose": [...], ...}) or a CSV body into a structured array, with the
+same type and ge/le constraints as the Pydantic request model, checked
+one column at a time with vectorized comparisons. No per-row model
+objects or DataFrames are built; errors are reported per row index in
+Pydantic's error format, so clients see the same 422 details as before.
+"""
+import io
+import json
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Cap on the per-row errors returned (the total is still counted)
+MAX_REPORTED_ERRORS = 1000
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    name: str
+    is_int: bool
+    ge: Optional[float] = None
+    le: Optional[float] = None
+
+
+def compile_field_specs(model_cls) -> List[FieldSpec]:
+    """Type and Ge/Le bounds of every field of a Pydantic model, in declaration order."""
+    specs = []
+    for name, info in model_cls.model_fields.items():
+        bounds = {"ge": None, "le": None}
+        for constraint in info.metadata:
+            for key in bounds:
+                if hasattr(constraint, key):
+                    bounds[key] = getattr(constraint, key)
+        specs.append(FieldSpec(name, info.annotation is int, **bounds))
+    return specs
+
+
+@dataclass
+class BulkParseResult:
+    records: np.ndarray  # structured array, one field per model field
+    errors: List[dict]
+    error_count: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error_count == 0
+
+    def __len__(self) -> int:
+        return int(self.records.shape[0])
+
+    def to_matrix(self, columns: Sequence[str]) -> np.ndarray:
+        """Float matrix in `columns` order (the inference pipeline's input layout)."""
+        matrix = np.empty((len(self), len(columns)), dtype=np.float64)
+        for j, col in enumerate(columns):
+            matrix[:, j] = self.records[col]
+        return matrix
+
+
+class BulkParser:
+    """Vectorized equivalent of TypeAdapter(List[model_cls]) for numeric models."""
+
+    def __init__(self, model_cls):
+        self.fields = compile_field_specs(model_cls)
+        self.dtype = np.dtype([(f.name, np.int64 if f.is_int else np.float64) for f in self.fields])
+
+    # --- Entry points ---
+    def parse_json(self, body: bytes) -> BulkParseResult:
+        """JSON array of objects, or a columnar object of equal-length arrays."""
+        payload = json.loads(body)
+        if isinstance(payload, dict):
+            return self.parse_columns(payload)
+        if not isinstance(payload, list):
+            raise ValueError("Expected a JSON array of records or an object of column arrays.")
+        return self.parse_rows(payload)
+
+    def parse_csv(self, body: bytes) -> BulkParseResult:
+        import pandas as pd  # deferred: only CSV uploads need it (keeps API startup light)
+        frame = pd.read_csv(io.BytesIO(body))
+        missing = [f.name for f in self.fields if f.name not in frame.columns]
+        if missing:
+            raise KeyError(f"Missing columns: {missing}")
+        return self._build(len(frame), {f.name: frame[f.name].to_numpy() for f in self.fields}, present=None)
+
+    def parse_rows(self, rows: list) -> BulkParseResult:
+        errors = []
+        try:
+            columns = {f.name: [row.get(f.name) for row in rows] for f in self.fields}
+        except AttributeError:
+            # Some rows aren't objects: report them and treat their fields as missing
+            for i, row in enumerate(rows):
+                if not isinstance(row, dict):
+                    errors.append({"type": "model_type", "loc": [i], "msg": "Input should be an object", "input": row})
+            columns = {
+                f.name: [row.get(f.name) if isinstance(row, dict) else None for row in rows] for f in self.fields
+            }
+        return self._build(len(rows), columns, present=rows, errors=errors)
+
+    def parse_columns(self, payload: dict) -> BulkParseResult:
+        lengths = {len(v) for v in payload.values() if isinstance(v, list)}
+        if len(lengths) != 1 or not all(isinstance(v, list) for v in payload.values()):
+            raise ValueError("Columnar payload must map every column to an array of the same length.")
+        n_rows = lengths.pop()
+        columns = {f.name: payload.get(f.name, [None] * n_rows) for f in self.fields}
+        missing = {f.name for f in self.fields if f.name not in payload}
+        return self._build(n_rows, columns, present=missing)
+
+    def check_matrix(self, X: np.ndarray, columns: Sequence[str]) -> Tuple[List[dict], int]:
+        """
+        Same constraints on an already numeric (n_rows x n_fields) matrix whose
+        columns are `columns` (binary request bodies). Nothing is copied;
+        returns (reported errors, total error count).
+        """
+        errors, error_count = [], 0
+        for spec in self.fields:
+            values = X[:, list(columns).index(spec.name)]
+            finite = np.isfinite(values)
+            if not finite.all():
+                bad = np.flatnonzero(~finite)
+                error_count += int(bad.size)
+                for i in bad[:max(0, MAX_REPORTED_ERRORS - len(errors))]:
+                    errors.append({"type": "finite_number", "loc": [int(i), spec.name],
+                                   "msg": "Input should be a finite number", "input": str(values[i])})
+                values = np.where(finite, values, np.nan)  # NaN fails no further check
+            error_count += self._check_constraints(values, spec, values, errors)
+        errors.sort(key=lambda error: error["loc"][0])
+        return errors, error_count
+
+    # --- Vectorized conversion + constraint checks ---
+    def _build(self, n_rows: int, columns: dict, present, errors: Optional[list] = None) -> BulkParseResult:
+        errors = errors if errors is not None else []
+        error_count = len(errors)
+        records = np.zeros(n_rows, dtype=self.dtype)
+        for spec in self.fields:
+            values, bad_rows = self._to_float(columns[spec.name], spec)
+            for i, error in bad_rows:
+                error_count += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({**error, "loc": [i, spec.name]})
+
+            null = np.isnan(values)
+            null[[i for i, _ in bad_rows]] = False  # already reported as parse errors
+            for i in np.flatnonzero(null):
+                error = self._null_error(int(i), spec, present)
+                if error is None:
+                    continue
+                error_count += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(error)
+
+            error_count += self._check_constraints(values, spec, columns[spec.name], errors)
+
+            if spec.is_int:
+                records[spec.name] = np.where(np.isfinite(values), values, 0).astype(np.int64)
+            else:
+                records[spec.name] = values
+        errors.sort(key=lambda error: error["loc"][0])
+        return BulkParseResult(records, errors, error_count)
+
+    @staticmethod
+    def _check_constraints(values: np.ndarray, spec: FieldSpec, raw_column, errors: list) -> int:
+        """Integer and ge/le checks on one float column: appends (capped) errors, returns the failure count."""
+        checks = []
+        if spec.is_int:
+            finite = np.isfinite(values)
+            checks.append((
+                finite & (values != np.floor(values)), "int_from_float",
+                "Input should be a valid integer, got a number with a fractional part", None,
+            ))
+        with np.errstate(invalid="ignore"):
+            if spec.ge is not None:
+                checks.append((values < spec.ge, "greater_than_equal",
+                               f"Input should be greater than or equal to {spec.ge}", {"ge": spec.ge}))
+            if spec.le is not None:
+                checks.append((values > spec.le, "less_than_equal",
+                               f"Input should be less than or equal to {spec.le}", {"le": spec.le}))
+        error_count = 0
+        for mask, error_type, msg, ctx in checks:
+            bad = np.flatnonzero(mask)
+            error_count += int(bad.size)
+            for i in bad[:max(0, MAX_REPORTED_ERRORS - len(errors))]:
+                value = raw_column[i]  # echo the input as sent
+                value = value.item() if isinstance(value, np.generic) else value
+                error = {"type": error_type, "loc": [int(i), spec.name], "msg": msg, "input": value}
+                if ctx:
+                    error["ctx"] = ctx
+                errors.append(error)
+        return error_count
+
+    @staticmethod
+    def _to_float(column, spec: FieldSpec):
+        """Float array (NaN for nulls) plus (row, error) for values that don't parse as numbers."""
+        try:
+            return np.asarray(column, dtype=np.float64), []
+        except (TypeError, ValueError):
+            pass
+        values = np.empty(len(column), dtype=np.float64)
+        bad_rows = []
+        kind = "int" if spec.is_int else "float"
+        for i, value in enumerate(column):
+            try:
+                values[i] = np.nan if value is None else float(value)
+            except (TypeError, ValueError):
+                values[i] = np.nan
+                if isinstance(value, str):
+                    msg = "Input should be a valid integer, unable to parse string as an integer" if spec.is_int \
+                        else "Input should be a valid number, unable to parse string as a number"
+                    error = {"type": f"{kind}_parsing", "msg": msg, "input": value}
+                else:
+                    error = {"type": f"{kind}_type", "msg": "Input should be a valid " +
+                             ("integer" if spec.is_int else "number"), "input": value}
+                bad_rows.append((i, error))
+        return values, bad_rows
+
+    @staticmethod
+    def _null_error(i: int, spec: FieldSpec, present) -> Optional[dict]:
+        """Missing vs. null value error (None for non-object rows, already reported)."""
+        if isinstance(present, list):
+            if not isinstance(present[i], dict):
+                return None
+            is_missing = spec.name not in present[i]
+        else:
+            is_missing = present is not None and spec.name in present
+        if is_missing:
+            return {"type": "missing", "loc": [i, spec.name], "msg": "Field required"}
+        kind = "integer" if spec.is_int else "number"
+        return {"type": f"{'int' if spec.is_int else 'float'}_type", "loc": [i, spec.name],
+                "msg": f"Input should be a valid {kind}", "input": None}
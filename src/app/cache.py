@@ -0,0 +1,123 @@
+# src/app/cache.py
+"""
+In-process LRU + TTL cache of prediction results.
+
+Keys are a hash of the canonicalized raw input row (float64, pipeline
+column order, -0.0 folded into 0.0), so the same patient submitted as
+JSON ints or floats, alone or inside a batch, maps to the same entry.
+Every entry belongs to a namespace (artifact version + decision
+threshold); when a lookup arrives with a new namespace the cache is
+emptied, so a hot-reloaded model or a new threshold never serves stale
+results. Writes never move the namespace: a request that resolved its
+namespace before a reload and stores its result afterwards is dropped
+(counted in `stale_writes`) instead of wiping the new version's entries.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional
+
+import numpy as np
+
+# Global Configuration
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))  # 0 disables the cache
+PREDICTION_CACHE_TTL_S = float(os.getenv("PREDICTION_CACHE_TTL_S", "300"))
+
+
+def row_key(row: np.ndarray) -> bytes:
+    """Canonical hash of one raw input row."""
+    canonical = np.ascontiguousarray(row, dtype=np.float64) + 0.0
+    return hashlib.blake2b(canonical.tobytes(), digest_size=16).digest()
+
+
+def matrix_keys(X: np.ndarray) -> List[bytes]:
+    canonical = np.ascontiguousarray(X, dtype=np.float64) + 0.0
+    return [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in canonical]
+
+
+class PredictionCache:
+    """Bounded, thread-safe key -> probability map with LRU eviction and a TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = PREDICTION_CACHE_SIZE,
+        ttl_s: float = PREDICTION_CACHE_TTL_S,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max(0, max_entries)
+        self.ttl_s = ttl_s
+        self.clock = clock
+        self.namespace: Optional[Hashable] = None
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+        self.stale_writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _check_namespace(self, namespace: Hashable):
+        # Caller holds the lock
+        if namespace != self.namespace:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self.namespace = namespace
+
+    def get(self, key: bytes, namespace: Hashable) -> Optional[float]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._check_namespace(namespace)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if self.clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: float, namespace: Hashable):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.namespace is None:
+                self.namespace = namespace
+            elif namespace != self.namespace:
+                self.stale_writes += 1
+                return
+            self._entries[key] = (self.clock() + self.ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_writes": self.stale_writes,
+            }
@@ -1,11 +1,26 @@
+import io
 import os
-import requests
+import sys
+
+import httpx
+import pandas as pd
 import gradio as gr
 
+# Adding project root for module imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.app.api_client import AsyncPredictionClient, PredictionAPIError
+
 # --- SYSTEM CONFIGURATION ---
 API_URL = os.getenv("API_URL", "http://127.0.0.1:8001/predict")
+API_BASE_URL = os.getenv("API_BASE_URL") or API_URL.rsplit("/predict", 1)[0]
+# Concurrent sessions served at once (the handlers await the API, they don't block a thread)
+UI_CONCURRENCY = int(os.getenv("UI_CONCURRENCY", "16"))
+
+# One pooled, retrying client shared by every session
+api_client = AsyncPredictionClient(API_BASE_URL)
 
-def get_prediction(pregnancies, glucose, bp, skin, insulin, bmi, dpf, age):
+async def get_prediction(pregnancies, glucose, bp, skin, insulin, bmi, dpf, age):
     """
     Inference client logic. 
     Handles data casting and UI state management.
@@ -28,12 +43,11 @@ def get_prediction(pregnancies, glucose, bp, skin, insulin, bmi, dpf, age):
 
     try:
         # 2. API Communication
-        response = requests.post(API_URL, json=payload, timeout=15)
-        response.raise_for_status()
-        
+        # Keep-alive connection from the shared pool; transient failures are retried
+        data = await api_client.predict(payload)
+
         # 3. Data Extraction
         # NOTE: Using 'confidence' key to match the FastAPI response
-        data = response.json()
         conf = data.get("confidence", 0)
         prediction = data.get("prediction", 0)
         
@@ -54,11 +68,42 @@ def get_prediction(pregnancies, glucose, bp, skin, insulin, bmi, dpf, age):
         """
         return result_html
 
-    except requests.exceptions.ConnectionError:
+    except httpx.TransportError:
         return "<div style='color: red; text-align: center;'>❌ <b>Service Offline:</b> Connection to API failed.</div>"
     except Exception as e:
         return f"<div style='color: red; text-align: center;'>❌ <b>Runtime Error:</b> {str(e)}</div>"
 
+async def get_batch_predictions(csv_file):
+    """
+    Batch client logic: the whole CSV goes to /predict/batch/csv in one call.
+    Returns a summary and the uploaded rows with their predictions appended.
+    """
+    if csv_file is None:
+        return "<div style='color: red;'>❌ <b>Input Error:</b> Please upload a CSV file.</div>", None
+    path = csv_file if isinstance(csv_file, str) else csv_file.name
+    with open(path, "rb") as f:
+        body = f.read()
+
+    try:
+        data = await api_client.predict_csv(body)
+    except httpx.TransportError:
+        return "<div style='color: red; text-align: center;'>❌ <b>Service Offline:</b> Connection to API failed.</div>", None
+    except PredictionAPIError as e:
+        return f"<div style='color: red; text-align: center;'>❌ <b>Rejected ({e.status_code}):</b> {e.detail}</div>", None
+    except Exception as e:
+        return f"<div style='color: red; text-align: center;'>❌ <b>Runtime Error:</b> {str(e)}</div>", None
+
+    results = pd.read_csv(io.BytesIO(body))
+    results["Prediction"] = [row["prediction"] for row in data["predictions"]]
+    results["Probability"] = [row["probability"] for row in data["predictions"]]
+    n_positive = int(results["Prediction"].sum())
+    summary = (
+        f"<div style='text-align: center; padding: 15px;'><b>{data['count']}</b> patients scored: "
+        f"<span style='color: #c62828;'>⚠️ {n_positive} high risk</span> | "
+        f"<span style='color: #2e7d32;'>✅ {data['count'] - n_positive} low risk</span></div>"
+    )
+    return summary, results
+
 # --- UI ARCHITECTURE ---
 def build_ui():
     # Applying the 'Soft' theme for a modern look
@@ -66,36 +111,56 @@ def build_ui():
         gr.Markdown("# 🏥 Clinical Diabetes Prediction System")
         gr.Markdown("Architecture: **Distributed Microservices** | Engine: **Docker**")
         
-        with gr.Row():
-            # Input Column
-            with gr.Column(scale=1):
-                gr.Markdown("### Patient Metrics")
-                preg = gr.Number(label="Pregnancies", value=0, minimum=0)
-                gluc = gr.Number(label="Glucose (mg/dL)", value=120, minimum=0)
-                bp = gr.Number(label="Blood Pressure (mm Hg)", value=70, minimum=0)
-                skin = gr.Number(label="Skin Thickness (mm)", value=20, minimum=0)
-                ins = gr.Number(label="Insulin (mu U/ml)", value=80, minimum=0)
-                bmi = gr.Number(label="BMI (Weight in kg/(m)^2)", value=26.0, minimum=0)
-                dpf = gr.Number(label="Pedigree Function", value=0.5, minimum=0)
-                age = gr.Number(label="Age", value=30, minimum=1, maximum=120)
+        with gr.Tab("Single Patient"):
+            with gr.Row():
+                # Input Column
+                with gr.Column(scale=1):
+                    gr.Markdown("### Patient Metrics")
+                    preg = gr.Number(label="Pregnancies", value=0, minimum=0)
+                    gluc = gr.Number(label="Glucose (mg/dL)", value=120, minimum=0)
+                    bp = gr.Number(label="Blood Pressure (mm Hg)", value=70, minimum=0)
+                    skin = gr.Number(label="Skin Thickness (mm)", value=20, minimum=0)
+                    ins = gr.Number(label="Insulin (mu U/ml)", value=80, minimum=0)
+                    bmi = gr.Number(label="BMI (Weight in kg/(m)^2)", value=26.0, minimum=0)
+                    dpf = gr.Number(label="Pedigree Function", value=0.5, minimum=0)
+                    age = gr.Number(label="Age", value=30, minimum=1, maximum=120)
                 
-                btn = gr.Button("Analyze Patient Record", variant="primary")
+                    btn = gr.Button("Analyze Patient Record", variant="primary")
             
-            # Output Column
-            with gr.Column(scale=1):
-                gr.Markdown("### Diagnostic Intelligence")
-                output = gr.HTML(label="Output Report")
-
-        # Event Binding
-        btn.click(
-            fn=get_prediction, 
-            inputs=[preg, gluc, bp, skin, ins, bmi, dpf, age], 
-            outputs=output
-        )
+                # Output Column
+                with gr.Column(scale=1):
+                    gr.Markdown("### Diagnostic Intelligence")
+                    output = gr.HTML(label="Output Report")
+
+            # Event Binding
+            btn.click(
+                fn=get_prediction, 
+                inputs=[preg, gluc, bp, skin, ins, bmi, dpf, age], 
+                outputs=output
+            )
+
+        with gr.Tab("Batch Upload"):
+            gr.Markdown("### Patient File")
+            gr.Markdown("CSV with a header row: " + ", ".join(
+                ["Pregnancies", "Glucose", "BloodPressure", "SkinThickness",
+                 "Insulin", "BMI", "DiabetesPedigreeFunction", "Age"]
+            ) + ". All rows are scored in a single API call.")
+            csv_file = gr.File(label="Patients CSV", file_types=[".csv"])
+            batch_btn = gr.Button("Analyze Patient File", variant="primary")
+            batch_summary = gr.HTML(label="Batch Summary")
+            batch_table = gr.Dataframe(label="Results", interactive=False)
+
+            batch_btn.click(
+                fn=get_batch_predictions,
+                inputs=csv_file,
+                outputs=[batch_summary, batch_table]
+            )
 
     return demo
 
 if __name__ == "__main__":
     app = build_ui()
+    # Async handlers + a concurrency limit > 1 let sessions overlap their API calls
+    app.queue(default_concurrency_limit=UI_CONCURRENCY)
     port = int(os.environ.get("PORT", 8000))
     app.launch(server_name="0.0.0.0", server_port=port, share=False)
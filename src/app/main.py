@@ -1,21 +1,60 @@
+import logging
 import os
 import sys
-import joblib
-import pandas as pd
+import time
 import numpy as np
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field   
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 
 # Adding project root for module imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from src.data.preprocess import preprocess_data
-from src.features.build_features import build_features
+from src.data.constants import CLASSIFICATION_THRESHOLD
+from src.models.registry import ArtifactRegistry
+from src.app.batching import MicroBatcher, QueueFullError
+from src.app.bulk_ingest import BulkParser
+from src.app.binary_format import (
+    ARROW_MEDIA_TYPE, BINARY_MEDIA_TYPES, JSON_MEDIA_TYPE, MATRIX_MEDIA_TYPE, BinaryFormatError,
+    decode_arrow, decode_matrix, encode_arrow_response, encode_matrix_response, media_type, negotiate,
+)
+from src.app.cache import PredictionCache, row_key, matrix_keys
+from src.app.metrics import MetricsRegistry, MetricsMiddleware, LATENCY_BUCKETS, ROW_BUCKETS
+from src.monitoring.drift import (
+    DRIFT_MONITORING, DRIFT_SINK, DriftFlusher, DriftMonitor, load_reference_profile, make_sink
+)
+from src.monitoring.audit import AUDIT_LOG, AUDIT_BULK_WAIT_S, AuditLog
 
 app = FastAPI(title="Diabetes API - Feature Engineering Fixed")
-artifacts = {}
-CLASSIFICATION_THRESHOLD = 0.40
+# Shared, load-once artifact store holding the fused inference pipeline
+registry = ArtifactRegistry()
+MAX_BATCH_ROWS = int(os.getenv("MAX_BATCH_ROWS", "10000"))
+# Binary bodies skip JSON decoding entirely, so they may carry far more rows
+MAX_BINARY_BATCH_ROWS = int(os.getenv("MAX_BINARY_BATCH_ROWS", "1000000"))
+# Coalesce concurrent /predict calls into vectorized batches (set to 0 to score inline)
+MICRO_BATCHING = os.getenv("MICRO_BATCHING", "1") == "1"
+# Repeated patients skip the pipeline: PREDICTION_CACHE_SIZE entries, PREDICTION_CACHE_TTL_S seconds
+prediction_cache = PredictionCache()
+
+# --- Logging (per-request details only at LOG_LEVEL=DEBUG) ---
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger("diabetes_api")
+
+# --- Metrics (served in Prometheus text format at /metrics) ---
+metrics = MetricsRegistry()
+REQUESTS = metrics.counter("http_requests_total", "HTTP requests by route and status.", ("route", "status"))
+REQUEST_LATENCY = metrics.histogram(
+    "http_request_duration_seconds", "End-to-end request latency.", LATENCY_BUCKETS, ("route",)
+)
+STAGE_LATENCY = metrics.histogram(
+    "inference_stage_duration_seconds", "Time spent per inference stage (per scoring call).",
+    LATENCY_BUCKETS, ("stage",)
+)
+BATCH_ROWS = metrics.histogram("inference_batch_rows", "Rows per scoring call.", ROW_BUCKETS, ("source",))
+ERRORS = metrics.counter("prediction_errors_total", "Failed prediction requests.", ("endpoint", "reason"))
 
 # 2. Define the request schema 
 class DiabetesInput(BaseModel):
@@ -33,60 +72,591 @@ class DiabetesInput(BaseModel):
     DiabetesPedigreeFunction: float = Field(..., ge=0)
     Age: int = Field(..., ge=1, le=120)
 
+INPUT_COLUMNS = list(DiabetesInput.model_fields)
+# Bulk endpoints: JSON/CSV bodies -> typed NumPy arrays with the same constraints, no per-row models
+bulk_parser = BulkParser(DiabetesInput)
+
+# --- Readiness: /ready flips to 200 only after the artifacts are loaded AND a warm-up prediction ran ---
+# One typical patient and one with every zero-coded (missing) field, so both imputation paths run
+WARMUP_PATIENTS = [
+    {"Pregnancies": 1, "Glucose": 100, "BloodPressure": 70, "SkinThickness": 20,
+     "Insulin": 50, "BMI": 23.0, "DiabetesPedigreeFunction": 0.3, "Age": 25},
+    {"Pregnancies": 0, "Glucose": 0, "BloodPressure": 0, "SkinThickness": 0,
+     "Insulin": 0, "BMI": 0, "DiabetesPedigreeFunction": 0.5, "Age": 40},
+]
+readiness = {"ready": False, "version": None, "load_seconds": None, "warmup_seconds": None, "error": None}
+
+# --- Drift monitoring: live inputs vs the training reference profile (DRIFT_SINK, DRIFT_FLUSH_INTERVAL_S) ---
+drift_monitor = DriftMonitor()
+drift_flusher = DriftFlusher(drift_monitor, make_sink(DRIFT_SINK))
+# --- Audit trail: every scored row, buffered in memory and persisted by a background writer (AUDIT_*) ---
+audit_log = AuditLog(INPUT_COLUMNS)
+
+def warm_up(current):
+    """Scores WARMUP_PATIENTS once: pages in the arrays, allocates scratch buffers, checks the output."""
+    columns = current.pipeline.input_columns
+    X = np.array([[patient[col] for col in columns] for patient in WARMUP_PATIENTS], dtype=np.float64)
+    probabilities = current.pipeline.predict_proba(X)
+    if probabilities.shape != (len(WARMUP_PATIENTS),) or not np.all(np.isfinite(probabilities)):
+        raise ValueError(f"Warm-up prediction returned {probabilities!r}")
+
+def bind_drift_reference(current):
+    """
+    Points the drift monitor at the profile saved next to the active artifacts (or disables it).
+    The flusher runs exactly while the monitor is enabled, across reloads as well as at startup.
+    """
+    profile = load_reference_profile(current.source_dir) if DRIFT_MONITORING else None
+    if DRIFT_MONITORING and profile is None:
+        logger.warning("⚠️ No reference profile in %s: drift monitoring disabled.", current.source_dir)
+    # Report the previous version's partial window before rebinding starts a new one
+    if profile is None:
+        drift_flusher.stop()
+    else:
+        drift_flusher.flush()
+    drift_monitor.set_reference(profile, current.pipeline.input_columns)
+    if drift_monitor.enabled:
+        drift_flusher.start()
+
+def activate(current, load_seconds: float):
+    """Warms `current` up and only then serves it: a set that fails warm-up is never published."""
+    start = time.perf_counter()
+    warm_up(current)
+    registry.publish(current)
+    bind_drift_reference(current)
+    readiness.update(
+        ready=True, version=current.version, error=None,
+        load_seconds=round(load_seconds, 4), warmup_seconds=round(time.perf_counter() - start, 4),
+    )
+
 @app.on_event("startup")
 def load_production_artifacts():
     try:
-        artifacts["model"] = joblib.load("diabetes-model-artifacts/model.pkl")
-        artifacts["scaler"] = joblib.load("diabetes-model-artifacts/scaler.pkl")
-        artifacts["columns"] = joblib.load("diabetes-model-artifacts/columns.pkl")
-        print(f"✅ Production System Online. Threshold: {CLASSIFICATION_THRESHOLD}")
+        # Reuses artifacts already loaded by a pre-forking parent (see serve.py)
+        start = time.perf_counter()
+        current = registry.get()
+        activate(current, time.perf_counter() - start)
+        if AUDIT_LOG:
+            audit_log.start()
+        logger.info("✅ Production System Online. Pipeline: %s | Threshold: %s", current.pipeline.version, CLASSIFICATION_THRESHOLD)
     except Exception as e:
-        print(f"❌ Initialization Error: {e}")
+        readiness.update(ready=False, error=str(e))
+        logger.error("❌ Initialization Error: %s", e)
+
+
+@app.get("/ready")
+def ready():
+    """Readiness probe: 503 until the model is loaded and warmed up (liveness is any response at all)."""
+    if not readiness["ready"]:
+        raise HTTPException(status_code=503, detail=readiness["error"] or "Warming up")
+    return readiness
+
+
+@app.post("/admin/reload")
+def reload_artifacts():
+    """
+    Hot-swaps the artifact set if a new one was published to the artifacts folder.
+    The new set is loaded and warmed up before it is served; if either step fails
+    the old set (and its readiness) stays in place.
+    """
+    try:
+        start = time.perf_counter()
+        candidate = registry.load_if_changed()
+        changed = candidate is not None
+        if changed:
+            activate(candidate, time.perf_counter() - start)
+    except Exception as e:
+        logger.error("❌ Reload Error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"reloaded": changed, "version": registry.get().version}
+
+
+def records_to_matrix(records, columns) -> np.ndarray:
+    """Validated request objects -> raw float matrix in the pipeline's column order."""
+    return np.array([[getattr(record, col) for col in columns] for record in records], dtype=np.float64)
+
+
+def batch_response(probabilities: np.ndarray) -> dict:
+    """Per-row predictions/probabilities, preserving input order."""
+    predictions = (probabilities >= CLASSIFICATION_THRESHOLD).astype(int)
+    return {
+        "count": int(probabilities.shape[0]),
+        "predictions": [
+            {"prediction": int(pred), "probability": round(float(prob), 4)}
+            for pred, prob in zip(predictions, probabilities)
+        ],
+        "status": "Success"
+    }
+
+
+def observe_stages(timings: dict):
+    for stage, seconds in timings.items():
+        STAGE_LATENCY.observe(seconds, stage)
+
+
+def score_matrix(X_raw: np.ndarray, source: str = "micro_batch", pipeline=None) -> np.ndarray:
+    """Scores a raw matrix with the current pipeline (runs in the batcher's worker thread)."""
+    pipeline = pipeline if pipeline is not None else registry.get().pipeline
+    timings = {}
+    probabilities = pipeline.predict_proba(X_raw, timings)
+    observe_stages(timings)
+    BATCH_ROWS.observe(X_raw.shape[0], source)
+    return probabilities
+
+
+def cache_namespace(current) -> tuple:
+    """Cached results are only valid for this artifact set and decision threshold."""
+    return (current.version, current.pipeline.version, CLASSIFICATION_THRESHOLD)
+
+
+def score_matrix_cached(current, X_raw: np.ndarray, source: str) -> np.ndarray:
+    """Batch scoring where only the rows missing from the prediction cache hit the pipeline."""
+    # Every input row counts towards drift, cached or not (runs in the threadpool for big batches)
+    drift_monitor.observe(X_raw)
+    if not prediction_cache.enabled:
+        return score_matrix(X_raw, source, current.pipeline)
+    namespace = cache_namespace(current)
+    keys = matrix_keys(X_raw)
+    probabilities = np.empty(len(keys), dtype=np.float64)
+    misses = []
+    for i, key in enumerate(keys):
+        cached = prediction_cache.get(key, namespace)
+        if cached is None:
+            misses.append(i)
+        else:
+            probabilities[i] = cached
+    if misses:
+        scored = score_matrix(X_raw[misses], source, current.pipeline)
+        probabilities[misses] = scored
+        for i, probability in zip(misses, scored):
+            prediction_cache.put(keys[i], float(probability), namespace)
+    return probabilities
+
+
+def score_micro_batch(X_raw: np.ndarray, pipeline=None) -> np.ndarray:
+    """Batcher callback: rows arrive grouped by the pipeline their requests resolved."""
+    return score_matrix(X_raw, "micro_batch", pipeline)
+
+
+# Max batch size / max wait / queue depth: BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, BATCH_QUEUE_DEPTH
+batcher = MicroBatcher(score_micro_batch)
+
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    await batcher.stop()
+
+
+@app.on_event("shutdown")
+def stop_drift_flusher():
+    # Flushes the partial window, so short-lived workers still report
+    drift_flusher.stop()
+
+
+@app.on_event("shutdown")
+def stop_audit_log():
+    # Persists every queued audit record before the worker exits
+    audit_log.stop()
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return prediction_cache.stats()
+
+
+@app.get("/audit/stats")
+def audit_stats():
+    return audit_log.stats()
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus scrape target: request/stage latency histograms, counters, cache and queue gauges."""
+    cache = prediction_cache.stats()
+    extra = []
+    for key in ("hits", "misses", "evictions", "expirations", "invalidations", "stale_writes"):
+        extra += [f"# TYPE prediction_cache_{key}_total counter", f"prediction_cache_{key}_total {cache[key]}"]
+    extra += [
+        "# TYPE prediction_cache_entries gauge", f"prediction_cache_entries {cache['size']}",
+        "# TYPE batcher_queue_depth gauge", f"batcher_queue_depth {batcher.queue_depth}",
+    ]
+    audit = audit_log.stats()
+    extra += [
+        "# TYPE audit_records_written_total counter", f"audit_records_written_total {audit['written']}",
+        "# TYPE audit_records_dropped_total counter", f"audit_records_dropped_total {audit['dropped']}",
+        "# TYPE audit_buffer_pending gauge", f"audit_buffer_pending {audit['pending']}",
+    ]
+    if drift_flusher.last_report is not None:
+        # Drift of the last closed window (the open one is served at /monitoring/drift)
+        features = drift_flusher.last_report["features"]
+        for name, key in (("feature_drift_psi", "psi"), ("feature_missing_rate", "missing_rate")):
+            extra.append(f"# TYPE {name} gauge")
+            extra += [
+                f'{name}{{feature="{col}"}} {entry[key]}' for col, entry in features.items() if entry[key] is not None
+            ]
+    return PlainTextResponse(metrics.render(extra), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/monitoring/drift")
+def drift_report():
+    """PSI / KS / missing rates of the open window against the training profile, plus the last closed window."""
+    if not drift_monitor.enabled:
+        raise HTTPException(status_code=404, detail="Drift monitoring is disabled (no reference profile).")
+    return {
+        "current": drift_monitor.snapshot(),
+        "last_flushed": drift_flusher.last_report,
+        "flushes": drift_flusher.flushes,
+        "flush_errors": drift_flusher.errors,
+    }
 
 
 @app.post("/predict")
-def predict(data: DiabetesInput):
+async def predict(data: DiabetesInput):
     try:
-        # 1. Input Parsing
-        input_df = pd.DataFrame([data.model_dump()])
-        
-        # 2. Preprocessing
-        X_clean = preprocess_data(input_df, is_training=False)
-
-        # 3. Feature Engineering
-        feat_result = build_features(X_clean, is_training=False)
-        X_features = feat_result[0] if isinstance(feat_result, tuple) else feat_result
-
-        # 4. Alignment
-        if isinstance(X_features, np.ndarray):
-            X_features = pd.DataFrame(X_features, columns=artifacts["columns"])
-        
-        X_aligned = X_features.reindex(columns=artifacts["columns"], fill_value=0)
-
-        # --- THE FIX: REMOVE REDUNDANT SCALING ---
-        # Since DEBUG showed '2.015', your functions are ALREADY scaling the data.
-        # We will use X_aligned directly for prediction.
-        
-        # We skip artifacts["scaler"].transform and go straight to the model
-        X_final_input = X_aligned.values # Convert to array for the model
-        
-        # 5. Model Inference
-        probability = artifacts["model"].predict_proba(X_final_input)[0][1]
-        prediction = 1 if probability >= CLASSIFICATION_THRESHOLD else 0
+        # Input Parsing -> raw row in the pipeline's column order (no DataFrames on the way)
+        current = registry.get()
+        start = time.perf_counter()
+        X_raw = records_to_matrix([data], current.pipeline.input_columns)
+        STAGE_LATENCY.observe(time.perf_counter() - start, "parse")
+        drift_monitor.observe(X_raw)
 
-        # --- DEBUG LOG FOR CONFIRMATION ---
-        print(f"DEBUG: Prob from model: {probability}")
-        # ----------------------------------
+        # Cache hits skip imputation, features and the model entirely
+        namespace = cache_namespace(current)
+        key = row_key(X_raw[0]) if prediction_cache.enabled else None
+        probability = prediction_cache.get(key, namespace) if key is not None else None
+        if probability is None:
+            if MICRO_BATCHING:
+                # Scored with the pipeline `current` names, so cache and audit versions match
+                probability = await batcher.submit(X_raw[0], current.pipeline)
+            else:
+                probability = score_matrix(X_raw, "single", current.pipeline)[0]
+            if key is not None:
+                prediction_cache.put(key, float(probability), namespace)
+        audit_log.record(X_raw, probability, CLASSIFICATION_THRESHOLD, current.version)
+        start = time.perf_counter()
+        prediction = 1 if probability >= CLASSIFICATION_THRESHOLD else 0
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Prob from model: %s", probability)
 
-        return {
+        response = {
             "prediction": int(prediction),
             "probability": round(float(probability), 4),
             "status": "Success"
         }
+        STAGE_LATENCY.observe(time.perf_counter() - start, "serialize")
+        return response
 
+    except QueueFullError as e:
+        # Backpressure: tell clients to retry instead of queueing unboundedly
+        ERRORS.inc("/predict", "queue_full")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
-        print(f"❌ Inference Error: {e}")
+        ERRORS.inc("/predict", "inference")
+        logger.error("❌ Inference Error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
+
+
+def check_batch_size(n_rows: int, limit: int = MAX_BATCH_ROWS):
+    if n_rows == 0:
+        raise HTTPException(status_code=400, detail="Empty batch.")
+    if n_rows > limit:
+        raise HTTPException(
+            status_code=413, detail=f"Batch too large: {n_rows} rows (limit {limit})."
+        )
+
+
+# OpenAPI body for the raw-body batch endpoint (parsed by BulkParser, not by FastAPI)
+BATCH_REQUEST_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": {
+            "oneOf": [
+                {"type": "array", "items": {"$ref": "#/components/schemas/DiabetesInput"}},
+                {"type": "object", "description": "Columnar form: {field: [values, ...]}",
+                 "additionalProperties": {"type": "array", "items": {"type": "number"}}},
+            ]
+        }}},
+    }
+}
+
+
+async def audit_bulk(current, X_raw: np.ndarray, probabilities: np.ndarray, upper=None):
+    # A big batch can outgrow the audit ring: wait for the writer in a worker thread, not on the loop
+    await run_in_threadpool(
+        audit_log.record, X_raw, probabilities, CLASSIFICATION_THRESHOLD, current.version, AUDIT_BULK_WAIT_S, upper
+    )
+
+
+def parse_json_batch(body: bytes, endpoint: str):
+    """Raw JSON body -> BulkParser result; 400 if it is not readable JSON."""
+    try:
+        return bulk_parser.parse_json(body)
+    except ValueError as e:  # includes json.JSONDecodeError
+        ERRORS.inc(endpoint, "unreadable")
+        raise HTTPException(status_code=400, detail=f"Unreadable JSON: {e}")
+
+
+async def run_bulk(parsed, endpoint: str, start: float, handler, loc_prefix: tuple = ()) -> dict:
+    """
+    Shared body of the bulk endpoints: size/validation checks and the raw matrix,
+    then `await handler(current, X_raw)` builds the response. Failures map to 400.
+    """
+    check_batch_size(len(parsed))
+    if not parsed.ok:
+        ERRORS.inc(endpoint, "invalid_input")
+        detail = [{**error, "loc": [*loc_prefix, *error["loc"]]} for error in parsed.errors]
+        raise HTTPException(status_code=422, detail=detail)
+    try:
+        current = registry.get()
+        X_raw = parsed.to_matrix(current.pipeline.input_columns)
+        STAGE_LATENCY.observe(time.perf_counter() - start, "parse")
+        return await handler(current, X_raw)
+    except Exception as e:
+        ERRORS.inc(endpoint, "inference")
+        logger.error("❌ Batch Error (%s): %s", endpoint, e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def score_rows(source: str):
+    """Bulk handler: cached scoring in the threadpool, audit, /predict/batch response."""
+    async def handler(current, X_raw: np.ndarray) -> dict:
+        # Large batches would block the event loop: score them in the threadpool
+        probabilities = await run_in_threadpool(score_matrix_cached, current, X_raw, source)
+        await audit_bulk(current, X_raw, probabilities)
+        start = time.perf_counter()
+        response = batch_response(probabilities)
+        STAGE_LATENCY.observe(time.perf_counter() - start, "serialize")
+        return response
+    return handler
+
+
+@app.post("/predict/batch", openapi_extra=BATCH_REQUEST_SCHEMA)
+async def predict_batch(request: Request):
+    """
+    Scores a JSON array of patients (or a columnar object of arrays) in one
+    vectorized pass. The body is parsed straight into a NumPy array and
+    checked against the DiabetesInput constraints column by column.
+    """
+    body = await request.body()
+    start = time.perf_counter()
+    parsed = parse_json_batch(body, "/predict/batch")
+    # Same error locations FastAPI's own body validation used
+    return await run_bulk(parsed, "/predict/batch", start, score_rows("batch"), loc_prefix=("body",))
+
+
+@app.post("/predict/batch/csv")
+async def predict_batch_csv(request: Request):
+    """
+    Scores a CSV upload (raw `text/csv` body with a header row).
+    Rows are checked against the DiabetesInput schema before scoring.
+    """
+    body = await request.body()
+    start = time.perf_counter()
+    try:
+        parsed = bulk_parser.parse_csv(body)
+    except KeyError as e:
+        ERRORS.inc("/predict/batch/csv", "invalid_input")
+        raise HTTPException(status_code=422, detail=e.args[0])
+    except Exception as e:
+        ERRORS.inc("/predict/batch/csv", "unreadable")
+        raise HTTPException(status_code=400, detail=f"Unreadable CSV: {e}")
+    return await run_bulk(parsed, "/predict/batch/csv", start, score_rows("csv"))
+
+
+# --- Explanations: per-feature contributions to each probability (Saabas path decomposition) ---
+def explanation_response(current, X_raw: np.ndarray) -> tuple:
+    """
+    (probabilities, explanations). Per row: probability, prediction, the forest's
+    base value and the contributions rolled up onto the raw input fields (largest
+    effect first) and per engineered feature. base_value + sum(contributions) == probability.
+    """
+    # Explained rows are predictions too: they count towards drift (runs in the threadpool)
+    drift_monitor.observe(X_raw)
+    pipeline = current.pipeline
+    probabilities, bias, contributions = pipeline.explain(X_raw)
+    raw_contributions = contributions @ pipeline.raw_rollup()
+    explanations = []
+    for probability, by_feature, by_field in zip(probabilities, contributions.tolist(), raw_contributions.tolist()):
+        fields = sorted(zip(pipeline.input_columns, by_field), key=lambda item: -abs(item[1]))
+        explanations.append({
+            "prediction": int(probability >= CLASSIFICATION_THRESHOLD),
+            "probability": round(float(probability), 4),
+            "base_value": round(bias, 6),
+            "contributions": {col: round(value, 6) for col, value in fields},
+            "feature_contributions": {col: round(value, 6) for col, value in zip(pipeline.columns, by_feature)},
+        })
+    return probabilities, explanations
+
+
+@app.post("/explain")
+async def explain(data: DiabetesInput):
+    """Why a patient got their score: contributions of each input field to the probability."""
+    try:
+        current = registry.get()
+        X_raw = records_to_matrix([data], current.pipeline.input_columns)
+        probabilities, explanations = await run_in_threadpool(explanation_response, current, X_raw)
+        await audit_bulk(current, X_raw, probabilities)
+        return {**explanations[0], "status": "Success"}
+    except Exception as e:
+        ERRORS.inc("/explain", "inference")
+        logger.error("❌ Explanation Error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def explain_rows(current, X_raw: np.ndarray) -> dict:
+    """Bulk handler for /explain/batch."""
+    probabilities, explanations = await run_in_threadpool(explanation_response, current, X_raw)
+    await audit_bulk(current, X_raw, probabilities)
+    return {"count": len(explanations), "explanations": explanations, "status": "Success"}
+
+
+@app.post("/explain/batch", openapi_extra=BATCH_REQUEST_SCHEMA)
+async def explain_batch(request: Request):
+    """Explanations for a JSON batch (same body formats and limits as /predict/batch)."""
+    body = await request.body()
+    start = time.perf_counter()
+    parsed = parse_json_batch(body, "/explain/batch")
+    return await run_bulk(parsed, "/explain/batch", start, explain_rows, loc_prefix=("body",))
+
+
+def decision_response(current, X_raw: np.ndarray) -> tuple:
+    """
+    (lower bounds, upper bounds, decisions). Per row: the label at CLASSIFICATION_THRESHOLD,
+    bounds on the probability and how many trees were evaluated before the label could
+    no longer change.
+    """
+    drift_monitor.observe(X_raw)
+    labels, lower, upper, trees_used = current.pipeline.decide(X_raw, CLASSIFICATION_THRESHOLD)
+    decisions = [
+        {
+            "prediction": int(label),
+            "probability_lower": round(low, 4),
+            "probability_upper": round(high, 4),
+            "trees_evaluated": n_trees,
+        }
+        for label, low, high, n_trees in zip(labels.tolist(), lower.tolist(), upper.tolist(), trees_used.tolist())
+    ]
+    return lower, upper, decisions
+
+
+@app.post("/predict/decision")
+async def predict_decision(data: DiabetesInput):
+    """Label only: stops evaluating trees once the remaining ones cannot flip the decision."""
+    try:
+        current = registry.get()
+        X_raw = records_to_matrix([data], current.pipeline.input_columns)
+        # One row is a short plain-Python walk (see early_exit.py): run it inline
+        lower, upper, decisions = decision_response(current, X_raw)
+        await audit_bulk(current, X_raw, lower, upper)
+        return {**decisions[0], "status": "Success"}
+    except Exception as e:
+        ERRORS.inc("/predict/decision", "inference")
+        logger.error("❌ Decision Error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def decide_rows(current, X_raw: np.ndarray) -> dict:
+    """Bulk handler for /predict/decision/batch."""
+    lower, upper, decisions = await run_in_threadpool(decision_response, current, X_raw)
+    await audit_bulk(current, X_raw, lower, upper)
+    BATCH_ROWS.observe(len(decisions), "decision")
+    return {
+        "count": len(decisions),
+        "threshold": CLASSIFICATION_THRESHOLD,
+        "decisions": decisions,
+        "status": "Success",
+    }
+
+
+@app.post("/predict/decision/batch", openapi_extra=BATCH_REQUEST_SCHEMA)
+async def predict_decision_batch(request: Request):
+    """Early-exit labels for a JSON batch (same body formats and limits as /predict/batch)."""
+    body = await request.body()
+    start = time.perf_counter()
+    parsed = parse_json_batch(body, "/predict/decision/batch")
+    return await run_bulk(parsed, "/predict/decision/batch", start, decide_rows, loc_prefix=("body",))
+
+
+# OpenAPI body for the binary endpoint (layouts documented in src/app/binary_format.py)
+BINARY_REQUEST_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            MATRIX_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            ARROW_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+        },
+    }
+}
+
+
+@app.post("/predict/binary", openapi_extra=BINARY_REQUEST_SCHEMA)
+async def predict_binary(request: Request):
+    """
+    Scores a binary columnar body: a fixed-layout float32 matrix or an Arrow
+    IPC stream, picked by Content-Type. The response format follows the
+    Accept header: either binary format, or the /predict/batch JSON.
+    The model version and threshold are sent as headers.
+    """
+    endpoint = "/predict/binary"
+    content_type = media_type(request.headers.get("content-type"))
+    if content_type not in BINARY_MEDIA_TYPES:
+        ERRORS.inc(endpoint, "unsupported_media_type")
+        raise HTTPException(status_code=415, detail=f"Content-Type must be one of {list(BINARY_MEDIA_TYPES)}.")
+    response_type = negotiate(request.headers.get("accept"), default=content_type)
+    if response_type is None:
+        ERRORS.inc(endpoint, "not_acceptable")
+        raise HTTPException(
+            status_code=406, detail=f"Can respond with {[*BINARY_MEDIA_TYPES, JSON_MEDIA_TYPE]} only."
+        )
+
+    body = await request.body()
+    start = time.perf_counter()
+    current = registry.get()
+    columns = current.pipeline.input_columns
+    try:
+        # The matrix layout decodes to a view of the body: no copy before the pipeline's own buffers
+        decode = decode_matrix if content_type == MATRIX_MEDIA_TYPE else decode_arrow
+        X_raw = decode(body, columns)
+    except BinaryFormatError as e:
+        ERRORS.inc(endpoint, "unreadable")
+        raise HTTPException(status_code=400, detail=str(e))
+    check_batch_size(X_raw.shape[0], MAX_BINARY_BATCH_ROWS)
+    errors, error_count = bulk_parser.check_matrix(X_raw, columns)
+    if error_count:
+        ERRORS.inc(endpoint, "invalid_input")
+        raise HTTPException(status_code=422, detail=errors)
+    STAGE_LATENCY.observe(time.perf_counter() - start, "parse")
+
+    try:
+        probabilities = await run_in_threadpool(score_matrix_cached, current, X_raw, "binary")
+        await audit_bulk(current, X_raw, probabilities)
+        start = time.perf_counter()
+        headers = {"X-Model-Version": current.version, "X-Classification-Threshold": str(CLASSIFICATION_THRESHOLD)}
+        if response_type == JSON_MEDIA_TYPE:
+            response = JSONResponse(batch_response(probabilities), headers=headers)
+        else:
+            predictions = probabilities >= CLASSIFICATION_THRESHOLD
+            if response_type == MATRIX_MEDIA_TYPE:
+                content = encode_matrix_response(probabilities, predictions)
+            else:
+                content = encode_arrow_response(probabilities, predictions, {
+                    "model_version": current.version, "threshold": CLASSIFICATION_THRESHOLD,
+                })
+            response = Response(content, media_type=response_type, headers=headers)
+        STAGE_LATENCY.observe(time.perf_counter() - start, "serialize")
+        return response
+    except Exception as e:
+        ERRORS.inc(endpoint, "inference")
+        logger.error("❌ Binary Inference Error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Registered last so it knows every route path (other paths are labelled "other")
+app.add_middleware(
+    MetricsMiddleware, requests=REQUESTS, latency=REQUEST_LATENCY,
+    routes=[route.path for route in app.routes],
+)
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=8001)
     
@@ -0,0 +1,149 @@
+# src/app/serve.py
+"""
+Multi-worker entry point for the prediction API.
+
+The parent process loads the artifact set once, freezes the GC so later
+collections don't write to (and un-share) those objects, binds the socket
+and then forks the workers. Every worker serves the same FastAPI app from
+the inherited, copy-on-write model memory. With ARTIFACT_MMAP_MODE=r the
+pipeline's arrays are additionally memory-mapped from the artifact file,
+so they live in the shared page cache rather than in any process's heap.
+
+Usage: API_WORKERS=4 python src/app/serve.py
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+# Adding project root for module imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.app.main import app, registry
+
+# Global Configuration
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8001"))
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+WORKER_RESTART_DELAY_S = 1.0
+
+
+def process_memory(pid: int) -> dict:
+    """RSS / PSS / shared / private memory of a process in MB (Linux /proc)."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024.0
+    return {
+        "rss_mb": fields.get("Rss", 0.0),
+        "pss_mb": fields.get("Pss", 0.0),
+        "shared_mb": fields.get("Shared_Clean", 0.0) + fields.get("Shared_Dirty", 0.0),
+        "private_mb": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, preloaded: bool):
+    """Runs one uvicorn server on the inherited listening socket (child process)."""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if not preloaded:
+        registry.get()
+    config = uvicorn.Config(app, log_level=os.getenv("UVICORN_LOG_LEVEL", "warning"))
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn_worker(sock: socket.socket, preloaded: bool) -> int:
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 0
+        try:
+            run_worker(sock, preloaded)
+        except BaseException as e:
+            print(f"❌ Worker {os.getpid()} crashed: {e}")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+    return pid
+
+
+def serve(host: str = API_HOST, port: int = API_PORT, workers: int = API_WORKERS, preload: bool = True):
+    """Pre-fork server: load once in the parent, share with `workers` children."""
+    if preload:
+        current = registry.get()
+        print(f"✅ Artifacts loaded once in parent {os.getpid()}: {current.pipeline.version}")
+        # Move everything allocated so far out of the GC's reach: collections in the
+        # workers won't touch (and copy) the pages holding the shared objects
+        gc.collect()
+        gc.freeze()
+
+    sock = bind_socket(host, port)
+    if workers <= 1:
+        print(f"🚀 Serving on http://{host}:{port} (single process)")
+        config = uvicorn.Config(app, log_level=os.getenv("UVICORN_LOG_LEVEL", "info"))
+        uvicorn.Server(config).run(sockets=[sock])
+        return
+
+    children = {spawn_worker(sock, preload) for _ in range(workers)}
+    print(f"🚀 Serving on http://{host}:{port} with {workers} workers: {sorted(children)}")
+
+    stopping = False
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    # Supervise: replace workers that die unexpectedly
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            print(f"⚠️ Worker {pid} exited ({status}); restarting...")
+            time.sleep(WORKER_RESTART_DELAY_S)
+            children.add(spawn_worker(sock, preload))
+    sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-worker Diabetes prediction API")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS)
+    parser.add_argument(
+        "--no-preload", dest="preload", action="store_false",
+        help="Let every worker load its own artifact copy (baseline for memory comparisons)",
+    )
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.preload)
+
+
+if __name__ == "__main__":
+    main()
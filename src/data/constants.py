@@ -0,0 +1,9 @@
+# src/data/constants.py
+# Dataset constants shared by training and inference. Kept free of pandas /
+# sklearn imports: the API imports this module at startup.
+
+# Consts based on notebook findings
+MISSING_COLS = ['Glucose', 'BloodPressure', 'SkinThickness', 'Insulin', 'BMI']
+MIN_PHYSIOLOGICAL_INSULIN = 1.0
+# Decision threshold served by the API and score.py; hyperparameters are tuned for it
+CLASSIFICATION_THRESHOLD = 0.40
@@ -0,0 +1,229 @@
+# src/data/fast_impute.py
+"""
+Inference-time replacement for IterativeImputer.transform.
+
+The fitted MICE imputer walks every round and every estimator for the whole
+batch, even when nothing is missing. FastImputer extracts the fitted pieces
+(initial statistics + the linear round estimators) into plain arrays and:
+  * passes rows with no missing values straight through (untouched, exactly
+    like IterativeImputer, which only ever overwrites missing entries),
+  * groups the remaining rows by missingness pattern and replays only the
+    estimators that write to that pattern's missing columns ("exact" mode:
+    same arithmetic, equal up to BLAS summation order, ~1e-13),
+  * or, in "fixed_point" mode, applies a per-pattern affine map precomputed
+    by collapsing all imputation rounds into a single matrix product.
+"""
+import os
+import sys
+import itertools
+import numpy as np
+
+from src.data.constants import MISSING_COLS
+
+IMPUTER_MODE = os.getenv("IMPUTER_MODE", "exact")
+FIXED_POINT_TOLERANCE = 1e-6
+IMPUTER_MODES = ("exact", "fixed_point")
+
+
+class FastImputer:
+    """Drop-in `transform` for a fitted IterativeImputer (see module docstring)."""
+
+    def __init__(self, imputer, mode: str = IMPUTER_MODE, precompute_cols=None):
+        if mode not in IMPUTER_MODES:
+            raise ValueError(f"Unknown imputer mode '{mode}'. Use one of {IMPUTER_MODES}.")
+        self.mode = mode
+        self.feature_names_in_ = getattr(imputer, "feature_names_in_", None)
+        self.statistics_ = np.asarray(imputer.initial_imputer_.statistics_, dtype=np.float64)
+        self.n_features_in_ = self.statistics_.shape[0]
+        self.n_iter_ = imputer.n_iter_
+
+        # Steps of all rounds, in order: (target column, neighbour columns, coef, intercept)
+        min_value = getattr(imputer, "_min_value", np.full(self.n_features_in_, -np.inf))
+        max_value = getattr(imputer, "_max_value", np.full(self.n_features_in_, np.inf))
+        self.min_value = np.asarray(min_value, dtype=np.float64)
+        self.max_value = np.asarray(max_value, dtype=np.float64)
+        self.steps = [
+            (
+                int(triplet.feat_idx),
+                np.asarray(triplet.neighbor_feat_idx, dtype=np.intp),
+                np.asarray(triplet.estimator.coef_, dtype=np.float64),
+                float(triplet.estimator.intercept_),
+            )
+            for triplet in imputer.imputation_sequence_
+        ] if self._is_linear(imputer) else None
+
+        # Anything we can't replay from arrays goes through the original imputer
+        self._imputer = None if self.steps is not None else imputer
+        if self._imputer is not None and mode == "fixed_point":
+            raise ValueError("fixed_point mode needs linear round estimators (e.g. BayesianRidge).")
+
+        self._fixed_point = {}
+        if mode == "fixed_point":
+            self._precompute_fixed_point(precompute_cols)
+
+    @classmethod
+    def from_arrays(
+        cls, statistics, n_iter, min_value, max_value, steps, feature_names=None, mode: str = IMPUTER_MODE
+    ) -> "FastImputer":
+        """
+        Rebuilds a linear FastImputer from its fitted arrays (as stored in the
+        artifact bundle) without the original IterativeImputer or sklearn.
+        """
+        if mode not in IMPUTER_MODES:
+            raise ValueError(f"Unknown imputer mode '{mode}'. Use one of {IMPUTER_MODES}.")
+        self = cls.__new__(cls)
+        self.mode = mode
+        self.feature_names_in_ = None if feature_names is None else np.asarray(feature_names, dtype=object)
+        self.statistics_ = np.asarray(statistics, dtype=np.float64)
+        self.n_features_in_ = self.statistics_.shape[0]
+        self.n_iter_ = int(n_iter)
+        self.min_value = np.asarray(min_value, dtype=np.float64)
+        self.max_value = np.asarray(max_value, dtype=np.float64)
+        self.steps = list(steps)
+        self._imputer = None
+        self._fixed_point = {}
+        if mode == "fixed_point":
+            self._precompute_fixed_point(None)
+        return self
+
+    def _precompute_fixed_point(self, precompute_cols):
+        # Precompute every pattern over the columns that can be missing at inference
+        # (other patterns, e.g. a NaN from a CSV upload, are built on first sight)
+        cols = self._default_precompute_cols() if precompute_cols is None else precompute_cols
+        for size in range(1, len(cols) + 1):
+            for missing in itertools.combinations(cols, size):
+                self._fixed_point_map(self._pattern_key(missing))
+
+    @staticmethod
+    def _is_linear(imputer) -> bool:
+        return (
+            not imputer.sample_posterior
+            and not imputer.add_indicator
+            and not np.isnan(imputer.initial_imputer_.statistics_).any()
+            and all(
+                hasattr(t.estimator, "coef_") and np.ndim(t.estimator.coef_) == 1
+                for t in imputer.imputation_sequence_
+            )
+        )
+
+    def _default_precompute_cols(self):
+        if self.feature_names_in_ is None:
+            return []
+        names = list(self.feature_names_in_)
+        return [names.index(col) for col in MISSING_COLS if col in names]
+
+    def _pattern_key(self, missing_cols) -> int:
+        key = 0
+        for col in missing_cols:
+            key |= 1 << int(col)
+        return key
+
+    def _missing_cols(self, key: int) -> np.ndarray:
+        return np.array([j for j in range(self.n_features_in_) if key >> j & 1], dtype=np.intp)
+
+    # --- Exact mode: replay only the steps that touch this pattern ---
+    def _impute_group_exact(self, Xg: np.ndarray, missing: np.ndarray) -> np.ndarray:
+        Xg[:, missing] = self.statistics_[missing]
+        if self.n_iter_ == 0:
+            return Xg
+        is_missing = np.zeros(self.n_features_in_, dtype=bool)
+        is_missing[missing] = True
+        for feat_idx, neighbor_idx, coef, intercept in self.steps:
+            if is_missing[feat_idx]:
+                predicted = Xg[:, neighbor_idx] @ coef + intercept
+                Xg[:, feat_idx] = np.clip(predicted, self.min_value[feat_idx], self.max_value[feat_idx])
+        return Xg
+
+    # --- Fixed-point mode: all rounds collapsed into one affine map ---
+    def _fixed_point_map(self, key: int):
+        cached = self._fixed_point.get(key)
+        if cached is not None:
+            return cached
+
+        missing = self._missing_cols(key)
+        if not np.all(np.isinf(self.min_value[missing])) or not np.all(np.isinf(self.max_value[missing])):
+            raise ValueError("fixed_point mode can't reproduce finite min_value/max_value clipping.")
+        observed = np.setdiff1d(np.arange(self.n_features_in_), missing)
+
+        # State after each step is M @ x_observed + c (missing inputs start at their statistic)
+        M = np.zeros((self.n_features_in_, observed.size))
+        M[observed, np.arange(observed.size)] = 1.0
+        c = np.zeros(self.n_features_in_)
+        c[missing] = self.statistics_[missing]
+        if self.n_iter_ > 0:
+            is_missing = np.zeros(self.n_features_in_, dtype=bool)
+            is_missing[missing] = True
+            for feat_idx, neighbor_idx, coef, intercept in self.steps:
+                if is_missing[feat_idx]:
+                    M[feat_idx] = coef @ M[neighbor_idx]
+                    c[feat_idx] = coef @ c[neighbor_idx] + intercept
+
+        mapping = (missing, observed, np.ascontiguousarray(M[missing].T), c[missing])
+        self._fixed_point[key] = mapping
+        return mapping
+
+    def transform(self, X, copy: bool = True) -> np.ndarray:
+        """
+        Imputes NaNs in X (DataFrame or array) and returns a float64 array.
+        With `copy=False` a float64 ndarray input is imputed in place.
+        """
+        # pandas is only imported by callers that pass DataFrames (the API never does)
+        pd = sys.modules.get("pandas")
+        if pd is not None and isinstance(X, pd.DataFrame):
+            if self.feature_names_in_ is not None and list(X.columns) != list(self.feature_names_in_):
+                raise ValueError("Input columns don't match the columns the imputer was fitted on.")
+            X = X.to_numpy(dtype=np.float64)
+        # Own copy by default, like IterativeImputer
+        Xt = np.array(X, dtype=np.float64) if copy else np.asarray(X, dtype=np.float64)
+
+        mask = np.isnan(Xt)
+        if self.n_iter_ > 0 and mask.all():
+            # IterativeImputer returns the initial imputation in this corner case
+            Xt[mask] = np.broadcast_to(self.statistics_, Xt.shape)[mask]
+            return Xt
+
+        # --- 1. Complete rows are returned untouched ---
+        rows = np.flatnonzero(mask.any(axis=1))
+        if rows.size == 0:
+            return Xt
+
+        if self._imputer is not None:
+            import pandas as pd
+            incomplete = pd.DataFrame(Xt[rows], columns=self.feature_names_in_)
+            Xt[rows] = self._imputer.transform(incomplete)
+            return Xt
+
+        # --- 2. Group the rest by missingness pattern, one vectorized pass per group ---
+        weights = np.left_shift(1, np.arange(self.n_features_in_), dtype=np.int64)
+        keys = mask[rows] @ weights
+        unique_keys, group_of_row = np.unique(keys, return_inverse=True)
+
+        for g, key in enumerate(unique_keys):
+            group_rows = rows[group_of_row == g]
+            if self.mode == "fixed_point":
+                missing, observed, A, b = self._fixed_point_map(int(key))
+                Xt[np.ix_(group_rows, missing)] = Xt[np.ix_(group_rows, observed)] @ A + b
+            else:
+                missing = self._missing_cols(int(key))
+                Xt[group_rows] = self._impute_group_exact(Xt[group_rows], missing)
+        return Xt
+
+    def verify(self, imputer, X, atol: float = FIXED_POINT_TOLERANCE) -> float:
+        """
+        Checks this engine against the original imputer on a test set and
+        returns the max absolute difference. Raises if it exceeds `atol`.
+        """
+        reference = imputer.transform(X)
+        max_error = float(np.max(np.abs(self.transform(X) - reference))) if len(reference) else 0.0
+        if not max_error <= atol:
+            raise ValueError(
+                f"❌ {self.mode} imputer deviates from IterativeImputer by {max_error:.3g} (> {atol:g})"
+            )
+        return max_error
+
+
+def build_fast_imputer(imputer, mode: str = IMPUTER_MODE, precompute_cols=None):
+    """Wraps a fitted IterativeImputer; anything else is returned unchanged."""
+    if not hasattr(imputer, "imputation_sequence_"):
+        return imputer
+    return FastImputer(imputer, mode=mode, precompute_cols=precompute_cols)
@@ -3,6 +3,23 @@
 
 import pandas as pd
 import os
+from typing import Iterator, Optional
+
+# Compact dtypes for streaming ingestion. Real exports leave clinical fields blank,
+# which plain int columns can't hold: inputs are float32 (exact for these integer
+# ranges, NaN for blanks) and the label is a nullable Int8
+COMPACT_DTYPES = {
+    'Pregnancies': 'float32',
+    'Glucose': 'float32',
+    'BloodPressure': 'float32',
+    'SkinThickness': 'float32',
+    'Insulin': 'float32',
+    'BMI': 'float32',
+    'DiabetesPedigreeFunction': 'float32',
+    'Age': 'float32',
+    'Outcome': 'Int8',
+}
+DEFAULT_CHUNK_SIZE = int(os.getenv("DATA_CHUNK_SIZE", "100000"))
 
 def load_data(file_path: str) -> pd.DataFrame:
     """
@@ -30,3 +47,23 @@ def load_data(file_path: str) -> pd.DataFrame:
     except Exception as e:
         print(f"❌ Error reading CSV file: {e}")
         raise
+
+
+def load_data_chunks(
+    file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, dtypes: Optional[dict] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams the dataset in chunks of `chunk_size` rows with compact dtypes
+    (COMPACT_DTYPES unless `dtypes` is given), so memory stays bounded by
+    the chunk size instead of the file size.
+    Columns other than the clinical ones keep pandas' inferred dtypes.
+    """
+    print(f"--- 🔄 Streaming data from: {file_path} (chunks of {chunk_size} rows) ---")
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"❌ Data file not found at: {file_path}")
+
+    header = pd.read_csv(file_path, nrows=0).columns
+    dtypes = {col: dtype for col, dtype in (dtypes or COMPACT_DTYPES).items() if col in header}
+    with pd.read_csv(file_path, dtype=dtypes, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            yield chunk
@@ -6,10 +6,9 @@ import os
 from sklearn.experimental import enable_iterative_imputer
 from sklearn.impute import IterativeImputer
 
-# Consts based on notebook findings
-MISSING_COLS = ['Glucose', 'BloodPressure', 'SkinThickness', 'Insulin', 'BMI']
+from src.data.constants import MISSING_COLS, MIN_PHYSIOLOGICAL_INSULIN
+
 ARTIFACTS_DIR = "artifacts"
-MIN_PHYSIOLOGICAL_INSULIN = 1.0
 
 def create_missing_indicators(X: pd.DataFrame) -> pd.DataFrame:
     """Track which values were originally missing before imputation"""
@@ -19,10 +18,25 @@ def create_missing_indicators(X: pd.DataFrame) -> pd.DataFrame:
             X_copy[f'Is_{col}_Missing'] = (X_copy[col] == 0).astype(int)
     return X_copy
 
-def preprocess_data(X: pd.DataFrame, is_training: bool = True):
+def mark_missing(X: pd.DataFrame) -> pd.DataFrame:
+    """Adds the missingness indicators, then turns the 0 placeholders into NaN for MICE."""
+    X = create_missing_indicators(X)
+    for col in MISSING_COLS:
+        if col in X.columns:
+            X[col] = X[col].replace(0, np.nan)
+    return X
+
+def make_imputer() -> IterativeImputer:
+    """Unfitted MICE imputer with the notebook params (10 iters, fixed seed)."""
+    return IterativeImputer(max_iter=10, random_state=42)
+
+def preprocess_data(X: pd.DataFrame, is_training: bool = True, imputer=None):
     """
     Refactored to match Notebook: MICE Imputation + Insulin Clamping.
     Using IterativeImputer instead of KNN for better cross-feature estimation.
+
+    At inference, pass an already-loaded `imputer` (e.g. from the artifact
+    registry) to skip reading mice_imputer.pkl from disk on every call.
     """
     # Defensive copy to avoid SettingWithCopy warnings
     X = X.copy()
@@ -32,24 +46,21 @@ def preprocess_data(X: pd.DataFrame, is_training: bool = True):
         X = X.drop(columns=['Outcome'])
 
     # 2. Setup missingness
-    X = create_missing_indicators(X)
-    for col in MISSING_COLS:
-        if col in X.columns:
-            X[col] = X[col].replace(0, np.nan)
+    X = mark_missing(X)
     
     imputer_path = os.path.join(ARTIFACTS_DIR, 'mice_imputer.pkl')
 
     # 3. MICE Logic
     if is_training:
-        # Match notebook params: 10 iters, fixed seed
-        imputer = IterativeImputer(max_iter=10, random_state=42)
+        imputer = make_imputer()
         X_imputed_array = imputer.fit_transform(X)
         os.makedirs(ARTIFACTS_DIR, exist_ok=True)
         joblib.dump(imputer, imputer_path)
     else:
-        if not os.path.exists(imputer_path):
-            raise RuntimeError("Missing imputer artifact. Run training pipeline first.")
-        imputer = joblib.load(imputer_path)
+        if imputer is None:
+            if not os.path.exists(imputer_path):
+                raise RuntimeError("Missing imputer artifact. Run training pipeline first.")
+            imputer = joblib.load(imputer_path)
         X_imputed_array = imputer.transform(X)
 
     # 4. Post-imputation cleanup
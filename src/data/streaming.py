@@ -0,0 +1,286 @@
+# src/data/streaming.py
+"""
+Chunked, bounded-memory fitting and transformation of large patient files.
+
+Transform: rows are read with compact dtypes (load_data_chunks), pushed
+through the fitted inference pipeline's imputer -> features -> scaler one
+chunk at a time, and appended to the output file as each chunk finishes.
+
+Fit (out-of-core training of the preprocessing artifacts):
+  pass 1  streams the file once, keeping a uniform reservoir sample of
+          rows and the missing-value statistics; the MICE imputer is
+          fitted on the sample
+  pass 2  streams it again: impute -> FeatureKernel -> scaler.partial_fit
+The BMI dummy columns are decided after pass 2 from the categories that
+actually occurred, exactly like get_dummies(drop_first=True) on the full
+matrix would, and the scaler is narrowed to them. The drift reference
+profile is built from the pass-1 sample. The artifacts (mice_imputer.pkl,
+scaler.pkl, columns.pkl, reference_profile.json) are drop-in compatible
+with the in-memory training path. Peak memory depends on the chunk and
+reservoir sizes only, never on the file size.
+
+Usage:
+  python src/data/streaming.py fit data.csv --artifacts-dir artifacts --reservoir-size 100000
+  python src/data/streaming.py transform input.csv features.parquet --chunk-size 100000
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Iterable, Iterator, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+# Adding project root for module imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.data.load_data import load_data_chunks, DEFAULT_CHUNK_SIZE, COMPACT_DTYPES
+from src.data.preprocess import MISSING_COLS, MIN_PHYSIOLOGICAL_INSULIN, mark_missing, make_imputer
+from src.features.build_features import (
+    BMI_BIN_EDGES, BMI_CATEGORIES, BMI_DUMMY_PREFIX, compile_feature_kernel, feature_engineering
+)
+from src.monitoring.drift import build_reference_profile, save_reference_profile
+
+DEFAULT_ARTIFACTS_DIR = "artifacts"
+TARGET_COLUMN = 'Outcome'
+# Rows the imputer is fitted on in streaming-fit mode
+RESERVOIR_SIZE = int(os.getenv("IMPUTER_RESERVOIR_SIZE", "100000"))
+# Fitting keeps the fractional columns at full precision (same statistics as the in-memory fit)
+FIT_DTYPES = {**COMPACT_DTYPES, 'BMI': 'float64', 'DiabetesPedigreeFunction': 'float64'}
+
+
+def transform_chunks(chunks: Iterable[pd.DataFrame], pipeline) -> Iterator[pd.DataFrame]:
+    """Scaled model features (float32, columns.pkl order) for every raw chunk."""
+    for chunk in chunks:
+        X_raw = chunk[pipeline.input_columns].to_numpy(dtype=np.float64)
+        # transform() returns a reused scratch buffer: copy out before the next chunk
+        features = pd.DataFrame(
+            pipeline.transform(X_raw).astype(np.float32), columns=pipeline.columns, index=chunk.index
+        )
+        if TARGET_COLUMN in chunk.columns:
+            features[TARGET_COLUMN] = chunk[TARGET_COLUMN].to_numpy()
+        yield features
+
+
+class ChunkWriter:
+    """Appends DataFrame chunks to one CSV or Parquet file (by extension)."""
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.format = "parquet" if output_path.endswith((".parquet", ".pq")) else "csv"
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, chunk: pd.DataFrame):
+        if self.format == "csv":
+            chunk.to_csv(
+                self.output_path, mode="a" if self._wrote_header else "w",
+                header=not self._wrote_header, index=False,
+            )
+            self._wrote_header = True
+            return
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError(
+                "Missing dependency: 'pyarrow' is needed for Parquet output. "
+                "Install with: python -m pip install pyarrow (or write to .csv)"
+            )
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.output_path, table.schema)
+        self._parquet_writer.write_table(table)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def stream_transform(
+    input_path: str,
+    output_path: str,
+    pipeline=None,
+    artifacts_dir: str = DEFAULT_ARTIFACTS_DIR,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    """Transforms `input_path` chunk by chunk into `output_path`; returns throughput stats."""
+    if pipeline is None:
+        from src.models.registry import load_artifact_set
+        pipeline = load_artifact_set(artifacts_dir).pipeline
+
+    start = time.perf_counter()
+    n_rows = n_chunks = 0
+    with ChunkWriter(output_path) as writer:
+        for features in transform_chunks(load_data_chunks(input_path, chunk_size), pipeline):
+            writer.write(features)
+            n_rows += len(features)
+            n_chunks += 1
+    seconds = time.perf_counter() - start
+    stats = {
+        "rows": n_rows,
+        "chunks": n_chunks,
+        "seconds": seconds,
+        "rows_per_s": n_rows / seconds if seconds > 0 else 0.0,
+    }
+    print(f"✅ Streamed {n_rows} rows in {n_chunks} chunks -> {output_path} "
+          f"({stats['rows_per_s']:,.0f} rows/s)")
+    return stats
+
+
+# --- Out-of-core fitting ---
+class ReservoirSampler:
+    """Uniform sample of at most `size` rows from a stream of row blocks (Algorithm R)."""
+
+    def __init__(self, size: int, n_columns: int, seed: int = 42):
+        self.size = size
+        self.rows = np.empty((size, n_columns), dtype=np.float64)
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def add(self, block: np.ndarray):
+        n = block.shape[0]
+        fill = max(0, min(n, self.size - self.seen))
+        if fill:
+            self.rows[self.seen:self.seen + fill] = block[:fill]
+        if fill < n:
+            # Row number i (0-based, stream-wide) replaces a random slot with probability size / (i + 1)
+            positions = np.arange(self.seen + fill, self.seen + n)
+            slots = self.rng.integers(0, positions + 1)
+            keep = slots < self.size
+            self.rows[slots[keep]] = block[fill:][keep]
+        self.seen += n
+
+    def sample(self) -> np.ndarray:
+        return self.rows[:min(self.seen, self.size)]
+
+
+def narrow_scaler(scaler: StandardScaler, columns: list, keep: list) -> StandardScaler:
+    """StandardScaler restricted to the `keep` subset of its `columns` (per-column stats are independent)."""
+    idx = [columns.index(col) for col in keep]
+    narrowed = StandardScaler(with_mean=scaler.with_mean, with_std=scaler.with_std)
+    for attr in ("mean_", "var_", "scale_"):
+        value = getattr(scaler, attr, None)
+        setattr(narrowed, attr, None if value is None else value[idx])
+    seen = scaler.n_samples_seen_
+    narrowed.n_samples_seen_ = seen[idx] if isinstance(seen, np.ndarray) else seen
+    narrowed.n_features_in_ = len(keep)
+    narrowed.feature_names_in_ = np.asarray(keep, dtype=object)
+    return narrowed
+
+
+def fit_streaming(
+    input_path: str,
+    artifacts_dir: str = DEFAULT_ARTIFACTS_DIR,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    reservoir_size: int = RESERVOIR_SIZE,
+    seed: int = 42,
+) -> dict:
+    """Two-pass, bounded-memory fit of the imputer, columns, scaler and drift reference artifacts."""
+    # --- Pass 1: reservoir sample + missing-value statistics ---
+    start = time.perf_counter()
+    input_columns, sampler, zero_counts = None, None, None
+    for chunk in load_data_chunks(input_path, chunk_size, FIT_DTYPES):
+        if input_columns is None:
+            input_columns = [col for col in chunk.columns if col != TARGET_COLUMN]
+            sampler = ReservoirSampler(reservoir_size, len(input_columns), seed)
+            zero_counts = pd.Series(0, index=[col for col in MISSING_COLS if col in input_columns])
+        sampler.add(chunk[input_columns].to_numpy(dtype=np.float64))
+        zero_counts += (chunk[zero_counts.index] == 0).sum()
+    if sampler is None:
+        raise ValueError(f"❌ No rows in {input_path}")
+    n_rows = sampler.seen
+    print(f"📊 Pass 1: {n_rows} rows, missing rates "
+          f"{ {col: round(count / n_rows, 4) for col, count in zero_counts.items()} }")
+
+    sample = pd.DataFrame(sampler.sample(), columns=input_columns)
+    imputer = make_imputer()
+    imputer.fit(mark_missing(sample))
+    imputer_columns = list(imputer.feature_names_in_)
+    print(f"🧩 Imputer fitted on a reservoir of {len(sample)} rows")
+    # Drift reference from the same sample: missing cells are skipped, observed Insulin clamped as in training
+    observed = mark_missing(sample)
+    if 'Insulin' in observed.columns:
+        observed['Insulin'] = observed['Insulin'].clip(lower=MIN_PHYSIOLOGICAL_INSULIN)
+    profile = build_reference_profile(observed)
+    pass1_seconds = time.perf_counter() - start
+
+    # Layout with every BMI dummy; narrowed once the categories seen are known
+    base_columns = [
+        col for col in feature_engineering(mark_missing(sample.head(1)), drop_first=False).columns
+        if not col.startswith(BMI_DUMMY_PREFIX)
+    ]
+    all_dummies = [BMI_DUMMY_PREFIX + cat for cat in sorted(BMI_CATEGORIES)]
+    wide_columns = base_columns + all_dummies
+    kernel = compile_feature_kernel(imputer_columns, wide_columns)
+    insulin_idx = imputer_columns.index('Insulin') if 'Insulin' in imputer_columns else None
+    bmi_idx = imputer_columns.index('BMI')
+
+    # --- Pass 2: impute -> features -> scaler.partial_fit ---
+    start = time.perf_counter()
+    scaler = StandardScaler()
+    categories_seen = set()
+    for chunk in load_data_chunks(input_path, chunk_size, FIT_DTYPES):
+        X = imputer.transform(mark_missing(chunk[input_columns].astype(np.float64)))
+        if insulin_idx is not None:
+            np.maximum(X[:, insulin_idx], MIN_PHYSIOLOGICAL_INSULIN, out=X[:, insulin_idx])
+        codes = np.unique(np.digitize(X[:, bmi_idx], BMI_BIN_EDGES))
+        categories_seen.update(BMI_CATEGORIES[code] for code in codes)
+        scaler.partial_fit(pd.DataFrame(kernel.transform(X), columns=wide_columns))
+    pass2_seconds = time.perf_counter() - start
+
+    # get_dummies(drop_first=True) keeps every category present except the alphabetically first
+    columns = base_columns + [BMI_DUMMY_PREFIX + cat for cat in sorted(categories_seen)[1:]]
+    scaler = narrow_scaler(scaler, wide_columns, columns)
+
+    os.makedirs(artifacts_dir, exist_ok=True)
+    joblib.dump(imputer, os.path.join(artifacts_dir, 'mice_imputer.pkl'))
+    joblib.dump(columns, os.path.join(artifacts_dir, 'columns.pkl'))
+    joblib.dump(scaler, os.path.join(artifacts_dir, 'scaler.pkl'))
+    save_reference_profile(profile, artifacts_dir)
+    stats = {
+        "rows": n_rows,
+        "reservoir_rows": len(sample),
+        "features": len(columns),
+        "pass1_seconds": pass1_seconds,
+        "pass2_seconds": pass2_seconds,
+    }
+    print(f"✅ Streaming fit done: {stats}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked fitting / transformation for large patient files")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fit = commands.add_parser("fit", help="Fit imputer, columns and scaler artifacts out of core")
+    fit.add_argument("input_path")
+    fit.add_argument("--artifacts-dir", default=DEFAULT_ARTIFACTS_DIR)
+    fit.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    fit.add_argument("--reservoir-size", type=int, default=RESERVOIR_SIZE)
+
+    transform = commands.add_parser("transform", help="Write scaled features with fitted artifacts")
+    transform.add_argument("input_path")
+    transform.add_argument("output_path", help=".csv or .parquet")
+    transform.add_argument("--artifacts-dir", default=DEFAULT_ARTIFACTS_DIR)
+    transform.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    args = parser.parse_args()
+    if args.command == "fit":
+        fit_streaming(args.input_path, args.artifacts_dir, args.chunk_size, args.reservoir_size)
+    else:
+        stream_transform(args.input_path, args.output_path, artifacts_dir=args.artifacts_dir, chunk_size=args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,44 @@
 # src/data/validate_data.py
 # English Comments
 
+import json
+import os
 import pandas as pd
 
+from src.data.validation_engine import Rule, ValidationEngine, ValidationReport
+
 try:
     import great_expectations as ge
 except Exception:
     ge = None
 
+# "native" (vectorized engine below) or "great_expectations" (original GE suite)
+VALIDATION_ENGINE = os.getenv("VALIDATION_ENGINE", "native")
+VALIDATION_CHUNK_SIZE = int(os.getenv("VALIDATION_CHUNK_SIZE", "1000000"))
+
+EXPECTED_COLUMNS = [
+    'Pregnancies', 'Glucose', 'BloodPressure', 'SkinThickness',
+    'Insulin', 'BMI', 'DiabetesPedigreeFunction', 'Age', 'Outcome'
+]
+NUMERIC_TYPES = ("int", "int64", "float", "float64")
+
+# Same expectations as the GE suite in validate_data_with_ge, as compiled rules
+DIABETES_RULES = (
+    [Rule("exists", col) for col in EXPECTED_COLUMNS]
+    + [Rule("type", col, type_list=NUMERIC_TYPES) for col in EXPECTED_COLUMNS]
+    + [
+        Rule("between", "Age", min_value=0, max_value=120, mostly=0.95),
+        Rule("between", "Pregnancies", min_value=0, max_value=20, mostly=0.95),
+        Rule("min_between", "Glucose", min_value=0, max_value=100),
+        Rule("between", "BloodPressure", min_value=0, max_value=200, mostly=0.95),
+        Rule("between", "BMI", min_value=0, max_value=70, mostly=0.95),
+        Rule("between", "Insulin", min_value=0, max_value=900, mostly=0.95),
+        Rule("between", "SkinThickness", min_value=0, max_value=100, mostly=0.95),
+        Rule("in_set", "Outcome", values=(0, 1)),
+    ]
+)
+DIABETES_ENGINE = ValidationEngine(DIABETES_RULES)
+
 def ensure_great_expectations_available():
     if ge is None:
         raise RuntimeError(
@@ -16,7 +47,46 @@ def ensure_great_expectations_available():
             "or: python -m pip install -r requirements.txt"
         )
 
-def validate_data(df: pd.DataFrame) -> bool:
+def print_report(report: ValidationReport):
+    for result in report.results:
+        if not result.success:
+            details = result.to_dict()
+            print(f"   ❌ {details['rule']}: {details['unexpected_count']} unexpected "
+                  f"({details['unexpected_percent']}%), observed={details['observed_value']}, "
+                  f"samples={details['sample_rows']}{', ' + details['error'] if details['error'] else ''}")
+    print(f"   {len(report.results) - len(report.failures)}/{len(report.results)} rules passed on {report.rows} rows")
+
+def validate_data(df: pd.DataFrame, engine: str = None) -> bool:
+    """
+    Validates the raw data before preprocessing: column existence, data
+    types and logical value ranges, in one vectorized pass (native engine).
+    Set VALIDATION_ENGINE=great_expectations to run the original GE suite.
+
+    Raises ValueError with the structured report if any rule fails.
+    """
+    engine = engine or VALIDATION_ENGINE
+    if engine == "great_expectations":
+        return validate_data_with_ge(df)
+
+    print("--- 🔍 Starting Data Validation ---")
+    report = DIABETES_ENGINE.validate(df)
+    print_report(report)
+    if not report.success:
+        print("❌ Data Validation Failed!")
+        raise ValueError(f"Data validation failed: {json.dumps(report.to_dict(), default=str)}")
+    print("✅ Data Validation Passed!")
+    return True
+
+def validate_file(file_path: str, chunk_size: int = VALIDATION_CHUNK_SIZE) -> ValidationReport:
+    """Streams a CSV through the native engine chunk by chunk (bounded memory); returns the report."""
+    print(f"--- 🔍 Validating {file_path} in chunks of {chunk_size} rows ---")
+    with pd.read_csv(file_path, chunksize=chunk_size) as reader:
+        report = DIABETES_ENGINE.validate_chunks(reader)
+    print_report(report)
+    print("✅ Data Validation Passed!" if report.success else "❌ Data Validation Failed!")
+    return report
+
+def validate_data_with_ge(df: pd.DataFrame) -> bool:
     """
     Validates the raw data using Great Expectations (GX) to ensure data quality
     and consistency before preprocessing.
@@ -40,10 +110,7 @@ def validate_data(df: pd.DataFrame) -> bool:
         # --- Validation Rules (Expectations) ---
 
         # 1. Check required columns existence
-        expected_columns = [
-            'Pregnancies', 'Glucose', 'BloodPressure', 'SkinThickness', 
-            'Insulin', 'BMI', 'DiabetesPedigreeFunction', 'Age', 'Outcome'
-        ]
+        expected_columns = EXPECTED_COLUMNS
         for col in expected_columns:
             batch.expect_column_to_exist(col)
 
@@ -0,0 +1,216 @@
+# src/data/validation_engine.py
+"""
+Vectorized, Great-Expectations-compatible data validation.
+
+A list of declarative rules (column exists, dtype in list, values between
+with `mostly`, column min between, values in set) is compiled once into
+per-column checks. Validation walks each needed column a single time per
+chunk, reusing its null mask for every rule on that column, and keeps
+running counts, so a file can be validated chunk by chunk with the same
+verdict as validating it whole. Verdicts follow GE's semantics: nulls are
+ignored by value checks and `mostly` is the required fraction of non-null
+values that pass.
+"""
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Unexpected rows kept per rule for the report
+SAMPLE_ROWS = 5
+
+# GE type names -> accepted dtype.type (np.dtype(name).type, plus the Python builtin)
+_NATIVE_TYPES = {"int": int, "float": float, "str": str, "bool": bool}
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One expectation. `kind` is exists | type | between | min_between | in_set."""
+    kind: str
+    column: str
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    values: Optional[tuple] = None
+    type_list: Optional[tuple] = None
+    mostly: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        if self.kind == "exists":
+            return f"{self.column} exists"
+        if self.kind == "type":
+            return f"{self.column} type in {list(self.type_list)}"
+        if self.kind in ("between", "min_between"):
+            target = "min" if self.kind == "min_between" else "values"
+            mostly = f" (mostly={self.mostly})" if self.mostly is not None else ""
+            return f"{self.column} {target} in [{self.min_value}, {self.max_value}]{mostly}"
+        return f"{self.column} in {list(self.values)}"
+
+
+def _accepted_types(type_list: Sequence[str]) -> tuple:
+    accepted = []
+    for name in type_list:
+        try:
+            accepted.append(np.dtype(name).type)
+        except TypeError:
+            pass
+        if name in _NATIVE_TYPES:
+            accepted.append(_NATIVE_TYPES[name])
+    return tuple(accepted)
+
+
+@dataclass
+class RuleResult:
+    rule: Rule
+    element_count: int = 0
+    nonnull_count: int = 0
+    unexpected_count: int = 0
+    observed_value: object = None
+    sample_rows: List[dict] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        rule = self.rule
+        if self.error is not None:
+            return False
+        if rule.kind in ("exists", "min_between"):
+            return bool(self.observed_value is not None and self.unexpected_count == 0)
+        if rule.kind == "type":
+            return self.unexpected_count == 0
+        if self.nonnull_count == 0:
+            return True
+        if rule.mostly is None:
+            return self.unexpected_count == 0
+        return bool((self.nonnull_count - self.unexpected_count) / self.nonnull_count >= rule.mostly)
+
+    def to_dict(self) -> dict:
+        return {
+            "rule": self.rule.name,
+            "success": self.success,
+            "element_count": self.element_count,
+            "nonnull_count": self.nonnull_count,
+            "unexpected_count": self.unexpected_count,
+            "unexpected_percent": (
+                round(100.0 * self.unexpected_count / self.nonnull_count, 4) if self.nonnull_count else 0.0
+            ),
+            "observed_value": (
+                self.observed_value.item() if isinstance(self.observed_value, np.generic) else self.observed_value
+            ),
+            "sample_rows": self.sample_rows,
+            "error": self.error,
+        }
+
+
+@dataclass
+class ValidationReport:
+    results: List[RuleResult]
+    rows: int
+
+    @property
+    def success(self) -> bool:
+        return all(result.success for result in self.results)
+
+    @property
+    def failures(self) -> List[RuleResult]:
+        return [result for result in self.results if not result.success]
+
+    def to_dict(self) -> dict:
+        return {
+            "success": self.success,
+            "rows": self.rows,
+            "rules_evaluated": len(self.results),
+            "rules_failed": len(self.failures),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+
+class ValidationEngine:
+    """Compiled rule set; `validate(df)` or `validate_chunks(chunks)` returns a ValidationReport."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = list(rules)
+        # Group value rules by column so each column is materialized once per chunk
+        self.columns = list(dict.fromkeys(rule.column for rule in self.rules))
+        self._accepted = {
+            i: _accepted_types(rule.type_list) for i, rule in enumerate(self.rules) if rule.kind == "type"
+        }
+
+    def validate(self, df: pd.DataFrame) -> ValidationReport:
+        return self.validate_chunks([df])
+
+    def validate_chunks(self, chunks: Iterable[pd.DataFrame]) -> ValidationReport:
+        results = [RuleResult(rule) for rule in self.rules]
+        offset = 0
+        for chunk in chunks:
+            self._update(results, chunk, offset)
+            offset += len(chunk)
+        return ValidationReport(results, offset)
+
+    def _update(self, results: List[RuleResult], chunk: pd.DataFrame, offset: int):
+        n_rows = len(chunk)
+        for column in self.columns:
+            present = column in chunk.columns
+            values = chunk[column].to_numpy() if present else None
+            dtype = chunk[column].dtype if present else None
+            notnull = ~pd.isna(values) if present else None
+            for i, rule in enumerate(self.rules):
+                if rule.column != column:
+                    continue
+                result = results[i]
+                result.element_count += n_rows
+                if not present:
+                    result.error = result.error or f"Missing column: {column}"
+                    continue
+                if rule.kind == "exists":
+                    result.observed_value = True
+                    continue
+                result.nonnull_count += int(notnull.sum())
+                try:
+                    self._apply(i, rule, result, values, dtype, notnull, offset)
+                except TypeError as e:
+                    result.error = f"{type(e).__name__}: {e}"
+
+    def _apply(self, i, rule, result, values, dtype, notnull, offset):
+        if rule.kind == "type":
+            accepted = self._accepted[i]
+            if dtype != object:
+                # Typed column: one dtype check, like GE's aggregate path
+                result.observed_value = dtype.type.__name__
+                if dtype.type not in accepted:
+                    result.unexpected_count += int(notnull.sum()) or 1
+                return
+            bad = notnull & ~np.fromiter((type(v) in accepted for v in values), bool, len(values))
+        elif rule.kind == "min_between":
+            if notnull.any():
+                chunk_min = values[notnull].min()
+                current = result.observed_value
+                result.observed_value = chunk_min if current is None else min(current, chunk_min)
+                # Re-judged on the running minimum after every chunk
+                result.unexpected_count = int(
+                    not (rule.min_value <= result.observed_value <= rule.max_value)
+                )
+            return
+        elif rule.kind == "between":
+            with np.errstate(invalid="ignore"):
+                inside = np.ones(len(values), dtype=bool)
+                if rule.min_value is not None:
+                    inside &= values >= rule.min_value
+                if rule.max_value is not None:
+                    inside &= values <= rule.max_value
+            bad = notnull & ~inside
+        else:  # in_set
+            bad = notnull & ~pd.Series(values).isin(rule.values).to_numpy()
+
+        n_bad = int(bad.sum())
+        if n_bad:
+            result.unexpected_count += n_bad
+            room = SAMPLE_ROWS - len(result.sample_rows)
+            if room > 0:
+                for idx in np.flatnonzero(bad)[:room]:
+                    value = values[idx]
+                    result.sample_rows.append({
+                        "row": int(offset + idx),
+                        "value": value.item() if isinstance(value, np.generic) else value,
+                    })
@@ -5,9 +5,14 @@ from sklearn.preprocessing import StandardScaler
 import joblib
 import os
 
+# The NumPy kernel and its constants live in a light module (imported by the API)
+from src.features.feature_kernel import (
+    EPSILON, GLUCOSE_CRITICAL_CUTOFF, BMI_BIN_EDGES, BMI_CATEGORIES, BMI_DUMMY_PREFIX,
+    DERIVED_FEATURES, DROPPED_INPUTS, FeatureKernel, compile_feature_kernel
+)
+from src.monitoring.drift import build_reference_profile, save_reference_profile
+
 # Global Configuration
-EPSILON = 1e-6
-GLUCOSE_CRITICAL_CUTOFF = 126
 ARTIFACTS_DIR = "artifacts"
 
 def classify_bmi(bmi: float) -> str:
@@ -19,9 +24,17 @@ def classify_bmi(bmi: float) -> str:
     elif 35 <= bmi < 40: return 'Obese_Class_II'
     else: return 'Obese_Class_III'
 
-def feature_engineering(df: pd.DataFrame) -> pd.DataFrame:
+def classify_bmi_array(bmi) -> np.ndarray:
+    """Vectorized classify_bmi (NaN falls into the last band, as in classify_bmi)."""
+    return np.asarray(BMI_CATEGORIES, dtype=object)[np.digitize(bmi, BMI_BIN_EDGES)]
+
+def feature_engineering(df: pd.DataFrame, drop_first: bool = True) -> pd.DataFrame:
     """
     Applies EXACT feature extraction logic: Log, Sqrt, Ratios, One-Hot.
+
+    `drop_first=False` keeps every BMI dummy so the encoding of a row does not
+    depend on which categories happen to be present in the same batch; the
+    caller then aligns to the training columns.
     """
     print("⚙️ Applying Advanced Feature Engineering...")
     df_eng = df.copy()
@@ -49,10 +62,10 @@ def feature_engineering(df: pd.DataFrame) -> pd.DataFrame:
 
     # --- 3. Critical Flags & Categorization ---
     df_eng['Is_Glucose_Critical'] = (df_eng['Glucose'] >= GLUCOSE_CRITICAL_CUTOFF).astype(int)
-    df_eng['BMI_Category'] = df_eng['BMI'].apply(classify_bmi)
+    df_eng['BMI_Category'] = classify_bmi_array(df_eng['BMI'].to_numpy())
 
     # --- 4. One-Hot Encoding ---
-    df_eng = pd.get_dummies(df_eng, columns=['BMI_Category'], drop_first=True)
+    df_eng = pd.get_dummies(df_eng, columns=['BMI_Category'], drop_first=drop_first)
 
     # --- 5. Drop Columns ---
     if 'DiabetesPedigreeFunction' in df_eng.columns:
@@ -63,11 +76,20 @@ def feature_engineering(df: pd.DataFrame) -> pd.DataFrame:
     
     return df_eng
 
-def build_features(df: pd.DataFrame, is_training=True):
+def scale_inplace(X: np.ndarray, scaler) -> np.ndarray:
+    """Same arithmetic as a fitted StandardScaler.transform, without the copies."""
+    if scaler.with_mean:
+        X -= scaler.mean_
+    if scaler.with_std:
+        X /= scaler.scale_
+    return X
+
+def build_features(df: pd.DataFrame, is_training=True, scaler=None, columns=None):
     """
     Orchestrates Feature Engineering and Scaling.
+    At inference, an already-loaded `scaler` and `columns` list can be passed
+    in to avoid re-reading scaler.pkl / columns.pkl from disk.
     """
-    os.makedirs(ARTIFACTS_DIR, exist_ok=True)
     scaler_path = os.path.join(ARTIFACTS_DIR, "scaler.pkl")
     columns_path = os.path.join(ARTIFACTS_DIR, "columns.pkl")
     
@@ -81,13 +103,17 @@ def build_features(df: pd.DataFrame, is_training=True):
 
     # Apply Feature Engineering
     # Note: Even if 'Outcome' slipped into X above, feature_engineering() now handles it safely.
-    X_engineered = feature_engineering(X)
-
     if is_training:
+        X_engineered = feature_engineering(X)
+
         print("⚖️ Scaling features (Training Mode)...")
-        
+        os.makedirs(ARTIFACTS_DIR, exist_ok=True)
+
         # Save the exact column list structure (Critical for One-Hot encoding alignment)
         joblib.dump(list(X_engineered.columns), columns_path)
+
+        # Raw-input distributions the API's drift monitor compares live traffic against
+        save_reference_profile(build_reference_profile(X), ARTIFACTS_DIR)
         
         scaler = StandardScaler()
         X_scaled = scaler.fit_transform(X_engineered)
@@ -96,12 +122,14 @@ def build_features(df: pd.DataFrame, is_training=True):
         return X_scaled, y
     else:
         # Inference Mode
-        scaler = joblib.load(scaler_path)
-        saved_cols = joblib.load(columns_path)
-        
-        # Align columns: Add missing columns (with 0) and remove extra ones
-        X_engineered = X_engineered.reindex(columns=saved_cols, fill_value=0)
-        
-        X_scaled = scaler.transform(X_engineered)
-        
+        if scaler is None:
+            scaler = joblib.load(scaler_path)
+        saved_cols = columns if columns is not None else joblib.load(columns_path)
+
+        # Engineered features land directly in the saved column order
+        # (missing columns = 0, extras dropped), then get scaled in place
+        kernel = compile_feature_kernel(X.columns, saved_cols)
+        X_engineered = kernel.transform(X.to_numpy(dtype=np.float64))
+        X_scaled = scale_inplace(X_engineered, scaler)
+
         return X_scaled, y
\ No newline at end of file
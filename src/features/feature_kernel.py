@@ -0,0 +1,130 @@
+# src/features/feature_kernel.py
+"""
+NumPy-only feature engineering for inference (no pandas / sklearn imports,
+so the API can load and run it without paying for either).
+build_features re-exports everything defined here.
+"""
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Global Configuration
+EPSILON = 1e-6
+GLUCOSE_CRITICAL_CUTOFF = 126
+
+# WHO BMI bands: category i covers [BMI_BIN_EDGES[i-1], BMI_BIN_EDGES[i])
+BMI_BIN_EDGES = np.array([18.5, 25, 30, 35, 40])
+BMI_CATEGORIES = [
+    'Underweight', 'Normal', 'Overweight',
+    'Obese_Class_I', 'Obese_Class_II', 'Obese_Class_III'
+]
+BMI_DUMMY_PREFIX = "BMI_Category_"
+
+# Engineered column -> (raw inputs, function of those input columns).
+# Mirrors build_features.feature_engineering() column for column.
+DERIVED_FEATURES = {
+    'Log_DPF': (('DiabetesPedigreeFunction',), lambda dpf: np.log(dpf + EPSILON)),
+    'Log_Age': (('Age',), np.log1p),
+    'Sqrt_Insulin': (('Insulin',), lambda ins: np.sqrt(np.maximum(ins, 0))),
+    'Sqrt_Pregnancies': (('Pregnancies',), lambda preg: np.sqrt(np.maximum(preg, 0))),
+    'Glucose_to_Insulin_Ratio': (('Glucose', 'Insulin'), lambda glu, ins: glu / (ins + EPSILON)),
+    'Age_BMI_Interaction': (('Age', 'BMI'), lambda age, bmi: age * bmi),
+    'BP_Age_Index': (('BloodPressure', 'Age'), lambda bp, age: bp / (age + EPSILON)),
+    'Skin_BMI_Ratio': (('SkinThickness', 'BMI'), lambda skin, bmi: skin / (bmi + EPSILON)),
+    'Is_Glucose_Critical': (('Glucose',), lambda glu: glu >= GLUCOSE_CRITICAL_CUTOFF),
+}
+# Raw inputs consumed by feature_engineering() and never passed through
+DROPPED_INPUTS = ('DiabetesPedigreeFunction', 'Outcome')
+
+class FeatureKernel:
+    """
+    Column-index based NumPy equivalent of feature_engineering() + reindex.
+
+    Compiled once per (input columns, saved columns) layout, it writes the
+    engineered features for a raw float matrix directly into the columns.pkl
+    order. Output is bit-for-bit identical to
+    feature_engineering(df, drop_first=False).reindex(columns=saved_cols, fill_value=0).
+    """
+
+    def __init__(self, input_columns: Sequence[str], output_columns: Sequence[str]):
+        self.input_columns = list(input_columns)
+        self.output_columns = list(output_columns)
+        in_idx = {name: i for i, name in enumerate(self.input_columns)}
+
+        copy_src, copy_dst = [], []
+        self.derived = []      # (output index, input indices, function)
+        self.bmi_dummies = []  # (output index, BMI category code)
+        for j, name in enumerate(self.output_columns):
+            if name in DERIVED_FEATURES:
+                sources, fn = DERIVED_FEATURES[name]
+                if all(src in in_idx for src in sources):
+                    self.derived.append((j, tuple(in_idx[src] for src in sources), fn))
+            elif name.startswith(BMI_DUMMY_PREFIX):
+                category = name[len(BMI_DUMMY_PREFIX):]
+                if category in BMI_CATEGORIES and 'BMI' in in_idx:
+                    self.bmi_dummies.append((j, BMI_CATEGORIES.index(category)))
+            elif name in in_idx and name not in DROPPED_INPUTS:
+                copy_src.append(in_idx[name])
+                copy_dst.append(j)
+            # Anything else is absent from the input and stays 0 (reindex fill_value=0)
+
+        self.copies = list(zip(copy_dst, copy_src))
+        filled = set(copy_dst) | {j for j, _, _ in self.derived} | {j for j, _ in self.bmi_dummies}
+        self.zero_cols = [j for j in range(len(self.output_columns)) if j not in filled]
+        self.bmi_index = in_idx.get('BMI')
+        self.n_features = len(self.output_columns)
+
+    def __reduce__(self):
+        # Pickled as its column layout and recompiled on load (the recipes are lambdas)
+        return (FeatureKernel, (self.input_columns, self.output_columns))
+
+    def transform(self, X: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Fills `out` (n_rows x n_features float64, allocated when not given)
+        with the engineered features and returns it. Every step writes whole
+        columns, so a Fortran-ordered `out` is several times faster on big batches.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if out is None:
+            out = np.empty((X.shape[0], self.n_features), dtype=np.float64, order='F')
+
+        # --- 1. Pass-through columns; columns absent from the input stay 0 ---
+        for j, i in self.copies:
+            out[:, j] = X[:, i]
+        for j in self.zero_cols:
+            out[:, j] = 0.0
+
+        # --- 2. Log / Sqrt / Ratios / Interactions / Glucose flag ---
+        for j, sources, fn in self.derived:
+            out[:, j] = fn(*(X[:, i] for i in sources))
+
+        # --- 3. BMI One-Hot from bin codes ---
+        if self.bmi_dummies:
+            codes = np.digitize(X[:, self.bmi_index], BMI_BIN_EDGES)
+            for j, code in self.bmi_dummies:
+                out[:, j] = codes == code
+
+        # --- 4. Clean up any infinites created by division ---
+        out[np.isinf(out)] = 0.0
+        return out
+
+def raw_sources(column: str, input_columns: Sequence[str]) -> tuple:
+    """Raw input fields an engineered column is computed from (empty for constant/unknown columns)."""
+    if column in DERIVED_FEATURES:
+        return DERIVED_FEATURES[column][0]
+    if column.startswith(BMI_DUMMY_PREFIX):
+        return ('BMI',)
+    if column.startswith('Is_') and column.endswith('_Missing'):
+        return (column[len('Is_'):-len('_Missing')],)
+    if column in input_columns and column not in DROPPED_INPUTS:
+        return (column,)
+    return ()
+
+@lru_cache(maxsize=16)
+def _compile_kernel(input_columns: tuple, output_columns: tuple) -> FeatureKernel:
+    return FeatureKernel(input_columns, output_columns)
+
+def compile_feature_kernel(input_columns: Sequence[str], output_columns: Sequence[str]) -> FeatureKernel:
+    """Returns the cached kernel for this column layout, compiling it on first use."""
+    return _compile_kernel(tuple(input_columns), tuple(output_columns))
@@ -0,0 +1,224 @@
+# src/models/bundle.py
+"""
+Single-file, memory-mappable artifact bundle for fast API cold starts.
+
+At request time the InferencePipeline only needs plain arrays (imputer
+statistics and round estimators, scaler mean/std, the flat forest) plus a
+little metadata. The bundle stores exactly those in one file:
+
+    8-byte magic | uint64 header length | JSON header | 64-byte aligned arrays
+
+Loading is a JSON parse plus zero-copy views into an mmap of the file: no
+unpickling, and no pandas/sklearn import. The arrays live in the page cache,
+shared by every worker and replica on the host, and are paged in on first
+touch. The sklearn forest is not bundled, so batches of any size are scored
+by the flat-array forest.
+
+Usage: python src/models/bundle.py [artifacts_dir]
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+# Adding project root for module imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.data.fast_impute import FastImputer
+from src.features.feature_kernel import compile_feature_kernel
+from src.models.explain import ForestContributions
+from src.models.early_exit import EarlyExitPlan
+from src.models.flat_forest import FlatForest
+from src.models.inference_pipeline import InferencePipeline
+
+BUNDLE_FILE = "inference_bundle.bin"
+BUNDLE_MAGIC = b"DIABBND1"
+BUNDLE_FORMAT = 1  # bump when the header/array layout changes
+BUNDLE_ALIGN = 64
+_PREFIX = struct.Struct("<8sQ")
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // BUNDLE_ALIGN) * BUNDLE_ALIGN
+
+
+def pipeline_arrays(pipeline: InferencePipeline):
+    """(metadata, {name: array}) describing everything the pipeline needs at inference."""
+    imputer = pipeline.imputer
+    if not isinstance(imputer, FastImputer) or imputer.steps is None:
+        raise ValueError("Only pipelines with a linear FastImputer can be bundled.")
+    steps = imputer.steps
+    neighbors = [np.asarray(neighbor_idx, dtype=np.int64) for _, neighbor_idx, _, _ in steps]
+    forest = pipeline.forest
+    if forest.classes_.dtype.hasobject:
+        raise ValueError("Only numeric class labels can be bundled.")
+
+    arrays = {
+        "missing_idx": np.asarray(pipeline.missing_idx, dtype=np.int64),
+        "imputer.statistics": imputer.statistics_,
+        "imputer.min_value": imputer.min_value,
+        "imputer.max_value": imputer.max_value,
+        "imputer.step_target": np.array([feat_idx for feat_idx, _, _, _ in steps], dtype=np.int64),
+        "imputer.step_intercept": np.array([intercept for _, _, _, intercept in steps], dtype=np.float64),
+        "imputer.step_offsets": np.cumsum([0] + [n.size for n in neighbors], dtype=np.int64),
+        "imputer.step_neighbors": np.concatenate(neighbors) if steps else np.empty(0, np.int64),
+        "imputer.step_coef": np.concatenate([coef for _, _, coef, _ in steps]) if steps else np.empty(0),
+        "forest.feature": forest.feature,
+        "forest.threshold": forest.threshold,
+        "forest.children": forest.children,
+        "forest.value": forest.value,
+        "forest.roots": forest.roots,
+        "forest.classes": forest.classes_,
+    }
+    if pipeline.scale_mean is not None:
+        arrays["scale_mean"] = pipeline.scale_mean
+    if pipeline.scale_std is not None:
+        arrays["scale_std"] = pipeline.scale_std
+    contributions = getattr(pipeline, "contributions", None)
+    if contributions is not None:
+        arrays["explain.leaf_index"] = contributions.leaf_index
+        arrays["explain.table"] = contributions.table
+    exit_plan = getattr(pipeline, "exit_plan", None)
+    if exit_plan is not None:
+        arrays["exit.order"] = exit_plan.order
+
+    meta = {
+        "bundle_format": BUNDLE_FORMAT,
+        "pipeline_format": pipeline.format,
+        "version": pipeline.version,
+        "created_at": pipeline.created_at,
+        "input_columns": list(pipeline.input_columns),
+        "columns": list(pipeline.columns),
+        "insulin_idx": pipeline.insulin_idx,
+        "imputer": {
+            "mode": imputer.mode,
+            "n_iter": int(imputer.n_iter_),
+            "feature_names": [str(name) for name in imputer.feature_names_in_],
+        },
+        "forest": {"max_depth": forest.max_depth},
+        "explain": {"bias": contributions.bias} if contributions is not None else None,
+    }
+    return meta, {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+
+
+def save_bundle(pipeline: InferencePipeline, artifacts_dir: str) -> str:
+    """Writes the bundle atomically (temp file + rename: open mappings of the old file stay valid)."""
+    meta, arrays = pipeline_arrays(pipeline)
+    table, offset = {}, 0
+    for name, array in arrays.items():
+        offset = _aligned(offset)
+        table[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+    header = json.dumps({"meta": meta, "arrays": table}).encode()
+    data_start = _aligned(_PREFIX.size + len(header))
+
+    os.makedirs(artifacts_dir, exist_ok=True)
+    path = os.path.join(artifacts_dir, BUNDLE_FILE)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(BUNDLE_MAGIC, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + table[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + _aligned(offset))
+    os.replace(tmp_path, path)
+    print(f"📦 Artifact bundle saved: {path} ({pipeline.version}, {os.path.getsize(path) / 1024:.0f} KB)")
+    return path
+
+
+def read_bundle(path: str):
+    """(metadata, {name: read-only array view into the mapped file})."""
+    with open(path, "rb") as f:
+        magic, header_len = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"❌ Not an artifact bundle: {path}")
+        header = json.loads(f.read(header_len))
+        if header["meta"]["bundle_format"] != BUNDLE_FORMAT:
+            raise ValueError(f"❌ Unsupported bundle format {header['meta']['bundle_format']}: {path}")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    data_start = _aligned(_PREFIX.size + header_len)
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        array = np.frombuffer(mapped, dtype=dtype, count=count, offset=data_start + spec["offset"])
+        arrays[name] = array.reshape(spec["shape"])
+    return header["meta"], arrays
+
+
+def load_bundle(path: str) -> InferencePipeline:
+    """Rebuilds the InferencePipeline from a bundle file (no pickle, no sklearn)."""
+    meta, arrays = read_bundle(path)
+    offsets = arrays["imputer.step_offsets"]
+    neighbors = arrays["imputer.step_neighbors"].astype(np.intp, copy=False)
+    coef = arrays["imputer.step_coef"]
+    steps = [
+        (int(target), neighbors[offsets[k]:offsets[k + 1]], coef[offsets[k]:offsets[k + 1]], float(intercept))
+        for k, (target, intercept) in enumerate(
+            zip(arrays["imputer.step_target"], arrays["imputer.step_intercept"])
+        )
+    ]
+    imputer_meta = meta["imputer"]
+    imputer = FastImputer.from_arrays(
+        arrays["imputer.statistics"], imputer_meta["n_iter"],
+        arrays["imputer.min_value"], arrays["imputer.max_value"], steps,
+        feature_names=imputer_meta["feature_names"], mode=imputer_meta["mode"],
+    )
+    forest = FlatForest(
+        feature=arrays["forest.feature"],
+        threshold=arrays["forest.threshold"],
+        children=arrays["forest.children"],
+        value=arrays["forest.value"],
+        roots=arrays["forest.roots"],
+        max_depth=meta["forest"]["max_depth"],
+        classes=arrays["forest.classes"],
+    )
+    contributions = None
+    if meta.get("explain") is not None:
+        contributions = ForestContributions(
+            arrays["explain.leaf_index"], arrays["explain.table"], meta["explain"]["bias"]
+        )
+    # Same attribute set InferencePipeline pickles (see __getstate__)
+    state = {
+        "input_columns": meta["input_columns"],
+        "columns": meta["columns"],
+        "missing_idx": arrays["missing_idx"].astype(np.intp, copy=False),
+        "insulin_idx": meta["insulin_idx"],
+        "imputer": imputer,
+        "kernel": compile_feature_kernel(imputer_meta["feature_names"], meta["columns"]),
+        "scaler": None,
+        "scale_mean": arrays.get("scale_mean"),
+        "scale_std": arrays.get("scale_std"),
+        "forest": forest,
+        "contributions": contributions,
+        "exit_plan": EarlyExitPlan(forest, arrays["exit.order"]) if "exit.order" in arrays else None,
+        "model": None,
+        "n_inputs": len(meta["input_columns"]),
+        "n_imputer_columns": len(imputer_meta["feature_names"]),
+        "format": meta["pipeline_format"],
+        "created_at": meta["created_at"],
+        "version": meta["version"],
+    }
+    pipeline = InferencePipeline.__new__(InferencePipeline)
+    pipeline.__setstate__(state)
+    return pipeline
+
+
+def main():
+    from src.models.registry import DEFAULT_ARTIFACTS_DIR, load_artifact_set
+
+    artifacts_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_ARTIFACTS_DIR
+    pipeline = load_artifact_set(artifacts_dir, artifact_format="pickle").pipeline
+    path = save_bundle(pipeline, artifacts_dir)
+    # Integrity check: the arrays read back hash to the same pipeline version
+    if load_bundle(path)._fingerprint() != pipeline.version:
+        raise ValueError(f"❌ Bundle round-trip changed the pipeline: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# src/models/early_exit.py
+"""
+Decision-only forest scoring with early exit.
+
+The API only needs `mean tree probability >= threshold`. After evaluating k
+trees with partial sum S, the remaining trees can add at least `lo_rest[k]`
+(the sum of their smallest leaf values) and at most `hi_rest[k]`. So
+
+    S + lo_rest[k] >= threshold * n_trees   -> positive, whatever is left
+    S + hi_rest[k] <  threshold * n_trees   -> negative, whatever is left
+
+and the row can stop there with its probability bounded by
+[(S + lo_rest) / n_trees, (S + hi_rest) / n_trees].
+
+Trees are evaluated in blocks, in an order fitted on the training features:
+trees whose output tracks the ensemble's probability most closely go first.
+When the sklearn trees are at hand, a block is their compiled `tree_.apply`
+on the rows still undecided (same leaves as the flat traversal, and cheaper
+per tree). Otherwise it is one FlatForest traversal over the block's roots.
+No exit is possible before `min_trees(threshold)` trees, so the first
+block covers all of those. Each block has a fixed per-call overhead, so
+mid-sized batches (under EXIT_MIN_ROWS rows) are scored in one pass over
+all trees instead. Single requests (up to WALK_MAX_ROWS rows) skip NumPy
+altogether: a plain-Python walk down each tree, over list copies of the
+node arrays, checks the bounds after every tree and stops at the first
+one that settles the label.
+
+Exits need a margin (EXIT_TOLERANCE) well above float summation error. A
+row that never exits is re-scored from the leaves it already has, summed in
+the forest's own tree order. Labels are therefore
+identical to `FlatForest.predict_proba(X)[:, 1] >= threshold`.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+EXIT_BLOCK_TREES = 8  # trees between exit checks
+EXIT_TOLERANCE = 1e-9  # per tree; float error of a 100-term sum is ~1e-14
+EXIT_MIN_ROWS = 128  # below this, per-block overhead outweighs the trees saved
+WALK_MAX_ROWS = 2  # up to this many rows the per-row Python walk beats one vectorized pass
+ROW_CHUNK = 1024  # same row block as FlatForest: keeps the leaf buffer and traversal state in cache
+
+
+class EarlyExitPlan:
+    """Tree order + suffix bounds of a FlatForest for early-exit threshold decisions."""
+
+    def __init__(self, forest, order: Optional[np.ndarray] = None):
+        positive = forest.value[:, 1]
+        # A split node's value is a weighted mean of its children's, so per-tree node min/max = leaf min/max
+        tree_min = np.minimum.reduceat(positive, forest.roots)
+        tree_max = np.maximum.reduceat(positive, forest.roots)
+        self.order = np.arange(forest.n_trees, dtype=np.int32) if order is None else np.asarray(order, dtype=np.int32)
+        self.n_trees = forest.n_trees
+        zero = np.zeros(1)
+        # *_rest[k]: total over the trees after the first k in `order`
+        self.lo_rest = np.concatenate([np.cumsum(tree_min[self.order][::-1])[::-1], zero])
+        self.hi_rest = np.concatenate([np.cumsum(tree_max[self.order][::-1])[::-1], zero])
+        self.best_sum = np.concatenate([zero, np.cumsum(tree_max[self.order])])
+        self.worst_sum = np.concatenate([zero, np.cumsum(tree_min[self.order])])
+        self._walk_tables = None  # list copies for walk_row(), built on first use
+
+    def __getstate__(self):
+        # The list copies are a per-process cache, rebuilt from the forest on demand
+        return {**self.__dict__, "_walk_tables": None}
+
+    def __setstate__(self, state):
+        self.__dict__.update({"_walk_tables": None, **state})
+
+    @classmethod
+    def fit(cls, forest, features: np.ndarray) -> "EarlyExitPlan":
+        """Orders trees by how well their output correlates with the ensemble's on `features` (training data)."""
+        leaves = forest.apply(features)
+        values = forest.value[leaves, 1]  # (n_trees, n_rows)
+        ensemble = values.mean(axis=0)
+        centered = values - values.mean(axis=1, keepdims=True)
+        spread = np.sqrt((centered ** 2).sum(axis=1)) * np.sqrt(((ensemble - ensemble.mean()) ** 2).sum())
+        correlation = np.divide(centered @ (ensemble - ensemble.mean()), spread,
+                                out=np.zeros(forest.n_trees), where=spread > 0)
+        return cls(forest, np.argsort(-correlation, kind="stable"))
+
+    def min_trees(self, threshold: float) -> Tuple[int, int]:
+        """Fewest trees after which a row could exit as positive / as negative at `threshold`."""
+        target = threshold * self.n_trees
+        first = []
+        for possible in (self.best_sum + self.lo_rest >= target, self.worst_sum + self.hi_rest < target):
+            first.append(int(np.argmax(possible)) if possible.any() else self.n_trees)
+        return tuple(first)
+
+    def schedule(self, threshold: float) -> list:
+        """
+        Tree counts at which decisions are checked: every EXIT_BLOCK_TREES trees
+        from the first point where any exit is possible, plus the first points
+        where a positive and where a negative exit become possible.
+        """
+        first_positive, first_negative = (max(k, 1) for k in self.min_trees(threshold))
+        start = min(first_positive, first_negative)
+        checkpoints = {first_positive, first_negative, *range(start, self.n_trees, EXIT_BLOCK_TREES), self.n_trees}
+        return sorted(checkpoints)
+
+    def decide(self, forest, X32: np.ndarray, threshold: float, trees: Optional[list] = None) -> Tuple[np.ndarray, ...]:
+        """
+        (labels, probability lower bound, upper bound, trees evaluated) per row.
+        Rows evaluated in full get their exact probability as both bounds.
+        `trees` are the forest's sklearn `tree_` objects, in forest order, if available.
+        """
+        n_rows = X32.shape[0]
+        labels = np.empty(n_rows, dtype=bool)
+        lower, upper = np.empty(n_rows), np.empty(n_rows)
+        trees_used = np.empty(n_rows, dtype=np.int32)
+        if n_rows <= WALK_MAX_ROWS:
+            for i in range(n_rows):
+                labels[i], lower[i], upper[i], trees_used[i] = self.walk_row(forest, X32[i], threshold)
+            return labels, lower, upper, trees_used
+        schedule = self.schedule(threshold) if n_rows >= EXIT_MIN_ROWS else [self.n_trees]
+        for start in range(0, n_rows, ROW_CHUNK):
+            rows = slice(start, start + ROW_CHUNK)
+            self._decide_chunk(forest, trees, X32[rows], threshold, schedule,
+                               labels[rows], lower[rows], upper[rows], trees_used[rows])
+        return labels, lower, upper, trees_used
+
+    def walk_row(self, forest, x32: np.ndarray, threshold: float) -> tuple:
+        """One row, tree by tree in `order`, checking the bounds after each: (label, lower, upper, trees)."""
+        if self._walk_tables is None:
+            self._walk_tables = (
+                forest.feature.tolist(), forest.threshold.tolist(), forest.children.tolist(),
+                forest.value[:, 1].tolist(), forest.roots[self.order].tolist(),
+                self.lo_rest.tolist(), self.hi_rest.tolist(),
+            )
+        feature, split, children, positive, roots, lo_rest, hi_rest = self._walk_tables
+        x = x32.tolist()
+        target = threshold * self.n_trees
+        tolerance = EXIT_TOLERANCE * self.n_trees
+        partial = 0.0
+        leaves = []
+        for k, node in enumerate(roots, 1):
+            while children[2 * node] != node:  # FlatForest leaves point to themselves
+                # Same float32-vs-float64 comparison and NaN-goes-right rule as FlatForest.apply
+                node = children[2 * node + (not x[feature[node]] <= split[node])]
+            leaves.append(node)
+            partial += positive[node]
+            if partial + lo_rest[k] - target > tolerance or target - (partial + hi_rest[k]) > tolerance:
+                n = self.n_trees
+                return partial + lo_rest[k] >= target, (partial + lo_rest[k]) / n, (partial + hi_rest[k]) / n, k
+
+        # Every tree evaluated: exact probability, the same expression FlatForest.predict_proba uses on one row
+        in_tree_order = np.empty((self.n_trees, 1), dtype=np.int32)
+        in_tree_order[self.order, 0] = leaves
+        probability = float(forest.value[in_tree_order].sum(axis=0)[0, 1] / self.n_trees)
+        return probability >= threshold, probability, probability, self.n_trees
+
+    def _decide_chunk(self, forest, trees, X32, threshold, schedule, labels, lower, upper, trees_used):
+        n_rows = X32.shape[0]
+        target = threshold * self.n_trees
+        tolerance = EXIT_TOLERANCE * self.n_trees
+        leaves = np.empty((self.n_trees, n_rows), dtype=np.int32)  # by position in `order`
+        partial = np.zeros(n_rows)
+        active = np.arange(n_rows)
+        done = 0
+        for k in schedule:
+            X_active = X32 if active.size == n_rows else X32[active]
+            block = block_leaves(forest, trees, self.order[done:k], X_active)
+            leaves[done:k, active] = block
+            partial[active] += forest.value[block, 1].sum(axis=0)
+            done = k
+            if k == self.n_trees:
+                break
+            low = partial[active] + self.lo_rest[k]
+            high = partial[active] + self.hi_rest[k]
+            positive, negative = low - target > tolerance, target - high > tolerance
+            exited = positive | negative
+            if exited.any():
+                rows = active[exited]
+                labels[rows] = positive[exited]
+                lower[rows] = low[exited] / self.n_trees
+                upper[rows] = high[exited] / self.n_trees
+                trees_used[rows] = k
+                active = active[~exited]
+            if active.size == 0:
+                return
+
+        # Undecided rows: exact probability, summed in tree order like FlatForest.predict_proba
+        in_tree_order = np.empty((self.n_trees, active.size), dtype=np.int32)
+        in_tree_order[self.order] = leaves[:, active]
+        probability = forest.value[in_tree_order].sum(axis=0)[:, 1] / self.n_trees
+        labels[active] = probability >= threshold
+        lower[active] = upper[active] = probability
+        trees_used[active] = self.n_trees
+
+
+def block_leaves(forest, trees, tree_ids: np.ndarray, X32: np.ndarray) -> np.ndarray:
+    """
+    FlatForest leaf ids reached in the trees `tree_ids`: shape (len(tree_ids), n_rows).
+    Few rows don't amortize one compiled call per tree; they take the flat traversal.
+    """
+    if trees is None or X32.shape[0] < EXIT_MIN_ROWS:
+        return forest.apply(X32, roots=forest.roots[tree_ids])
+    # sklearn node ids are per tree; FlatForest ids are offset by the tree's root
+    leaves = np.empty((tree_ids.size, X32.shape[0]), dtype=np.int32)
+    for i, tree_id in enumerate(tree_ids):
+        leaves[i] = trees[tree_id].apply(X32)
+        leaves[i] += forest.roots[tree_id]
+    return leaves
@@ -0,0 +1,79 @@
+# src/models/explain.py
+"""
+Per-prediction feature attribution for the random forest (Saabas' path decomposition).
+
+Along a tree path, each split moves the positive-class probability from
+the parent node's value to the child's value. That change is credited to
+the split feature. Summed over the path, a leaf's value is the root value
+plus the contributions of the features split on. Averaged over trees:
+
+    probability = bias + sum_j contribution_j
+
+The per-leaf contribution vectors depend only on the fitted forest. They
+are tabulated once, when the inference pipeline is built. Explaining a row
+is then the forest's leaf lookup plus a gather of one table row per tree.
+Contributions are per engineered (columns.pkl) feature. `rollup_matrix`
+maps them onto the raw input fields, splitting a feature built from
+several inputs evenly between them.
+"""
+from typing import Sequence
+
+import numpy as np
+
+from src.features.feature_kernel import raw_sources
+
+POSITIVE_CLASS_COLUMN = 1  # same column InferencePipeline.predict_proba returns
+ROW_CHUNK = 512  # bounds the (trees x rows x features) gather
+
+
+class ForestContributions:
+    """Leaf -> contribution-vector table for a FlatForest."""
+
+    def __init__(self, leaf_index: np.ndarray, table: np.ndarray, bias: float):
+        self.leaf_index = leaf_index  # node id -> row of `table` (-1 for split nodes)
+        self.table = table            # (n_leaves, n_features) summed path contributions
+        self.bias = float(bias)       # mean root value: the forest's output before any split
+
+    @classmethod
+    def from_flat_forest(cls, forest, n_features: int) -> "ForestContributions":
+        node_ids = np.arange(forest.n_nodes)
+        left, right = forest.children[0::2], forest.children[1::2]
+        is_leaf = left == node_ids  # FlatForest leaves point to themselves
+        positive = forest.value[:, POSITIVE_CLASS_COLUMN]
+
+        # Level by level from the roots: child path = parent path + its split's change in value
+        path = np.zeros((forest.n_nodes, n_features), dtype=np.float64)
+        frontier = forest.roots
+        for _ in range(forest.max_depth):
+            inner = frontier[~is_leaf[frontier]]
+            if inner.size == 0:
+                break
+            for child in (left[inner], right[inner]):
+                path[child] = path[inner]
+                path[child, forest.feature[inner]] += positive[child] - positive[inner]
+            frontier = np.concatenate([left[inner], right[inner]])
+
+        leaves = np.flatnonzero(is_leaf)
+        leaf_index = np.full(forest.n_nodes, -1, dtype=np.int32)
+        leaf_index[leaves] = np.arange(leaves.size, dtype=np.int32)
+        return cls(leaf_index, np.ascontiguousarray(path[leaves]), positive[forest.roots].mean())
+
+    def contributions(self, leaves: np.ndarray) -> np.ndarray:
+        """(n_trees, n_rows) leaf ids from FlatForest.apply -> (n_rows, n_features) contributions."""
+        n_trees, n_rows = leaves.shape
+        out = np.empty((n_rows, self.table.shape[1]), dtype=np.float64)
+        for start in range(0, n_rows, ROW_CHUNK):
+            rows = self.leaf_index[leaves[:, start:start + ROW_CHUNK]]
+            out[start:start + ROW_CHUNK] = self.table[rows].sum(axis=0)
+        out /= n_trees
+        return out
+
+
+def rollup_matrix(columns: Sequence[str], input_columns: Sequence[str]) -> np.ndarray:
+    """(n_features, n_inputs) weights: engineered contributions @ R = raw-field contributions."""
+    R = np.zeros((len(columns), len(input_columns)), dtype=np.float64)
+    for j, column in enumerate(columns):
+        sources = [col for col in raw_sources(column, input_columns) if col in input_columns]
+        for source in sources:
+            R[j, list(input_columns).index(source)] = 1.0 / len(sources)
+    return R
@@ -0,0 +1,111 @@
+# src/models/flat_forest.py
+"""
+Flat-array evaluator for a fitted RandomForestClassifier.
+
+Every tree's nodes are concatenated into contiguous NumPy arrays (feature,
+threshold, left/right child, per-class leaf probability). Scoring walks all
+trees for all rows at once, one depth level per step, with no sklearn
+validation or joblib dispatch in the way. Leaves point to themselves, so a
+fixed number of steps (the deepest tree) lands every path on its leaf.
+"""
+from typing import Optional
+
+import numpy as np
+
+FLAT_FOREST_FILE = "flat_forest.pkl"
+TREE_LEAF = -1  # sklearn's child id for "no child"
+ROW_CHUNK = 1024  # rows traversed together; keeps the (trees x rows) state in cache
+
+
+class FlatForest:
+    """Drop-in `predict_proba` for a RandomForestClassifier, built from flat node arrays."""
+
+    def __init__(self, feature, threshold, children, value, roots, max_depth, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children  # interleaved: children[2*i] = left, children[2*i + 1] = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes_ = classes
+        self.n_trees = int(roots.shape[0])
+
+    @classmethod
+    def from_sklearn(cls, model) -> "FlatForest":
+        """Flattens a fitted RandomForestClassifier (single output)."""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == TREE_LEAF
+
+            # Leaves loop back to themselves so extra steps are no-ops
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+            feature = np.where(is_leaf, 0, tree.feature)
+
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :].astype(np.float64)
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            proba /= normalizer
+
+            features.append(feature)
+            thresholds.append(tree.threshold)
+            lefts.append(left)
+            rights.append(right)
+            values.append(proba)
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        children = np.stack([np.concatenate(lefts), np.concatenate(rights)], axis=1)
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children=children.ravel().astype(np.int32),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            classes=np.asarray(model.classes_),
+        )
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.feature.shape[0])
+
+    def apply(self, X, roots: Optional[np.ndarray] = None) -> np.ndarray:
+        """Leaf node id reached in every tree (or only the trees starting at `roots`): shape (n_trees, n_rows)."""
+        # Trees split on float32 inputs; comparing them to the float64 thresholds
+        # reproduces sklearn's decisions exactly
+        X32 = np.ascontiguousarray(X, dtype=np.float32)
+        roots = self.roots if roots is None else roots
+        n_rows = X32.shape[0]
+        leaves = np.empty((roots.shape[0], n_rows), dtype=np.int32)
+        for start in range(0, n_rows, ROW_CHUNK):
+            leaves[:, start:start + ROW_CHUNK] = self._apply_chunk(X32[start:start + ROW_CHUNK], roots)
+        return leaves
+
+    def _apply_chunk(self, X32: np.ndarray, roots: np.ndarray) -> np.ndarray:
+        n_rows, n_features = X32.shape
+        flat_X = X32.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.int32) * n_features)[np.newaxis, :]
+        nodes = np.repeat(roots[:, np.newaxis], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            # `~(x <= t)` rather than `x > t` so a NaN input deterministically goes right
+            go_right = ~(flat_X[row_offsets + self.feature[nodes]] <= self.threshold[nodes])
+            nodes = self.children[2 * nodes + go_right]
+        return nodes
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Mean leaf probability over trees, shape (n_rows, n_classes)."""
+        leaves = self.apply(X)
+        # Summing over the leading tree axis adds trees one after another,
+        # the same order RandomForestClassifier accumulates them in
+        proba = self.value[leaves].sum(axis=0)
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
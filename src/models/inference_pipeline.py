@@ -0,0 +1,227 @@
+# src/models/inference_pipeline.py
+"""
+Single, versioned inference artifact: raw patient matrix in, probabilities out.
+
+Fuses what used to be three pandas hops (preprocess_data -> build_features ->
+alignment in the API) into one object working on NumPy arrays only:
+missing-value indicators + zero->NaN, FastImputer, insulin clamp,
+FeatureKernel straight into the columns.pkl layout, in-place scaling and
+the flat-array forest. Scratch buffers are preallocated per thread and
+reused across calls. The forest's per-leaf contribution table (see
+explain.py) and its early-exit plan (early_exit.py) are built with the
+pipeline, so `explain` and `decide` need no per-call setup.
+"""
+import os
+import hashlib
+import threading
+import time
+from typing import Optional
+
+import joblib
+import numpy as np
+
+from src.data.fast_impute import build_fast_imputer
+from src.data.constants import MISSING_COLS, MIN_PHYSIOLOGICAL_INSULIN
+from src.features.feature_kernel import compile_feature_kernel
+from src.models.flat_forest import FlatForest, FLAT_FOREST_FILE
+from src.models.explain import ForestContributions, rollup_matrix
+from src.models.early_exit import EarlyExitPlan
+
+PIPELINE_FILE = "inference_pipeline.pkl"
+# Individual training artifacts the pipeline is fused from
+COMPONENT_FILES = {
+    "imputer": "mice_imputer.pkl",
+    "scaler": "scaler.pkl",
+    "columns": "columns.pkl",
+    "model": "model.pkl",
+}
+PIPELINE_FORMAT = 1  # bump when the object layout changes
+# Above this many rows sklearn's compiled tree loops beat the flat-array evaluator
+LARGE_BATCH_ROWS = int(os.getenv("FLAT_FOREST_MAX_ROWS", "512"))
+
+
+class InferencePipeline:
+    """Raw (n_rows x 8) float matrix -> positive-class probabilities, no pandas involved."""
+
+    def __init__(self, imputer, scaler, columns, model, forest: Optional[FlatForest] = None):
+        imputer_columns = list(imputer.feature_names_in_)
+        indicator_columns = [f'Is_{col}_Missing' for col in MISSING_COLS if col in imputer_columns]
+        self.input_columns = [col for col in imputer_columns if col not in indicator_columns]
+        if imputer_columns != self.input_columns + indicator_columns:
+            raise ValueError("Imputer columns don't follow the create_missing_indicators layout.")
+
+        self.columns = list(columns)
+        self.missing_idx = np.array(
+            [self.input_columns.index(col) for col in MISSING_COLS if col in self.input_columns],
+            dtype=np.intp,
+        )
+        self.insulin_idx = self.input_columns.index('Insulin') if 'Insulin' in self.input_columns else None
+        self.imputer = build_fast_imputer(imputer)
+        self.kernel = compile_feature_kernel(imputer_columns, self.columns)
+        self.scaler = scaler
+        self.scale_mean = np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean else None
+        self.scale_std = np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std else None
+        self.forest = forest if forest is not None else FlatForest.from_sklearn(model)
+        self.contributions = ForestContributions.from_flat_forest(self.forest, self.kernel.n_features)
+        self.exit_plan = EarlyExitPlan(self.forest)  # tree order refined by fit_exit_order()
+        self.model = model
+        self.n_inputs = len(self.input_columns)
+        self.n_imputer_columns = len(imputer_columns)
+        self.format = PIPELINE_FORMAT
+        self.created_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.version = self._fingerprint()
+        self._scratch = threading.local()
+
+    def _fingerprint(self) -> str:
+        """Content hash of everything that influences the output."""
+        digest = hashlib.sha256(f"format={self.format}".encode())
+        digest.update("|".join(self.input_columns + self.columns).encode())
+        for array in (
+            self.imputer.statistics_, self.scale_mean, self.scale_std,
+            self.forest.feature, self.forest.threshold, self.forest.children, self.forest.value,
+        ):
+            if array is not None:
+                digest.update(np.ascontiguousarray(array).tobytes())
+        for step in getattr(self.imputer, "steps", None) or []:
+            digest.update(step[2].tobytes())
+        return f"v{self.format}-{digest.hexdigest()[:12]}"
+
+    # --- Scratch buffers (one set per thread, grown on demand, reused across calls) ---
+    def _buffers(self, n_rows: int):
+        scratch = self._scratch
+        if getattr(scratch, "capacity", 0) < n_rows:
+            capacity = max(n_rows, 2 * getattr(scratch, "capacity", 0), 16)
+            scratch.imputer_in = np.empty((capacity, self.n_imputer_columns), dtype=np.float64)
+            scratch.features = np.empty((capacity, self.kernel.n_features), dtype=np.float64, order='F')
+            scratch.features32 = np.empty((capacity, self.kernel.n_features), dtype=np.float32)
+            scratch.capacity = capacity
+        return (
+            scratch.imputer_in[:n_rows],
+            scratch.features[:n_rows],
+            scratch.features32[:n_rows],
+        )
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_scratch"]
+        return state
+
+    def __setstate__(self, state):
+        # Pipelines saved before explanations / early exit get them on first use
+        self.__dict__.update({"contributions": None, "exit_plan": None, **state})
+        self._scratch = threading.local()
+
+    def transform(self, X, timings: Optional[dict] = None) -> np.ndarray:
+        """
+        Runs preprocessing + feature engineering + scaling.
+        Returns a view into this thread's scratch buffer (valid until the next call).
+        If `timings` is given, per-stage wall times (seconds) are stored in it.
+        """
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_inputs:
+            raise ValueError(f"Expected a (n_rows, {self.n_inputs}) matrix ordered as {self.input_columns}.")
+        imputer_in, features, _ = self._buffers(X.shape[0])
+        start = time.perf_counter() if timings is not None else 0.0
+
+        # --- 1. Missingness indicators, then 0 -> NaN for the MICE columns ---
+        imputer_in[:, :self.n_inputs] = X
+        for k, j in enumerate(self.missing_idx):
+            column = imputer_in[:, j]
+            is_missing = column == 0
+            imputer_in[:, self.n_inputs + k] = is_missing
+            column[is_missing] = np.nan
+
+        # --- 2. Imputation (in place) + insulin clamp ---
+        self.imputer.transform(imputer_in, copy=False)
+        if self.insulin_idx is not None:
+            insulin = imputer_in[:, self.insulin_idx]
+            np.maximum(insulin, MIN_PHYSIOLOGICAL_INSULIN, out=insulin)
+        if timings is not None:
+            now = time.perf_counter()
+            timings["preprocess"], start = now - start, now
+
+        # --- 3. Feature engineering straight into the saved column layout, then scaling ---
+        self.kernel.transform(imputer_in, out=features)
+        if timings is not None:
+            now = time.perf_counter()
+            timings["features"], start = now - start, now
+        if self.scale_mean is not None:
+            features -= self.scale_mean
+        if self.scale_std is not None:
+            features /= self.scale_std
+        if timings is not None:
+            timings["scaling"] = time.perf_counter() - start
+        return features
+
+    def predict_proba(self, X, timings: Optional[dict] = None) -> np.ndarray:
+        """Positive-class probability per row (a fresh array, safe to keep)."""
+        features = self.transform(X, timings)
+        start = time.perf_counter() if timings is not None else 0.0
+        if features.shape[0] > LARGE_BATCH_ROWS and self.model is not None:
+            probabilities = self.model.predict_proba(features)[:, 1]
+        else:
+            _, _, features32 = self._buffers(features.shape[0])
+            features32[:] = features
+            probabilities = self.forest.predict_proba(features32)[:, 1]
+        if timings is not None:
+            timings["model"] = time.perf_counter() - start
+        return probabilities
+
+    def explain(self, X):
+        """
+        Per-row attribution of the flat forest's probability:
+        (probabilities, bias, contributions) where contributions is
+        (n_rows x n_features) in `columns` order and, per row,
+        bias + contributions.sum() == probability (up to float rounding).
+        """
+        if self.contributions is None:
+            self.contributions = ForestContributions.from_flat_forest(self.forest, self.kernel.n_features)
+        features = self.transform(X)
+        _, _, features32 = self._buffers(features.shape[0])
+        features32[:] = features
+        leaves = self.forest.apply(features32)
+        probabilities = self.forest.value[leaves, 1].sum(axis=0) / self.forest.n_trees
+        return probabilities, self.contributions.bias, self.contributions.contributions(leaves)
+
+    def fit_exit_order(self, features: np.ndarray):
+        """Training time: orders trees for early exit using the scaled training features."""
+        self.exit_plan = EarlyExitPlan.fit(self.forest, features)
+
+    def decide(self, X, threshold: float):
+        """
+        Threshold decision with early exit (see early_exit.py):
+        (labels, probability lower bound, upper bound, trees evaluated) per row.
+        Labels equal `predict_proba(X) >= threshold`.
+        """
+        if self.exit_plan is None:
+            self.exit_plan = EarlyExitPlan(self.forest)
+        features = self.transform(X)
+        _, _, features32 = self._buffers(features.shape[0])
+        features32[:] = features
+        trees = [estimator.tree_ for estimator in self.model.estimators_] if self.model is not None else None
+        return self.exit_plan.decide(self.forest, features32, threshold, trees)
+
+    def raw_rollup(self) -> np.ndarray:
+        """(n_features x n_inputs) map from engineered-feature to raw-field contributions."""
+        return rollup_matrix(self.columns, self.input_columns)
+
+
+def build_inference_pipeline(artifacts_dir: str) -> InferencePipeline:
+    """Fuses the individual artifacts written by the training pipeline into one object."""
+    loaded = {}
+    for key, file_name in COMPONENT_FILES.items():
+        path = os.path.join(artifacts_dir, file_name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"❌ Missing artifact: {path}")
+        loaded[key] = joblib.load(path)
+    forest_path = os.path.join(artifacts_dir, FLAT_FOREST_FILE)
+    forest = joblib.load(forest_path) if os.path.exists(forest_path) else None
+    return InferencePipeline(forest=forest, **loaded)
+
+
+def save_inference_pipeline(pipeline: InferencePipeline, artifacts_dir: str) -> str:
+    os.makedirs(artifacts_dir, exist_ok=True)
+    path = os.path.join(artifacts_dir, PIPELINE_FILE)
+    joblib.dump(pipeline, path)
+    print(f"📦 Inference pipeline saved: {path} ({pipeline.version})")
+    return path
@@ -0,0 +1,184 @@
+# src/models/registry.py
+import os
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+import joblib
+
+from src.models.bundle import BUNDLE_FILE, load_bundle
+from src.models.flat_forest import FLAT_FOREST_FILE
+from src.models.inference_pipeline import (
+    PIPELINE_FILE, COMPONENT_FILES, build_inference_pipeline
+)
+
+# Global Configuration
+DEFAULT_ARTIFACTS_DIR = os.getenv("MODEL_ARTIFACTS_DIR", "diabetes-model-artifacts")
+# "r" memory-maps the array-backed parts of the pipeline (shared page cache across workers)
+ARTIFACT_MMAP_MODE = os.getenv("ARTIFACT_MMAP_MODE") or None
+# "bundle" serves from the mmap-able inference_bundle.bin (no unpickling, no sklearn import);
+# "pickle" loads inference_pipeline.pkl. Bundle mode falls back to the pickle if no bundle exists.
+ARTIFACT_FORMAT = os.getenv("ARTIFACT_FORMAT", "pickle")
+ARTIFACT_FORMATS = ("pickle", "bundle")
+
+# Logical artifact name -> file name produced by the training pipeline
+ARTIFACT_FILES = COMPONENT_FILES
+
+
+@dataclass(frozen=True)
+class ArtifactSet:
+    """
+    Immutable snapshot of every fitted object needed for inference.
+    Requests grab one snapshot and use it end-to-end, so a hot-reload
+    never mixes an old imputer with a new model.
+    `pipeline` is the fused InferencePipeline used for scoring; the other
+    fields are the objects it was built from (`imputer` is its FastImputer,
+    `forest` its flat-array evaluator of `model`).
+    """
+    imputer: Any
+    scaler: Any
+    columns: List[str]
+    model: Any
+    forest: Any
+    pipeline: Any
+    version: str
+    source_dir: str
+
+
+def use_bundle(artifacts_dir: str, artifact_format: str = ARTIFACT_FORMAT) -> bool:
+    if artifact_format not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unknown artifact format '{artifact_format}'. Use one of {ARTIFACT_FORMATS}.")
+    return artifact_format == "bundle" and os.path.exists(os.path.join(artifacts_dir, BUNDLE_FILE))
+
+
+def artifact_fingerprint(artifacts_dir: str, artifact_format: str = ARTIFACT_FORMAT) -> str:
+    """
+    Cheap version id for an artifact directory (file names, sizes, mtimes).
+    Changes whenever a new artifact set is published to the directory.
+    """
+    if use_bundle(artifacts_dir, artifact_format):
+        stat = os.stat(os.path.join(artifacts_dir, BUNDLE_FILE))
+        return hashlib.sha256(f"{BUNDLE_FILE}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:12]
+    has_pipeline = os.path.exists(os.path.join(artifacts_dir, PIPELINE_FILE))
+    required = [PIPELINE_FILE] if has_pipeline else sorted(ARTIFACT_FILES.values())
+    digest = hashlib.sha256()
+    for name in required + [FLAT_FOREST_FILE]:
+        path = os.path.join(artifacts_dir, name)
+        if not os.path.exists(path):
+            if name == FLAT_FOREST_FILE:
+                continue
+            raise FileNotFoundError(f"❌ Missing artifact: {path}")
+        stat = os.stat(path)
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:12]
+
+
+def load_artifact_set(
+    artifacts_dir: str = DEFAULT_ARTIFACTS_DIR,
+    mmap_mode: Optional[str] = ARTIFACT_MMAP_MODE,
+    artifact_format: str = ARTIFACT_FORMAT,
+) -> ArtifactSet:
+    """
+    Loads the serialized inference pipeline (the only place joblib.load runs).
+    Older artifact sets without one are fused from their individual files.
+    With `mmap_mode="r"` the pipeline's NumPy arrays stay memory-mapped
+    read-only instead of being copied onto the heap. In bundle mode the
+    pipeline is rebuilt from the mapped bundle file instead.
+    """
+    version = artifact_fingerprint(artifacts_dir, artifact_format)
+    pipeline_path = os.path.join(artifacts_dir, PIPELINE_FILE)
+    if use_bundle(artifacts_dir, artifact_format):
+        pipeline = load_bundle(os.path.join(artifacts_dir, BUNDLE_FILE))
+    elif artifact_format == "bundle":
+        print(f"⚠️ No {BUNDLE_FILE} in {artifacts_dir}; loading the pickled pipeline instead.")
+        return load_artifact_set(artifacts_dir, mmap_mode, "pickle")
+    elif os.path.exists(pipeline_path):
+        pipeline = joblib.load(pipeline_path, mmap_mode=mmap_mode)
+    else:
+        pipeline = build_inference_pipeline(artifacts_dir)
+    return ArtifactSet(
+        imputer=pipeline.imputer,
+        scaler=pipeline.scaler,
+        columns=list(pipeline.columns),
+        model=pipeline.model,
+        forest=pipeline.forest,
+        pipeline=pipeline,
+        version=version,
+        source_dir=artifacts_dir,
+    )
+
+
+class ArtifactRegistry:
+    """
+    Process-wide holder of the current ArtifactSet.
+
+    Artifacts are loaded once and handed out by reference. Reloading builds
+    the new set completely before swapping a single reference, so readers
+    either see the old set or the new one, never a half-loaded state.
+    """
+
+    def __init__(
+        self,
+        artifacts_dir: str = DEFAULT_ARTIFACTS_DIR,
+        mmap_mode: Optional[str] = ARTIFACT_MMAP_MODE,
+        artifact_format: str = ARTIFACT_FORMAT,
+    ):
+        self.artifacts_dir = artifacts_dir
+        self.mmap_mode = mmap_mode
+        self.artifact_format = artifact_format
+        self._current: Optional[ArtifactSet] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._current is not None
+
+    def get(self) -> ArtifactSet:
+        """Returns the current set, loading it lazily on first use."""
+        current = self._current
+        if current is None:
+            with self._lock:
+                if self._current is None:
+                    self._current = load_artifact_set(self.artifacts_dir, self.mmap_mode, self.artifact_format)
+                current = self._current
+        return current
+
+    def load_if_changed(self) -> Optional[ArtifactSet]:
+        """
+        Loads the published files into a new set when they differ from the
+        active one, without serving it (None when nothing changed). The caller
+        vets the candidate (e.g. a warm-up prediction) and then publish()es it.
+        """
+        current = self._current
+        if current is not None and artifact_fingerprint(self.artifacts_dir, self.artifact_format) == current.version:
+            return None
+        return load_artifact_set(self.artifacts_dir, self.mmap_mode, self.artifact_format)
+
+    def publish(self, new_set: ArtifactSet) -> None:
+        """Makes `new_set` the active set with a single reference swap."""
+        with self._lock:
+            self.artifacts_dir = new_set.source_dir
+            self._current = new_set
+
+    def reload(self, artifacts_dir: Optional[str] = None) -> ArtifactSet:
+        """
+        Loads a (possibly new) artifact directory and swaps it in atomically.
+        If loading fails the previous set stays active and the error propagates;
+        a set that loads is served straight away (use load_if_changed + publish
+        to check it first).
+        """
+        with self._lock:
+            target_dir = artifacts_dir or self.artifacts_dir
+            new_set = load_artifact_set(target_dir, self.mmap_mode, self.artifact_format)
+            self.artifacts_dir = target_dir
+            self._current = new_set
+        return new_set
+
+    def reload_if_changed(self) -> bool:
+        """Reloads only when the published files differ from the active set."""
+        candidate = self.load_if_changed()
+        if candidate is None:
+            return False
+        self.publish(candidate)
+        return True
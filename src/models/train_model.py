@@ -1,4 +1,5 @@
 import os
+import time
 import joblib
 import pandas as pd
 from sklearn.model_selection import train_test_split
@@ -6,18 +7,42 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report
 from imblearn.over_sampling import SMOTE
 import mlflow # Added for monitoring
+from src.models.flat_forest import FlatForest, FLAT_FOREST_FILE
+from src.models.tune_model import tune_hyperparameters, log_tuning_summary
 
 ARTIFACTS_DIR = "artifacts"
+# Notebook-tuned defaults (used unless the parallel search picks others)
+DEFAULT_PARAMS = {"n_estimators": 100, "max_depth": 10}
 
-def train_model(X, y):
+def export_flat_forest(model, artifacts_dir: str = ARTIFACTS_DIR) -> FlatForest:
+    """
+    Flattens the fitted forest into contiguous node arrays for the API's
+    low-latency evaluator and saves it next to model.pkl.
+    """
+    flat_forest = FlatForest.from_sklearn(model)
+    os.makedirs(artifacts_dir, exist_ok=True)
+    joblib.dump(flat_forest, os.path.join(artifacts_dir, FLAT_FOREST_FILE))
+    print(f"🌲 Flat forest exported: {flat_forest.n_trees} trees, {flat_forest.n_nodes} nodes")
+    return flat_forest
+
+def train_model(X, y, parallel: bool = False):
     """
     Model training with SMOTE for class imbalance. 
     Matches the Notebook experiment results.
+    With `parallel=True` the hyperparameters come from a cross-validated
+    search over a process pool (training split only) and the final forest
+    is fitted on every core.
     """
     # Keep stratify=y to ensure test set represents original distribution
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=42, stratify=y
     )
+
+    params = dict(DEFAULT_PARAMS)
+    if parallel:
+        summary = tune_hyperparameters(X_train, y_train)
+        log_tuning_summary(summary)
+        params = summary["best_params"]
     
     # Balance training data only (Never SMOTE the test set!)
     sm = SMOTE(random_state=42)
@@ -25,12 +50,16 @@ def train_model(X, y):
     
     # Random Forest tuned as per notebook
     model = RandomForestClassifier(
-        n_estimators=100, 
-        max_depth=10, 
-        random_state=42
+        **params,
+        random_state=42,
+        n_jobs=-1 if parallel else None,
     )
     
+    start = time.perf_counter()
     model.fit(X_res, y_res)
+    fit_seconds = time.perf_counter() - start
+    # Serving scores small batches; keep prediction single-threaded like before
+    model.n_jobs = None
 
     # Eval
     preds = model.predict(X_test)
@@ -38,9 +67,11 @@ def train_model(X, y):
     
     # --- MLFLOW LOGGING ---
     # Log parameters and metrics without affecting training flow
-    mlflow.log_param("n_estimators", 100)
-    mlflow.log_param("max_depth", 10)
+    mlflow.log_param("n_estimators", params["n_estimators"])
+    mlflow.log_param("max_depth", params["max_depth"])
+    mlflow.log_param("training_mode", "parallel" if parallel else "serial")
     mlflow.log_metric("accuracy", acc)
+    mlflow.log_metric("fit_seconds", fit_seconds)
     # ----------------------
 
     print(f"--- Training Complete ---\nAccuracy: {acc:.4f}")
@@ -49,3 +80,5 @@ def train_model(X, y):
     # Persistence
     os.makedirs(ARTIFACTS_DIR, exist_ok=True)
     joblib.dump(model, os.path.join(ARTIFACTS_DIR, "model.pkl"))
+    export_flat_forest(model)
+    return model
@@ -0,0 +1,295 @@
+# src/monitoring/audit.py
+"""
+Prediction audit log, written off the request path.
+
+Every scored row (raw inputs, probability, decision threshold, artifact
+version, timestamp) is copied into a bounded, preallocated ring buffer of
+NumPy arrays. A batch of rows costs one slice copy, and no I/O happens on
+the request path. A background writer thread drains the ring in bulk into
+append-only JSONL segments (it is the only thread that touches them):
+
+    AUDIT_DIR/audit-<start time>-<pid>-<seq>.jsonl
+
+Early-exit decisions only know bounds on the probability: their records
+carry `"mode": "decision"` with probability_lower / probability_upper in
+place of probability.
+
+A segment is rotated when it passes AUDIT_SEGMENT_MAX_BYTES or is older
+than AUDIT_SEGMENT_MAX_AGE_S. Each drain is flushed (and fsync'ed with
+AUDIT_FSYNC=1) before the writer sleeps again. stop() first stops
+accepting records (later ones are counted as dropped), then lets the
+writer drain whatever is left and close the segment. It is also
+registered with atexit. When the ring is full, new records are dropped
+and counted rather than blocking the request. Bulk callers running in a worker thread can pass
+`wait_s` to wait for the writer instead, because one batch can be larger
+than the ring. A nonzero `dropped` count means the writer can't keep up or
+AUDIT_BUFFER_ROWS is too small.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Global Configuration
+AUDIT_LOG = os.getenv("AUDIT_LOG", "1") == "1"
+AUDIT_DIR = os.getenv("AUDIT_DIR", "audit")
+AUDIT_BUFFER_ROWS = int(os.getenv("AUDIT_BUFFER_ROWS", "65536"))
+AUDIT_FLUSH_INTERVAL_S = float(os.getenv("AUDIT_FLUSH_INTERVAL_S", "1.0"))
+AUDIT_SEGMENT_MAX_BYTES = int(os.getenv("AUDIT_SEGMENT_MAX_BYTES", str(64 * 1024 * 1024)))
+AUDIT_SEGMENT_MAX_AGE_S = float(os.getenv("AUDIT_SEGMENT_MAX_AGE_S", "3600"))
+AUDIT_FSYNC = os.getenv("AUDIT_FSYNC", "1") == "1"
+# Longest a bulk caller (in a worker thread) waits for ring space before rows are dropped
+AUDIT_BULK_WAIT_S = float(os.getenv("AUDIT_BULK_WAIT_S", "30"))
+# The writer is woken early once the ring is this full
+WAKE_FRACTION = 0.5
+
+
+class SegmentWriter:
+    """Append-only JSONL segments with size/age based rotation (one writer thread only)."""
+
+    def __init__(
+        self,
+        directory: str = AUDIT_DIR,
+        max_bytes: int = AUDIT_SEGMENT_MAX_BYTES,
+        max_age_s: float = AUDIT_SEGMENT_MAX_AGE_S,
+        fsync: bool = AUDIT_FSYNC,
+        clock=time.time,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.fsync = fsync
+        self.clock = clock
+        self.segments = 0
+        self._file = None
+        self._opened_at = 0.0
+        self._size = 0
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._opened_at = self.clock()
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(self._opened_at))
+        path = os.path.join(self.directory, f"audit-{stamp}-{os.getpid()}-{self.segments:05d}.jsonl")
+        # "x": a segment is never reopened or overwritten
+        self._file = open(path, "x", encoding="utf-8")
+        self._size = 0
+        self.segments += 1
+
+    def write(self, lines: Sequence[str]):
+        if not lines:
+            return
+        if self._file is not None and (
+            self._size >= self.max_bytes or self.clock() - self._opened_at >= self.max_age_s
+        ):
+            self.close()
+        if self._file is None:
+            self._open()
+        data = "\n".join(lines) + "\n"
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._size += len(data)
+
+    def close(self):
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+
+class AuditLog:
+    """Bounded ring of audit records + the background thread that persists them."""
+
+    def __init__(
+        self,
+        input_columns: Sequence[str],
+        writer: Optional[SegmentWriter] = None,
+        capacity: int = AUDIT_BUFFER_ROWS,
+        flush_interval_s: float = AUDIT_FLUSH_INTERVAL_S,
+        clock=time.time,
+    ):
+        self.input_columns = list(input_columns)
+        self.writer = writer if writer is not None else SegmentWriter()
+        self.capacity = capacity
+        self.flush_interval_s = flush_interval_s
+        self.clock = clock
+
+        # --- Ring buffer (struct of arrays) ---
+        self._inputs = np.empty((capacity, len(self.input_columns)), dtype=np.float64)
+        self._probability = np.empty(capacity, dtype=np.float64)
+        self._upper = np.empty(capacity, dtype=np.float64)  # NaN unless a decision-mode bound
+        self._threshold = np.empty(capacity, dtype=np.float64)
+        self._timestamp = np.empty(capacity, dtype=np.float64)
+        self._version_id = np.empty(capacity, dtype=np.int32)
+        self._versions = {}   # artifact version -> small int stored in the ring
+        self._head = 0        # next slot to write
+        self._size = 0        # records waiting in the ring
+
+        self.written = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)  # notified by every drain
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._accepting = False  # guarded by _lock; cleared by stop() before the final drain
+        self._exit_hook = False
+        # Prebuilt line template: one % substitution per record, no per-row dict/json.dumps
+        fields = ",".join(f'"{col}":%r' for col in self.input_columns)
+        self._line = '{"timestamp":%r,"version":%s,"threshold":%r,"probability":%r,"prediction":%d,"inputs":{' + fields + '}}'
+        # Early-exit decisions only know bounds: lower <= probability <= upper
+        self._decision_line = (
+            '{"timestamp":%r,"version":%s,"mode":"decision","threshold":%r,'
+            '"probability_lower":%r,"probability_upper":%r,"prediction":%d,"inputs":{' + fields + '}}'
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._accepting
+
+    @property
+    def pending(self) -> int:
+        return self._size
+
+    # --- Recording (request side) ---
+    def record(
+        self, X_raw: np.ndarray, probabilities, threshold: float, version: str,
+        wait_s: float = 0.0, upper=None,
+    ):
+        """
+        Queues one record per row. Never does I/O. When the ring is full, waits
+        up to `wait_s` for the writer to make room (never pass it on the event
+        loop), then drops and counts the rows that didn't fit. Decision-mode
+        callers pass the probability bounds: `probabilities` (lower) and `upper`.
+        """
+        if self._thread is None:  # never started: auditing is off
+            return
+        probabilities = np.atleast_1d(probabilities)
+        upper = np.full(probabilities.shape, np.nan) if upper is None else np.atleast_1d(upper)
+        n_rows = X_raw.shape[0]
+        now = self.clock()
+        deadline = time.monotonic() + wait_s
+        done = 0
+        with self._space:
+            if not self._accepting:
+                # Stopping or stopped: the final drain may already have run
+                self.dropped += n_rows
+                return
+            version_id = self._versions.setdefault(version, len(self._versions))
+            # Re-checked every pass: a waiting caller may wake after stop()'s final drain
+            while done < n_rows and self._accepting:
+                free = self.capacity - self._size
+                if free == 0:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wake.set()
+                    self._space.wait(remaining)
+                    continue
+                # At most up to the end of the ring per pass; the next pass wraps to the start
+                start = self._head
+                chunk = min(n_rows - done, free, self.capacity - start)
+                stop = start + chunk
+                self._inputs[start:stop] = X_raw[done:done + chunk]
+                self._probability[start:stop] = probabilities[done:done + chunk]
+                self._upper[start:stop] = upper[done:done + chunk]
+                self._threshold[start:stop] = threshold
+                self._timestamp[start:stop] = now
+                self._version_id[start:stop] = version_id
+                self._head = stop % self.capacity
+                self._size += chunk
+                done += chunk
+            self.dropped += n_rows - done
+            wake = self._size >= self.capacity * WAKE_FRACTION
+        if wake:
+            self._wake.set()
+
+    # --- Writer thread ---
+    def _drain(self):
+        """Copies everything queued out of the ring (under the lock), then formats and writes it (outside)."""
+        with self._lock:
+            if self._size == 0:
+                return 0
+            order = (self._head - self._size + np.arange(self._size)) % self.capacity
+            inputs = self._inputs[order].tolist()
+            probability = self._probability[order].tolist()
+            upper = self._upper[order].tolist()
+            threshold = self._threshold[order].tolist()
+            timestamp = self._timestamp[order].tolist()
+            version_id = self._version_id[order].tolist()
+            versions = {v: json.dumps(k) for k, v in self._versions.items()}
+            self._size = 0
+            self._space.notify_all()
+
+        line, decision_line = self._line, self._decision_line
+        lines = [
+            line % (ts, versions[vid], thr, prob, prob >= thr, *row) if high != high  # NaN: exact probability
+            else decision_line % (ts, versions[vid], thr, prob, high, prob >= thr, *row)
+            for ts, vid, thr, prob, high, row in zip(timestamp, version_id, threshold, probability, upper, inputs)
+        ]
+        try:
+            self.writer.write(lines)
+            self.written += len(lines)
+        except OSError as e:
+            # The records are lost at this point: count them so the gap is visible
+            self.write_errors += 1
+            self.dropped += len(lines)
+            print(f"⚠️ Audit write failed ({len(lines)} records): {e}")
+        return len(lines)
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                self._wake.wait(self.flush_interval_s)
+                self._wake.clear()
+                self._drain()
+        finally:
+            # Final drain on this thread: record() no longer accepts, so nothing lands after it
+            self._drain()
+            self.writer.close()
+
+    def start(self):
+        if self._thread is not None and self._stop.is_set():
+            self._thread.join()  # a previous stop() that timed out: let that drain finish first
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+        with self._lock:
+            self._accepting = True
+        if not self._exit_hook:
+            atexit.register(self.stop)
+            self._exit_hook = True
+
+    def stop(self):
+        """Stops the writer, persisting every queued record (flush-on-shutdown)."""
+        with self._space:
+            if not self._accepting:
+                return
+            self._accepting = False
+            self._space.notify_all()  # bulk callers waiting for space give up (and count drops)
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=10)
+        if self._thread.is_alive():
+            # Still writing (slow disk): it finishes the drain itself; never share its segment
+            print(f"⚠️ Audit writer still draining {self._size} records after 10s")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": self._size,
+            "capacity": self.capacity,
+            "written": self.written,
+            "dropped": self.dropped,
+            "write_errors": self.write_errors,
+            "segments": self.writer.segments,
+        }
@@ -0,0 +1,356 @@
+# src/monitoring/drift.py
+"""
+Online feature-drift monitor for live prediction traffic.
+
+At training time build_features saves a reference profile of the raw
+inputs: per feature, quantile bin edges with the share of training rows
+in each bin, mean/std, and the zero-coded (missing) rate for MISSING_COLS.
+The histograms cover observed values only. Missing zeros are counted
+separately, the same way the API receives them.
+
+At serving time DriftMonitor keeps a fixed-size state per feature:
+  * counts over the reference bins, plus one missing bucket,
+  * running count / mean / M2 (Welford, merged batch-wise with Chan's formula).
+Incoming rows are copied into a small preallocated buffer. When it fills,
+they are folded in with one vectorized pass (broadcast bin comparison plus
+a single bincount), so a single-row request pays for a row copy. Memory
+does not grow with traffic.
+
+DriftFlusher is a daemon thread. It periodically closes the current window
+and computes PSI and a binned KS statistic per feature against the
+reference. It then appends the report to a JSONL file or logs it to MLflow,
+so the request path never waits on I/O.
+"""
+import json
+import math
+import os
+import threading
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+
+from src.data.constants import MISSING_COLS
+
+# Global Configuration
+DRIFT_MONITORING = os.getenv("DRIFT_MONITORING", "1") == "1"
+DRIFT_SINK = os.getenv("DRIFT_SINK", "file")  # file | mlflow | none
+DRIFT_LOG_PATH = os.getenv("DRIFT_LOG_PATH", os.path.join("monitoring", "drift.jsonl"))
+DRIFT_FLUSH_INTERVAL_S = float(os.getenv("DRIFT_FLUSH_INTERVAL_S", "60"))
+DRIFT_MIN_ROWS = int(os.getenv("DRIFT_MIN_ROWS", "200"))  # smaller windows get no verdict
+DRIFT_BUFFER_ROWS = 256
+FOLD_CHUNK_ROWS = 4096  # bounds the temporary (rows x features x edges) comparison array
+REFERENCE_PROFILE_FILE = "reference_profile.json"
+REFERENCE_BINS = 10
+PSI_EPSILON = 1e-4
+PSI_WARN, PSI_ALERT = 0.1, 0.2  # usual PSI reading: <0.1 stable, 0.1-0.2 moderate, >0.2 significant
+MLFLOW_EXPERIMENT = "Diabetes_Inference_Monitoring"
+
+
+# --- Reference profile (training side) ---
+def build_reference_profile(X, bins: int = REFERENCE_BINS) -> dict:
+    """
+    Profile of the raw inputs from the imputed training frame. Rows flagged
+    by an Is_<col>_Missing column count as missing, and their imputed values
+    are left out of the histogram.
+    """
+    columns = [col for col in X.columns if not (col.startswith("Is_") and col.endswith("_Missing"))]
+    features = {}
+    for col in columns:
+        values = X[col].to_numpy(dtype=np.float64)
+        indicator = f"Is_{col}_Missing"
+        if indicator in X.columns:
+            missing = X[indicator].to_numpy() == 1
+        elif col in MISSING_COLS:
+            missing = values == 0
+        else:
+            missing = np.zeros(values.shape[0], dtype=bool)
+        observed = values[~missing]
+        edges = np.unique(np.quantile(observed, np.linspace(0, 1, bins + 1)[1:-1])) if observed.size else np.empty(0)
+        codes = np.searchsorted(edges, observed, side="right")
+        proportions = np.bincount(codes, minlength=edges.size + 1) / max(observed.size, 1)
+        features[col] = {
+            "edges": edges.tolist(),
+            "proportions": proportions.tolist(),
+            "mean": float(observed.mean()) if observed.size else 0.0,
+            "std": float(observed.std(ddof=1)) if observed.size > 1 else 0.0,
+            "missing_rate": float(missing.mean()) if values.size else 0.0,
+        }
+    return {"format": 1, "n_rows": int(len(X)), "columns": columns, "features": features}
+
+
+def save_reference_profile(profile: dict, artifacts_dir: str) -> str:
+    os.makedirs(artifacts_dir, exist_ok=True)
+    path = os.path.join(artifacts_dir, REFERENCE_PROFILE_FILE)
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2)
+    print(f"📐 Reference profile saved: {path}")
+    return path
+
+
+def load_reference_profile(artifacts_dir: str) -> Optional[dict]:
+    path = os.path.join(artifacts_dir, REFERENCE_PROFILE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+# --- Drift statistics ---
+def psi(current: np.ndarray, reference: np.ndarray, epsilon: float = PSI_EPSILON) -> float:
+    """Population Stability Index between two bin-proportion vectors."""
+    current = np.asarray(current, dtype=np.float64) + epsilon
+    reference = np.asarray(reference, dtype=np.float64) + epsilon
+    return float(np.sum((current - reference) * np.log(current / reference)))
+
+
+def binned_ks(current: np.ndarray, reference: np.ndarray) -> float:
+    """Kolmogorov-Smirnov distance evaluated at the bin edges (a lower bound of the exact KS)."""
+    return float(np.max(np.abs(np.cumsum(current) - np.cumsum(reference))))
+
+
+# --- Serving side ---
+class DriftMonitor:
+    """Constant-memory per-feature sketches of live inputs (see module docstring)."""
+
+    def __init__(self, buffer_rows: int = DRIFT_BUFFER_ROWS, min_rows: int = DRIFT_MIN_ROWS, clock=time.time):
+        self.buffer_rows = buffer_rows
+        self.min_rows = min_rows
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.profile = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.profile is not None
+
+    def set_reference(self, profile: Optional[dict], input_columns: Sequence[str]):
+        """(Re)binds the monitor to a reference profile and the input matrix layout; starts a new window."""
+        with self._lock:
+            self.profile = None
+            if profile is None:
+                return
+            features = [col for col in profile["columns"] if col in input_columns]
+            edges = [np.asarray(profile["features"][col]["edges"], dtype=np.float64) for col in features]
+            max_edges = max((e.size for e in edges), default=0)
+
+            self.features = features
+            self.feature_idx = np.array([list(input_columns).index(col) for col in features], dtype=np.intp)
+            self.n_bins = np.array([e.size + 1 for e in edges], dtype=np.intp)
+            # Padded with +inf: a feature with fewer edges never reaches the unused bins
+            self.edges = np.full((len(features), max(max_edges, 1)), np.inf)
+            for j, e in enumerate(edges):
+                self.edges[j, :e.size] = e
+            self.stride = self.edges.shape[1] + 2  # bins + missing bucket
+            self.missing_slot = self.stride - 1
+            self.offsets = np.arange(len(features), dtype=np.intp) * self.stride
+            self.zero_is_missing = np.array([col in MISSING_COLS for col in features])
+            self.reference = {
+                col: (np.asarray(profile["features"][col]["proportions"]), profile["features"][col]["missing_rate"])
+                for col in features
+            }
+            self.n_inputs = len(input_columns)
+            self._buffer = np.empty((self.buffer_rows, self.n_inputs), dtype=np.float64)
+            self._reset_window()
+            self.profile = profile
+
+    def _reset_window(self):
+        n_features = len(self.features)
+        self._fill = 0
+        self.counts = np.zeros((n_features, self.stride), dtype=np.int64)
+        self.count = np.zeros(n_features)
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+        self.window_rows = 0
+        self.window_start = self.clock()
+
+    # --- Recording (request side) ---
+    def observe(self, X: np.ndarray):
+        """Records raw input rows (pipeline input column order). Cheap for single rows."""
+        if self.profile is None:
+            return
+        n_rows = X.shape[0]
+        with self._lock:
+            if self.profile is None:
+                return
+            self.window_rows += n_rows
+            if n_rows >= self.buffer_rows:
+                for start in range(0, n_rows, FOLD_CHUNK_ROWS):
+                    self._fold(X[start:start + FOLD_CHUNK_ROWS])
+                return
+            if self._fill + n_rows > self.buffer_rows:
+                self._fold(self._buffer[:self._fill])
+                self._fill = 0
+            self._buffer[self._fill:self._fill + n_rows] = X
+            self._fill += n_rows
+
+    def _fold(self, X: np.ndarray):
+        if X.shape[0] == 0:
+            return
+        V = X[:, self.feature_idx]
+        missing = np.isnan(V) | (self.zero_is_missing & (V == 0))
+
+        # --- 1. Histogram + missing bucket: one comparison and one bincount for every feature ---
+        codes = (V[:, :, np.newaxis] >= self.edges).sum(axis=2)
+        codes[missing] = self.missing_slot
+        self.counts += np.bincount(
+            (codes + self.offsets).ravel(), minlength=self.counts.size
+        ).reshape(self.counts.shape)
+
+        # --- 2. Running mean / M2 over observed values (Chan et al. batch merge) ---
+        observed = ~missing
+        n_b = observed.sum(axis=0).astype(np.float64)
+        safe_n_b = np.maximum(n_b, 1.0)
+        mean_b = np.where(observed, V, 0.0).sum(axis=0) / safe_n_b
+        m2_b = (np.where(observed, V - mean_b, 0.0) ** 2).sum(axis=0)
+        n = self.count + n_b
+        safe_n = np.maximum(n, 1.0)
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * n_b / safe_n
+        self.m2 = self.m2 + m2_b + delta ** 2 * self.count * n_b / safe_n
+        self.count = n
+
+    # --- Reporting ---
+    def snapshot(self, reset: bool = False) -> Optional[dict]:
+        """Drift report for the current window; `reset=True` also starts a new one."""
+        with self._lock:
+            if self.profile is None:
+                return None
+            self._fold(self._buffer[:self._fill])
+            self._fill = 0
+            report = self._report()
+            if reset:
+                self._reset_window()
+        return report
+
+    def _report(self) -> dict:
+        now = self.clock()
+        features = {}
+        for j, col in enumerate(self.features):
+            ref_proportions, ref_missing_rate = self.reference[col]
+            observed_counts = self.counts[j, :self.n_bins[j]]
+            n_observed = int(observed_counts.sum())
+            n_missing = int(self.counts[j, self.missing_slot])
+            n_rows = n_observed + n_missing
+            entry = {
+                "rows": n_rows,
+                "missing_rate": n_missing / n_rows if n_rows else None,
+                "reference_missing_rate": ref_missing_rate,
+                "mean": float(self.mean[j]) if n_observed else None,
+                "std": math.sqrt(self.m2[j] / (self.count[j] - 1)) if self.count[j] > 1 else None,
+                "psi": None, "ks": None, "status": "insufficient_data",
+            }
+            if n_observed:
+                proportions = observed_counts / n_observed
+                entry["psi"] = psi(proportions, ref_proportions)
+                entry["ks"] = binned_ks(proportions, ref_proportions)
+            if n_rows >= self.min_rows and entry["psi"] is not None:
+                entry["status"] = "drift" if entry["psi"] >= PSI_ALERT else "warn" if entry["psi"] >= PSI_WARN else "ok"
+            features[col] = entry
+
+        psis = [f["psi"] for f in features.values() if f["psi"] is not None]
+        return {
+            "window_start": self.window_start,
+            "window_end": now,
+            "rows": self.window_rows,
+            "pid": os.getpid(),
+            "max_psi": max(psis) if psis else None,
+            "drifted": [col for col, f in features.items() if f["status"] == "drift"],
+            "features": features,
+        }
+
+
+# --- Background flushing ---
+def write_jsonl(report: dict, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(report) + "\n")
+
+
+class MlflowDriftSink:
+    """Logs each window as one step of a long-lived run in the monitoring experiment."""
+
+    def __init__(self, experiment: str = MLFLOW_EXPERIMENT):
+        self.experiment = experiment
+        self._client = None
+        self._run_id = None
+        self._step = 0
+
+    def __call__(self, report: dict):
+        # Imported here: mlflow is heavy and only this background thread needs it
+        from mlflow.entities import Metric
+        from mlflow.tracking import MlflowClient
+
+        if self._client is None:
+            self._client = MlflowClient()
+            experiment = self._client.get_experiment_by_name(self.experiment)
+            experiment_id = (
+                experiment.experiment_id if experiment else self._client.create_experiment(self.experiment)
+            )
+            run = self._client.create_run(experiment_id, run_name=f"api-drift-{os.getpid()}")
+            self._run_id = run.info.run_id
+
+        timestamp = int(report["window_end"] * 1000)
+        metrics = [Metric("window_rows", report["rows"], timestamp, self._step)]
+        for col, entry in report["features"].items():
+            for key in ("psi", "ks", "missing_rate", "mean", "std"):
+                if entry[key] is not None:
+                    metrics.append(Metric(f"{key}_{col}", float(entry[key]), timestamp, self._step))
+        self._client.log_batch(self._run_id, metrics=metrics)
+        self._step += 1
+
+
+def make_sink(kind: str = DRIFT_SINK, log_path: str = DRIFT_LOG_PATH):
+    if kind == "file":
+        return lambda report: write_jsonl(report, log_path)
+    if kind == "mlflow":
+        return MlflowDriftSink()
+    if kind == "none":
+        return None
+    raise ValueError(f"Unknown drift sink '{kind}'. Use file, mlflow or none.")
+
+
+class DriftFlusher:
+    """Daemon thread: every `interval_s` closes the monitor's window and hands the report to `sink`."""
+
+    def __init__(self, monitor: DriftMonitor, sink=None, interval_s: float = DRIFT_FLUSH_INTERVAL_S):
+        self.monitor = monitor
+        self.sink = sink
+        self.interval_s = interval_s
+        self.last_report: Optional[dict] = None
+        self.flushes = 0
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="drift-flusher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops the thread, flushing the partial window first."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.flush()
+
+    def flush(self) -> Optional[dict]:
+        report = self.monitor.snapshot(reset=True)
+        if report is None or report["rows"] == 0:
+            return None
+        self.last_report = report
+        self.flushes += 1
+        if self.sink is not None:
+            try:
+                self.sink(report)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ Drift flush failed: {e}")
+        return report
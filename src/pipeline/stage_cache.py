@@ -0,0 +1,160 @@
+# src/pipeline/stage_cache.py
+"""
+Content-addressed cache for the training pipeline stages.
+
+A stage's cache key hashes its input hashes, the source of the modules
+that implement it (plus library versions) and its parameters. On a hit
+the stored output is loaded and the artifact files the stage wrote into
+artifacts/ are restored, so run_pipeline can keep wiping that folder at
+the start of every run. A stage's output hash feeds the keys of the
+stages downstream: a rerun that reproduces the same output still lets
+the rest of the pipeline hit.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import inspect
+from typing import Callable, Dict, Iterable, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+# Global Configuration
+STAGE_CACHE_DIR = os.getenv("STAGE_CACHE_DIR", "stage_cache")
+ARTIFACTS_DIR = "artifacts"
+STAGES = ["load", "validate", "preprocess", "build_features", "train"]
+# Library upgrades can change fitted objects just like code edits
+LIBRARY_VERSIONS = {
+    "python": sys.version.split()[0],
+    "numpy": np.__version__,
+    "pandas": pd.__version__,
+    "sklearn": sklearn.__version__,
+}
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def object_hash(obj) -> str:
+    """Content hash of a stage output (DataFrames and arrays hashed by value)."""
+    return joblib.hash(obj)
+
+
+def code_hash(modules: Iterable) -> str:
+    """Hash of the source files behind the given functions/modules."""
+    digest = hashlib.sha256(json.dumps(LIBRARY_VERSIONS, sort_keys=True).encode())
+    for path in sorted({inspect.getsourcefile(module) for module in modules}):
+        digest.update(os.path.basename(path).encode())
+        digest.update(file_hash(path).encode())
+    return digest.hexdigest()
+
+
+class StageCache:
+    """Runs pipeline stages through the cache and records hit/miss timings."""
+
+    def __init__(
+        self,
+        cache_dir: str = STAGE_CACHE_DIR,
+        artifacts_dir: str = ARTIFACTS_DIR,
+        force: Iterable[str] = (),
+        enabled: bool = True,
+    ):
+        self.cache_dir = cache_dir
+        self.artifacts_dir = artifacts_dir
+        self.force = set(STAGES) if "all" in force else set(force)
+        self.enabled = enabled
+        self.records: List[dict] = []
+
+    def stage_key(self, name: str, input_hashes: List[str], code: Iterable, params: Optional[dict]) -> str:
+        digest = hashlib.sha256(name.encode())
+        for input_hash in input_hashes:
+            digest.update(input_hash.encode())
+        digest.update(code_hash(code).encode())
+        digest.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+        return digest.hexdigest()[:20]
+
+    def run(
+        self,
+        name: str,
+        fn: Callable,
+        args: tuple = (),
+        kwargs: Optional[dict] = None,
+        input_hashes: Optional[List[str]] = None,
+        code: Iterable = (),
+        params: Optional[dict] = None,
+        artifacts: Iterable[str] = (),
+    ):
+        """
+        Returns (output, output_hash). `code` lists the functions/modules whose
+        source defines the stage (`fn` is always included); `artifacts` are the
+        files the stage writes into the artifacts folder.
+        """
+        start = time.perf_counter()
+        key = self.stage_key(name, input_hashes or [], [fn, *code], params)
+        entry_dir = os.path.join(self.cache_dir, name, key)
+        artifacts = list(artifacts)
+
+        if not self.enabled:
+            status = "disabled"
+        elif name in self.force:
+            status = "forced"
+        elif os.path.exists(os.path.join(entry_dir, "meta.json")):
+            output, output_hash = self._restore(entry_dir, artifacts)
+            self._record(name, "hit", key, start)
+            return output, output_hash
+        else:
+            status = "miss"
+
+        output = fn(*args, **(kwargs or {}))
+        output_hash = object_hash(output)
+        if self.enabled:
+            self._store(entry_dir, output, output_hash, artifacts)
+        self._record(name, status, key, start)
+        return output, output_hash
+
+    def _record(self, name: str, status: str, key: str, start: float):
+        self.records.append({"stage": name, "status": status, "key": key, "seconds": time.perf_counter() - start})
+
+    def _restore(self, entry_dir: str, artifacts: List[str]):
+        with open(os.path.join(entry_dir, "meta.json")) as f:
+            meta = json.load(f)
+        output = joblib.load(os.path.join(entry_dir, "output.pkl"))
+        os.makedirs(self.artifacts_dir, exist_ok=True)
+        for file_name in artifacts:
+            shutil.copy2(os.path.join(entry_dir, "artifacts", file_name), os.path.join(self.artifacts_dir, file_name))
+        return output, meta["output_hash"]
+
+    def _store(self, entry_dir: str, output, output_hash: str, artifacts: List[str]):
+        # Build the entry next to its final place, then rename: a crash never leaves a half entry
+        tmp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(os.path.join(tmp_dir, "artifacts"))
+        joblib.dump(output, os.path.join(tmp_dir, "output.pkl"))
+        for file_name in artifacts:
+            shutil.copy2(os.path.join(self.artifacts_dir, file_name), os.path.join(tmp_dir, "artifacts", file_name))
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump({"output_hash": output_hash, "artifacts": artifacts, "created_at": time.time()}, f)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+
+    def summary(self) -> Dict[str, dict]:
+        return {record["stage"]: record for record in self.records}
+
+    def print_summary(self):
+        print("\n📋 Stage cache summary")
+        for record in self.records:
+            icon = "♻️" if record["status"] == "hit" else "⚙️"
+            print(f"  {icon} {record['stage']:<15} {record['status']:<8} {record['seconds']:8.3f}s  [{record['key']}]")
+        total = sum(record["seconds"] for record in self.records)
+        hits = sum(record["status"] == "hit" for record in self.records)
+        print(f"  {hits}/{len(self.records)} stages reused, {total:.2f}s total")
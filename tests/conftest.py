@@ -0,0 +1,31 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.experimental import enable_iterative_imputer
+from sklearn.impute import IterativeImputer
+from sklearn.ensemble import RandomForestClassifier
+from src.data.preprocess import create_missing_indicators, MISSING_COLS
+from src.features.build_features import build_features, feature_engineering
+from src.models.inference_pipeline import InferencePipeline
+
+@pytest.fixture(scope="session")
+def small_pipeline(tmp_path_factory):
+    """A quickly fitted InferencePipeline on data/diabetes.csv (small imputer and forest)."""
+    artifacts_dir = tmp_path_factory.mktemp("artifacts")
+    mp = pytest.MonkeyPatch()
+    mp.setattr("src.features.build_features.ARTIFACTS_DIR", str(artifacts_dir))
+    df = pd.read_csv("data/diabetes.csv")
+    raw, y = df.drop(columns=["Outcome"]), df["Outcome"]
+    X = create_missing_indicators(raw)
+    for col in MISSING_COLS:
+        X[col] = X[col].replace(0, np.nan)
+    imputer = IterativeImputer(max_iter=3, random_state=42).fit(X)
+    X_clean = pd.DataFrame(imputer.transform(X), columns=X.columns)
+    X_scaled, _ = build_features(X_clean, is_training=True)
+    mp.undo()
+    model = RandomForestClassifier(n_estimators=5, max_depth=4, random_state=42).fit(X_scaled, y)
+    return InferencePipeline(
+        imputer=imputer, scaler=joblib.load(artifacts_dir / "scaler.pkl"),
+        columns=list(feature_engineering(X_clean).columns), model=model,
+    )
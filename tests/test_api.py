@@ -16,3 +16,231 @@ def test_predict_endpoint():
     
     assert response.status_code == 200
     assert "prediction" in response.json()
+
+def test_predict_batch_endpoint():
+    """
+    Test that /predict/batch returns one result per record, in input order,
+    matching what /predict returns for each record on its own.
+    """
+    records = [
+        {"Pregnancies": 1, "Glucose": 100, "BloodPressure": 70,
+         "SkinThickness": 20, "Insulin": 50, "BMI": 23.0,
+         "DiabetesPedigreeFunction": 0.3, "Age": 25},
+        {"Pregnancies": 6, "Glucose": 190, "BloodPressure": 0,
+         "SkinThickness": 0, "Insulin": 0, "BMI": 41.5,
+         "DiabetesPedigreeFunction": 1.2, "Age": 55},
+    ]
+    response = client.post("/predict/batch", json=records)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 2
+    for record, result in zip(records, body["predictions"]):
+        single = client.post("/predict", json=record).json()
+        assert result["probability"] == single["probability"]
+        assert result["prediction"] == single["prediction"]
+
+def test_ready_endpoint_after_warm_up():
+    """
+    Test that /ready answers 200 with the loaded version once the startup
+    handler has loaded the artifacts and run the warm-up prediction.
+    """
+    with TestClient(app) as started:
+        response = started.get("/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["ready"] is True and body["version"]
+
+def watch_drift_and_audit(monkeypatch, tmp_path):
+    """Points the app at a drift monitor with a reference profile and a running audit log in tmp_path."""
+    import pandas as pd
+    from src.app import main
+    from src.data.preprocess import create_missing_indicators
+    from src.monitoring.audit import AuditLog, SegmentWriter
+    from src.monitoring.drift import DriftMonitor, build_reference_profile
+
+    raw = pd.read_csv("data/diabetes.csv").drop(columns=["Outcome"])
+    monitor = DriftMonitor()
+    monitor.set_reference(build_reference_profile(create_missing_indicators(raw)), list(raw.columns))
+    audit = AuditLog(main.INPUT_COLUMNS, SegmentWriter(str(tmp_path), fsync=False), flush_interval_s=3600)
+    audit.start()
+    monkeypatch.setattr(main, "drift_monitor", monitor)
+    monkeypatch.setattr(main, "audit_log", audit)
+    return audit
+
+def audited_rows():
+    stats = client.get("/audit/stats").json()
+    return stats["pending"] + stats["written"] + stats["dropped"]
+
+def test_drift_endpoint_counts_every_request(monkeypatch):
+    """
+    Test that single and batch requests both reach the drift monitor and
+    that /monitoring/drift reports the open window.
+    """
+    import pandas as pd
+    from src.app import main
+    from src.data.preprocess import create_missing_indicators
+    from src.monitoring.drift import DriftMonitor, build_reference_profile
+
+    raw = pd.read_csv("data/diabetes.csv").drop(columns=["Outcome"])
+    monitor = DriftMonitor()
+    monitor.set_reference(build_reference_profile(create_missing_indicators(raw)), list(raw.columns))
+    monkeypatch.setattr(main, "drift_monitor", monitor)
+
+    records = raw.head(3).to_dict(orient="records")
+    client.post("/predict", json=records[0])
+    client.post("/predict/batch", json=records)
+    response = client.get("/monitoring/drift")
+
+    assert response.status_code == 200
+    current = response.json()["current"]
+    assert current["rows"] == 4
+    assert current["features"]["Glucose"]["status"] == "insufficient_data"
+
+def test_predict_binary_matches_json_batch():
+    """
+    Test that the float32 matrix and Arrow bodies score exactly like the JSON
+    batch endpoint, and that content negotiation and schema checks apply.
+    """
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    from src.app.main import INPUT_COLUMNS
+    from src.app.binary_format import (
+        ARROW_MEDIA_TYPE, MATRIX_MEDIA_TYPE, decode_matrix_response, encode_matrix
+    )
+
+    raw = pd.read_csv("data/diabetes.csv").drop(columns=["Outcome"]).head(50)
+    X32 = raw[INPUT_COLUMNS].to_numpy(dtype=np.float32)
+    # JSON with the same float32-rounded values, so both paths see identical inputs
+    as_json = {col: X32[:, j].astype(np.float64).tolist() for j, col in enumerate(INPUT_COLUMNS)}
+    expected = [p["probability"] for p in client.post("/predict/batch", json=as_json).json()["predictions"]]
+
+    response = client.post("/predict/binary", content=encode_matrix(X32, INPUT_COLUMNS),
+                           headers={"Content-Type": MATRIX_MEDIA_TYPE})
+    assert response.status_code == 200 and response.headers["content-type"] == MATRIX_MEDIA_TYPE
+    probabilities, predictions = decode_matrix_response(response.content)
+    assert np.allclose(probabilities, expected, atol=1e-4)
+    assert np.array_equal(predictions, probabilities >= 0.40)
+
+    sink = pa.BufferOutputStream()
+    table = pa.table({col: X32[:, j] for j, col in enumerate(INPUT_COLUMNS)})
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    response = client.post("/predict/binary", content=sink.getvalue().to_pybytes(),
+                           headers={"Content-Type": ARROW_MEDIA_TYPE, "Accept": "application/json"})
+    assert [p["probability"] for p in response.json()["predictions"]] == expected
+
+    body = encode_matrix(X32, INPUT_COLUMNS)
+    assert client.post("/predict/binary", content=body, headers={"Content-Type": "text/csv"}).status_code == 415
+    assert client.post("/predict/binary", content=body, headers={
+        "Content-Type": MATRIX_MEDIA_TYPE, "Accept": "text/html"}).status_code == 406
+    swapped = encode_matrix(X32, INPUT_COLUMNS[::-1])
+    assert client.post("/predict/binary", content=swapped,
+                       headers={"Content-Type": MATRIX_MEDIA_TYPE}).status_code == 400
+    X32[3, 1] = -5
+    response = client.post("/predict/binary", content=encode_matrix(X32, INPUT_COLUMNS),
+                           headers={"Content-Type": MATRIX_MEDIA_TYPE})
+    assert response.status_code == 422 and response.json()["detail"][0]["loc"] == [3, "Glucose"]
+
+def test_explain_endpoints(monkeypatch, tmp_path):
+    """
+    Test that /explain rolls contributions up to the raw fields and adds up to
+    /predict's probability, and that explained rows are audited and monitored.
+    """
+    audit = watch_drift_and_audit(monkeypatch, tmp_path)
+    payload = {
+        "Pregnancies": 6, "Glucose": 190, "BloodPressure": 0,
+        "SkinThickness": 0, "Insulin": 0, "BMI": 41.5,
+        "DiabetesPedigreeFunction": 1.2, "Age": 55
+    }
+    body = client.post("/explain", json=payload).json()
+    assert set(body["contributions"]) == set(payload)
+    assert abs(body["base_value"] + sum(body["contributions"].values()) - body["probability"]) < 1e-3
+    assert body["probability"] == client.post("/predict", json=payload).json()["probability"]
+
+    batch = client.post("/explain/batch", json=[payload, payload]).json()
+    assert batch["count"] == 2 and batch["explanations"][0]["contributions"] == body["contributions"]
+    assert audited_rows() == 4  # /explain, /predict and the 2-row batch
+    assert client.get("/monitoring/drift").json()["current"]["rows"] == 4
+    # Bulk validation is shared with /predict/batch
+    invalid = client.post("/explain/batch", json=[payload, {**payload, "Glucose": -1}])
+    assert invalid.status_code == 422 and invalid.json()["detail"][0]["loc"] == ["body", 1, "Glucose"]
+    audit.stop()
+
+def test_decision_endpoints(monkeypatch, tmp_path):
+    """
+    Test that /predict/decision agrees with /predict, bounds its probability,
+    exits early on a single row, and that decisions are audited (as decision
+    records) and reach the drift monitor.
+    """
+    import json
+    audit = watch_drift_and_audit(monkeypatch, tmp_path)
+    payload = {
+        "Pregnancies": 1, "Glucose": 85, "BloodPressure": 66,
+        "SkinThickness": 29, "Insulin": 0, "BMI": 26.6,
+        "DiabetesPedigreeFunction": 0.351, "Age": 31
+    }
+    full = client.post("/predict", json=payload).json()
+    body = client.post("/predict/decision", json=payload).json()
+    assert body["prediction"] == full["prediction"]
+    assert body["probability_lower"] - 1e-4 <= full["probability"] <= body["probability_upper"] + 1e-4
+    assert 1 <= body["trees_evaluated"] < 100
+    assert audited_rows() == 2 and client.get("/monitoring/drift").json()["current"]["rows"] == 2
+
+    batch = client.post("/predict/decision/batch", json=[payload, payload]).json()
+    assert batch["count"] == 2 and batch["decisions"][0] == {k: v for k, v in body.items() if k != "status"}
+    assert audited_rows() == 4 and client.get("/monitoring/drift").json()["current"]["rows"] == 4
+    invalid = client.post("/predict/decision/batch", json=[{**payload, "Age": 0}])
+    assert invalid.status_code == 422 and invalid.json()["detail"][0]["loc"] == ["body", 0, "Age"]
+
+    audit.stop()
+    records = [json.loads(line) for path in tmp_path.iterdir() for line in path.read_text().splitlines()]
+    decisions = [r for r in records if r.get("mode") == "decision"]
+    assert len(decisions) == 3 and decisions[0]["probability_lower"] <= decisions[0]["probability_upper"]
+    assert decisions[0]["prediction"] == body["prediction"]
+
+def test_failed_reload_keeps_serving_the_old_set(monkeypatch):
+    """Test that a new artifact set failing its warm-up is never served and /ready keeps the old version."""
+    import dataclasses
+    from src.app import main
+
+    with TestClient(app) as started:
+        old = main.registry.get()
+        candidate = dataclasses.replace(old, version="broken")
+
+        def failing_warm_up(current):
+            raise ValueError("Warm-up prediction returned nan")
+
+        monkeypatch.setattr(main.registry, "load_if_changed", lambda: candidate)
+        monkeypatch.setattr(main, "warm_up", failing_warm_up)
+        assert started.post("/admin/reload").status_code == 500
+        assert main.registry.get() is old
+        assert started.get("/ready").json()["version"] == old.version
+
+def test_drift_flusher_follows_the_reloaded_reference(monkeypatch):
+    """Test that binding a set with a reference profile starts the flusher and one without stops it."""
+    import pandas as pd
+    from src.app import main
+    from src.data.preprocess import create_missing_indicators
+    from src.monitoring.drift import DriftFlusher, DriftMonitor, build_reference_profile
+
+    raw = pd.read_csv("data/diabetes.csv").drop(columns=["Outcome"])
+    profile = build_reference_profile(create_missing_indicators(raw))
+    monitor = DriftMonitor()
+    monkeypatch.setattr(main, "drift_monitor", monitor)
+    monkeypatch.setattr(main, "drift_flusher", DriftFlusher(monitor, interval_s=3600))
+    monkeypatch.setattr(main, "DRIFT_MONITORING", True)
+
+    current = main.registry.get()
+    monkeypatch.setattr(main, "load_reference_profile", lambda source_dir: None)
+    main.bind_drift_reference(current)
+    assert not monitor.enabled and main.drift_flusher._thread is None
+
+    monkeypatch.setattr(main, "load_reference_profile", lambda source_dir: profile)
+    main.bind_drift_reference(current)  # e.g. a reload publishing a set that ships a profile
+    assert monitor.enabled and main.drift_flusher._thread.is_alive()
+
+    monkeypatch.setattr(main, "load_reference_profile", lambda source_dir: None)
+    main.bind_drift_reference(current)
+    assert not monitor.enabled and main.drift_flusher._thread is None
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.app.api_client import PredictionClient, AsyncPredictionClient, PredictionAPIError
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 503 to the first `fail_first` calls, then echoes a prediction."""
+    protocol_version = "HTTP/1.1"  # keep-alive
+    calls, ports, fail_first = 0, set(), 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        cls = type(self)
+        cls.calls += 1
+        cls.ports.add(self.client_address[1])
+        if self.path == "/predict/batch/csv":
+            status, body = 422, {"detail": "Missing columns: ['Age']"}
+        elif cls.calls <= cls.fail_first:
+            status, body = 503, {"detail": "Prediction queue is full"}
+        else:
+            status, body = 200, {"prediction": 1, "probability": 0.9, "status": "Success"}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FlakyHandler.calls, FlakyHandler.ports, FlakyHandler.fail_first = 0, set(), 2
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_sync_client_retries_and_reuses_connections(server):
+    """
+    Test that transient 503s are retried, that later calls ride the same
+    keep-alive connection, and that client errors are raised without retrying.
+    """
+    with PredictionClient(server, retries=3, backoff_s=0.01) as client:
+        assert client.predict({"Age": 30})["prediction"] == 1
+        assert FlakyHandler.calls == 3
+        for _ in range(5):
+            client.predict({"Age": 30})
+        assert len(FlakyHandler.ports) == 1
+
+        with pytest.raises(PredictionAPIError) as error:
+            client.predict_csv(b"Glucose\n100\n")
+        assert error.value.status_code == 422 and "Age" in error.value.detail
+        assert FlakyHandler.calls == 9
+
+
+def test_async_client_retries_and_gives_up(server):
+    """Test the async client's retry loop: success after 503s, then exhaustion."""
+    async def run():
+        async with AsyncPredictionClient(server, retries=3, backoff_s=0.01) as client:
+            results = await asyncio.gather(*(client.predict({"Age": 30}) for _ in range(4)))
+            assert all(r["probability"] == 0.9 for r in results)
+
+        FlakyHandler.calls, FlakyHandler.fail_first = 0, 100
+        async with AsyncPredictionClient(server, retries=2, backoff_s=0.01) as client:
+            with pytest.raises(PredictionAPIError) as error:
+                await client.predict({"Age": 30})
+            assert error.value.status_code == 503
+        assert FlakyHandler.calls == 3
+
+    asyncio.run(run())
@@ -0,0 +1,88 @@
+import json
+import threading
+import numpy as np
+from src.monitoring.audit import AuditLog, SegmentWriter
+
+COLUMNS = ["Pregnancies", "Glucose", "BloodPressure", "SkinThickness",
+           "Insulin", "BMI", "DiabetesPedigreeFunction", "Age"]
+
+def read_records(directory):
+    return [json.loads(line) for path in sorted(directory.iterdir()) for line in path.read_text().splitlines()]
+
+def test_audit_log_persists_every_record_on_stop(tmp_path):
+    """
+    Test that records from concurrent threads all reach disk (in per-thread
+    order) once the log is stopped.
+    """
+    audit = AuditLog(COLUMNS, SegmentWriter(str(tmp_path), fsync=False), capacity=10_000, flush_interval_s=0.01)
+    audit.start()
+
+    def client(k):
+        for i in range(200):
+            X = np.full((1, len(COLUMNS)), float(i))
+            audit.record(X, 0.25 * (k % 4), 0.4, f"v-{k % 2}")
+
+    threads = [threading.Thread(target=client, args=(k,)) for k in range(4)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    audit.record(np.ones((300, len(COLUMNS))), np.linspace(0, 1, 300), 0.4, "v-0")
+    audit.stop()
+
+    records = read_records(tmp_path)
+    assert len(records) == audit.written == 1100 and audit.dropped == 0
+    record = records[0]
+    assert set(record) == {"timestamp", "version", "threshold", "probability", "prediction", "inputs"}
+    assert list(record["inputs"]) == COLUMNS
+    assert all(r["prediction"] == int(r["probability"] >= 0.4) for r in records)
+    per_thread = [r["inputs"]["Age"] for r in records if r["probability"] == 0.25]
+    assert per_thread == sorted(per_thread)
+
+def test_audit_log_counts_overflow(tmp_path):
+    """Test that a full ring drops (and counts) new records instead of blocking."""
+    audit = AuditLog(COLUMNS, SegmentWriter(str(tmp_path), fsync=False), capacity=100, flush_interval_s=3600)
+    audit.start()
+    audit.record(np.zeros((150, len(COLUMNS))), np.zeros(150), 0.4, "v")
+    assert audit.dropped == 50
+    audit.stop()
+    assert len(read_records(tmp_path)) == 100
+
+def test_segment_writer_rotates_by_size_and_age(tmp_path):
+    """Test that a segment is closed once it is too large or too old, and never reopened."""
+    now = [0.0]
+    writer = SegmentWriter(str(tmp_path), max_bytes=100, max_age_s=60, fsync=False, clock=lambda: now[0])
+    writer.write(["x" * 60])
+    writer.write(["x" * 60])       # 122 bytes now: the next write rotates
+    writer.write(["y"])
+    now[0] = 61.0
+    writer.write(["z"])
+    writer.close()
+    contents = [path.read_text() for path in sorted(tmp_path.iterdir())]
+    assert writer.segments == 3
+    assert contents == ["x" * 60 + "\n" + "x" * 60 + "\n", "y\n", "z\n"]
+
+def test_bulk_record_waits_for_the_writer(tmp_path):
+    """Test that a batch larger than the ring is persisted in full when the caller may wait."""
+    audit = AuditLog(COLUMNS, SegmentWriter(str(tmp_path), fsync=False), capacity=100, flush_interval_s=3600)
+    audit.start()
+    audit.record(np.zeros((1000, len(COLUMNS))), np.zeros(1000), 0.4, "v", wait_s=10)
+    audit.stop()
+    assert audit.dropped == 0 and len(read_records(tmp_path)) == 1000
+
+def test_stop_accounts_for_every_record(tmp_path):
+    """
+    Test that records racing with stop() are either persisted or counted as
+    dropped (never silently lost), and that records after stop() are dropped.
+    """
+    audit = AuditLog(COLUMNS, SegmentWriter(str(tmp_path), fsync=False), capacity=100, flush_interval_s=3600)
+    audit.start()
+    bulk = threading.Thread(
+        target=audit.record, args=(np.zeros((5000, len(COLUMNS))), np.zeros(5000), 0.4, "v"), kwargs={"wait_s": 10}
+    )
+    bulk.start()
+    audit.stop()
+    bulk.join()
+    audit.record(np.zeros((7, len(COLUMNS))), np.zeros(7), 0.4, "v")
+
+    assert not audit.enabled and audit.pending == 0
+    assert audit.written + audit.dropped == 5007
+    assert len(read_records(tmp_path)) == audit.written
@@ -0,0 +1,60 @@
+import asyncio
+import numpy as np
+import pytest
+from src.app.batching import MicroBatcher, QueueFullError
+
+def test_micro_batcher_coalesces_and_preserves_order():
+    """
+    Test that concurrent submissions are scored in few vectorized calls
+    and every caller gets back the result for its own row.
+    """
+    batch_sizes = []
+
+    def score(X):
+        batch_sizes.append(len(X))
+        return X[:, 0] * 10
+
+    async def run():
+        batcher = MicroBatcher(score, max_batch_size=16, max_wait_ms=5)
+        rows = [np.array([float(i), 0.0]) for i in range(40)]
+        results = await asyncio.gather(*(batcher.submit(row) for row in rows))
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert results == [i * 10.0 for i in range(40)]
+    assert sum(batch_sizes) == 40
+    assert max(batch_sizes) <= 16
+    assert len(batch_sizes) < 40
+
+def test_micro_batcher_rejects_when_queue_is_full():
+    """Test that a full queue fails fast with QueueFullError (backpressure)."""
+    async def run():
+        batcher = MicroBatcher(lambda X: X[:, 0], max_batch_size=1, max_queue_depth=2)
+        tasks = [asyncio.ensure_future(batcher.submit(np.zeros(2))) for _ in range(5)]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        await batcher.stop()
+        return outcomes
+
+    outcomes = asyncio.run(run())
+    assert any(isinstance(o, QueueFullError) for o in outcomes)
+    assert any(not isinstance(o, Exception) for o in outcomes)
+
+def test_micro_batcher_scores_each_context_separately():
+    """Test that rows queued under different contexts (e.g. pipelines around a reload) never share a scoring call."""
+    calls = []
+
+    def score(X, context):
+        calls.append((context, len(X)))
+        return X[:, 0] * context
+
+    async def run():
+        batcher = MicroBatcher(score, max_batch_size=16, max_wait_ms=5)
+        rows = [np.array([float(i), 0.0]) for i in range(8)]
+        results = await asyncio.gather(*(batcher.submit(row, 1 if i < 4 else 100) for i, row in enumerate(rows)))
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert results == [0.0, 1.0, 2.0, 3.0, 400.0, 500.0, 600.0, 700.0]
+    assert {context for context, _ in calls} == {1, 100} and sum(n for _, n in calls) == 8
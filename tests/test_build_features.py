@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+from src.data.preprocess import create_missing_indicators
+from src.features.build_features import feature_engineering, compile_feature_kernel
+
+def test_feature_kernel_matches_pandas_path():
+    """
+    Test that the NumPy kernel is bit-for-bit identical to the pandas
+    feature_engineering + reindex path, including zero BMI/Insulin rows.
+    """
+    raw = pd.read_csv("data/diabetes.csv").drop(columns=["Outcome"])
+    X = create_missing_indicators(raw).astype(float)
+    saved_cols = list(feature_engineering(X).columns)
+
+    expected = (
+        feature_engineering(X, drop_first=False)
+        .reindex(columns=saved_cols, fill_value=0)
+        .to_numpy(dtype=np.float64)
+    )
+    kernel = compile_feature_kernel(X.columns, saved_cols)
+    actual = kernel.transform(X.to_numpy())
+
+    assert actual.shape == expected.shape
+    assert np.array_equal(actual, expected)
+    # Single-row calls give the same bits as the batch call
+    assert np.array_equal(kernel.transform(X.to_numpy()[:1]), expected[:1])
@@ -0,0 +1,64 @@
+import json
+from typing import List
+
+import numpy as np
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from src.app.main import DiabetesInput, INPUT_COLUMNS
+from src.app.bulk_ingest import BulkParser
+
+VALID = {
+    "Pregnancies": 2, "Glucose": 138.0, "BloodPressure": 62, "SkinThickness": 35,
+    "Insulin": 0, "BMI": 33.6, "DiabetesPedigreeFunction": 0.127, "Age": 47,
+}
+
+
+def pydantic_errors(rows):
+    try:
+        TypeAdapter(List[DiabetesInput]).validate_python(rows)
+    except ValidationError as e:
+        return sorted((tuple(err["loc"]), err["type"]) for err in e.errors())
+    return []
+
+
+def test_bulk_parser_matches_pydantic_values_and_errors():
+    """
+    Test that the vectorized parser yields the same matrix as building it
+    from Pydantic models, and the same error types/locations on bad rows.
+    """
+    parser = BulkParser(DiabetesInput)
+    good = [VALID, {**VALID, "Age": 21.0, "Glucose": "99.5"}]
+    result = parser.parse_json(json.dumps(good).encode())
+    assert result.ok
+    models = TypeAdapter(List[DiabetesInput]).validate_python(good)
+    expected = np.array([[getattr(m, c) for c in INPUT_COLUMNS] for m in models], dtype=float)
+    np.testing.assert_array_equal(result.to_matrix(INPUT_COLUMNS), expected)
+
+    # Columnar and CSV bodies carry the same rows
+    columnar = {c: [row[c] for row in good] for c in INPUT_COLUMNS}
+    np.testing.assert_array_equal(parser.parse_json(json.dumps(columnar).encode()).to_matrix(INPUT_COLUMNS), expected)
+    csv_body = ",".join(INPUT_COLUMNS) + "\n" + "\n".join(
+        ",".join(str(m.model_dump()[c]) for c in INPUT_COLUMNS) for m in models
+    )
+    np.testing.assert_array_equal(parser.parse_csv(csv_body.encode()).to_matrix(INPUT_COLUMNS), expected)
+
+    bad = [
+        VALID,
+        {**VALID, "Glucose": -1},                 # below ge
+        {**VALID, "Age": 130, "BMI": None},       # above le + null
+        {k: v for k, v in VALID.items() if k != "Insulin"},  # missing field
+        {**VALID, "Pregnancies": 1.5},            # fractional int
+        {**VALID, "BMI": "abc"},                  # unparsable
+        "not a patient",                          # not an object
+    ]
+    result = parser.parse_rows(bad)
+    assert not result.ok
+    got = sorted((tuple(err["loc"]), err["type"]) for err in result.errors)
+    assert got == pydantic_errors(bad)
+
+
+def test_bulk_parser_csv_missing_columns():
+    """Test that a CSV without the required columns is rejected up front."""
+    with pytest.raises(KeyError):
+        BulkParser(DiabetesInput).parse_csv(b"Glucose,Age\n100,30\n")
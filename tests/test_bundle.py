@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+from src.models.bundle import save_bundle, load_bundle
+from src.models.inference_pipeline import save_inference_pipeline
+from src.models.registry import load_artifact_set
+
+def test_bundle_round_trip_matches_pickled_pipeline(small_pipeline, tmp_path):
+    """
+    Test that the mmap bundle rebuilds a pipeline with the same version and
+    bit-identical probabilities, and that the registry serves it in bundle mode.
+    """
+    raw = pd.read_csv("data/diabetes.csv").drop(columns=["Outcome"])
+    X = raw[small_pipeline.input_columns].to_numpy(dtype=np.float64)[:500]
+
+    save_inference_pipeline(small_pipeline, str(tmp_path))
+    path = save_bundle(small_pipeline, str(tmp_path))
+    bundled = load_bundle(path)
+
+    assert bundled.version == small_pipeline.version
+    assert bundled._fingerprint() == small_pipeline.version
+    assert not bundled.forest.value.flags.writeable   # a view into the mapped file
+    np.testing.assert_array_equal(bundled.predict_proba(X), small_pipeline.predict_proba(X))
+
+    current = load_artifact_set(str(tmp_path), artifact_format="bundle")
+    assert current.model is None and current.pipeline.version == small_pipeline.version
+
+def test_api_import_skips_pandas_and_sklearn():
+    """Test that importing the API doesn't pull in the heavy training-side libraries."""
+    code = (
+        "import sys; import src.app.main; "
+        "print(','.join(m for m in ('pandas', 'sklearn', 'scipy') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
@@ -0,0 +1,48 @@
+import numpy as np
+from src.app.cache import PredictionCache, row_key, matrix_keys
+
+def test_prediction_cache_lru_ttl_and_invalidation():
+    """
+    Test that the cache evicts least-recently-used entries, expires old
+    ones, and empties itself when the artifact/threshold namespace changes.
+    """
+    now = [0.0]
+    cache = PredictionCache(max_entries=2, ttl_s=10, clock=lambda: now[0])
+    ns = ("v1", 0.4)
+
+    cache.put(b"a", 0.1, ns)
+    cache.put(b"b", 0.2, ns)
+    assert cache.get(b"a", ns) == 0.1      # "a" becomes most recently used
+    cache.put(b"c", 0.3, ns)               # evicts "b"
+    assert cache.get(b"b", ns) is None
+    assert cache.get(b"c", ns) == 0.3
+
+    now[0] = 11.0
+    assert cache.get(b"a", ns) is None     # expired
+
+    cache.put(b"d", 0.4, ns)
+    assert cache.get(b"d", ("v2", 0.4)) is None   # new model version
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["expirations"] == 1 and stats["invalidations"] == 1
+    assert stats["hits"] == 2
+
+def test_cache_keys_are_canonical():
+    """Test that ints vs floats and single rows vs batch rows hash identically."""
+    as_ints = np.array([1, 100, 70, 20, 50, 23, 0, 25])
+    as_floats = as_ints.astype(float)
+    as_floats[6] = -0.0
+    batch = np.vstack([np.zeros(8), as_floats])
+    assert row_key(as_ints) == row_key(as_floats) == matrix_keys(batch)[1]
+
+def test_late_write_from_the_old_version_is_dropped():
+    """Test that a result stored under the pre-reload namespace neither wipes nor replaces the new version's entries."""
+    cache = PredictionCache(max_entries=10, ttl_s=10)
+    old, new = ("v1", 0.4), ("v2", 0.4)
+    cache.put(b"a", 0.1, old)
+    assert cache.get(b"x", new) is None    # first lookup after the reload moves the namespace
+    cache.put(b"b", 0.2, new)
+    cache.put(b"c", 0.9, old)              # request that resolved v1 before the reload finishes late
+
+    assert cache.namespace == new and cache.get(b"b", new) == 0.2
+    assert cache.get(b"c", new) is None
+    assert cache.stats()["stale_writes"] == 1 and cache.stats()["invalidations"] == 1
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from src.models.bundle import load_bundle, save_bundle
+from src.models.early_exit import EarlyExitPlan
+from src.models.flat_forest import FlatForest
+
+def test_early_exit_labels_match_full_evaluation(small_pipeline):
+    """
+    Test that early-exit labels equal thresholding the full probability at
+    several thresholds (flat traversal and sklearn tree leaves), that the bounds
+    contain it, and that a larger forest stops before its last tree on most rows.
+    """
+    df = pd.read_csv("data/diabetes.csv")
+    X = df[small_pipeline.input_columns].to_numpy(dtype=np.float64)
+    features = small_pipeline.transform(X).copy()
+    model = RandomForestClassifier(n_estimators=60, max_depth=6, random_state=0).fit(features, df["Outcome"])
+    forest = FlatForest.from_sklearn(model)
+    X32 = features.astype(np.float32)
+    probabilities = forest.predict_proba(X32)[:, 1]
+
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    for plan, leaf_source in ((EarlyExitPlan(forest), None), (EarlyExitPlan.fit(forest, features), trees)):
+        for threshold in (0.2, 0.4, 0.5, 0.8):
+            labels, lower, upper, trees_used = plan.decide(forest, X32, threshold, leaf_source)
+            assert np.array_equal(labels, probabilities >= threshold)
+            assert np.all(lower <= probabilities + 1e-12) and np.all(probabilities <= upper + 1e-12)
+            assert np.all(trees_used <= forest.n_trees)
+        assert trees_used.mean() < forest.n_trees
+
+def test_single_row_walk_matches_full_evaluation(small_pipeline):
+    """Test that the per-row walk used for single requests gives the full-evaluation label and stops early."""
+    df = pd.read_csv("data/diabetes.csv")
+    features = small_pipeline.transform(df[small_pipeline.input_columns].to_numpy(dtype=np.float64)).copy()
+    model = RandomForestClassifier(n_estimators=60, max_depth=6, random_state=0).fit(features, df["Outcome"])
+    forest = FlatForest.from_sklearn(model)
+    X32 = features.astype(np.float32)[:300]
+    probabilities = forest.predict_proba(X32)[:, 1]
+    plan = EarlyExitPlan.fit(forest, features)
+
+    for threshold in (0.2, 0.4, 0.8):
+        rows = [plan.decide(forest, X32[i:i + 1], threshold) for i in range(len(X32))]
+        labels, lower, upper, trees_used = (np.concatenate(column) for column in zip(*rows))
+        assert np.array_equal(labels, probabilities >= threshold)
+        assert np.all(lower <= probabilities + 1e-12) and np.all(probabilities <= upper + 1e-12)
+        assert trees_used.mean() < forest.n_trees
+        full = trees_used == forest.n_trees
+        assert np.allclose(lower[full], probabilities[full], rtol=0, atol=1e-12)  # exact, not a bound
+
+def test_pipeline_decide_and_bundle(small_pipeline, tmp_path):
+    """Test the pipeline-level decide() against predict_proba and that bundles keep the tree order."""
+    X = pd.read_csv("data/diabetes.csv")[small_pipeline.input_columns].to_numpy(dtype=np.float64)[:100]
+    small_pipeline.fit_exit_order(small_pipeline.transform(X).copy())
+    labels = small_pipeline.decide(X, 0.4)[0]
+    assert np.array_equal(labels, small_pipeline.predict_proba(X) >= 0.4)
+
+    bundled = load_bundle(save_bundle(small_pipeline, str(tmp_path)))
+    assert np.array_equal(bundled.exit_plan.order, small_pipeline.exit_plan.order)
+    assert np.array_equal(bundled.decide(X, 0.4)[0], labels)
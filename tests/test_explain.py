@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+from src.models.bundle import load_bundle, save_bundle
+
+def saabas_reference(model, features: np.ndarray) -> np.ndarray:
+    """Contributions from walking each sklearn tree's decision path (slow, per row)."""
+    contributions = np.zeros(features.shape)
+    X32 = features.astype(np.float32)
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        value = tree.value[:, 0, :] / tree.value[:, 0, :].sum(axis=1, keepdims=True)
+        paths = estimator.decision_path(X32)
+        for i in range(features.shape[0]):
+            nodes = paths.indices[paths.indptr[i]:paths.indptr[i + 1]]
+            for parent, child in zip(nodes[:-1], nodes[1:]):
+                contributions[i, tree.feature[parent]] += value[child, 1] - value[parent, 1]
+    return contributions / len(model.estimators_)
+
+def test_explanations_add_up_and_match_tree_paths(small_pipeline, tmp_path):
+    """
+    Test that bias + contributions reproduces the probability, that the
+    precomputed table matches a per-row walk of sklearn's decision paths,
+    that the raw-field rollup keeps the total, and that bundles keep the table.
+    """
+    raw = pd.read_csv("data/diabetes.csv").drop(columns=["Outcome"])
+    X = raw[small_pipeline.input_columns].to_numpy(dtype=np.float64)[:40]
+
+    probabilities, bias, contributions = small_pipeline.explain(X)
+    assert contributions.shape == (40, len(small_pipeline.columns))
+    assert np.allclose(bias + contributions.sum(axis=1), probabilities)
+    assert np.allclose(probabilities, small_pipeline.predict_proba(X))
+
+    features = small_pipeline.transform(X).copy()
+    assert np.allclose(contributions, saabas_reference(small_pipeline.model, features))
+
+    raw_contributions = contributions @ small_pipeline.raw_rollup()
+    assert raw_contributions.shape == (40, 8)
+    assert np.allclose(raw_contributions.sum(axis=1), contributions.sum(axis=1))
+
+    bundled = load_bundle(save_bundle(small_pipeline, str(tmp_path)))
+    assert np.allclose(bundled.explain(X)[2], contributions)
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+from sklearn.experimental import enable_iterative_imputer
+from sklearn.impute import IterativeImputer
+from src.data.fast_impute import FastImputer
+from src.data.preprocess import create_missing_indicators, MISSING_COLS
+
+def _imputer_inputs():
+    raw = pd.read_csv("data/diabetes.csv").drop(columns=["Outcome"])
+    X = create_missing_indicators(raw)
+    for col in MISSING_COLS:
+        X[col] = X[col].replace(0, np.nan)
+    return X.iloc[:600], X.iloc[600:]
+
+def test_fast_imputer_matches_iterative_imputer():
+    """
+    Test both inference engines against IterativeImputer.transform on a
+    held-out set: complete rows must come back untouched, imputed rows within
+    tolerance (exact replay and the precomputed fixed-point maps).
+    """
+    X_train, X_test = _imputer_inputs()
+    imputer = IterativeImputer(max_iter=10, random_state=42).fit(X_train)
+    reference = imputer.transform(X_test)
+    complete = ~X_test.isna().any(axis=1).to_numpy()
+
+    exact = FastImputer(imputer, mode="exact")
+    out = exact.transform(X_test)
+    assert np.array_equal(out[complete], X_test.to_numpy()[complete])
+    np.testing.assert_allclose(out, reference, rtol=0, atol=1e-9)
+
+    fixed_point = FastImputer(imputer, mode="fixed_point")
+    assert fixed_point.verify(imputer, X_test, atol=1e-6) <= 1e-6
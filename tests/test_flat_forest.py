@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from src.models.flat_forest import FlatForest
+
+def test_flat_forest_matches_predict_proba():
+    """
+    Test that the flat-array evaluator reproduces RandomForestClassifier.predict_proba
+    exactly, for a batch and for a single row.
+    """
+    df = pd.read_csv("data/diabetes.csv")
+    X, y = df.drop(columns=["Outcome"]).to_numpy(dtype=float), df["Outcome"].to_numpy()
+    model = RandomForestClassifier(n_estimators=20, max_depth=10, random_state=42).fit(X, y)
+    forest = FlatForest.from_sklearn(model)
+
+    assert np.array_equal(forest.predict_proba(X), model.predict_proba(X))
+    assert np.array_equal(forest.predict_proba(X[:1]), model.predict_proba(X[:1]))
+    assert np.array_equal(forest.predict(X), model.predict(X))
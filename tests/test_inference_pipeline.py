@@ -0,0 +1,44 @@
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.experimental import enable_iterative_imputer
+from sklearn.impute import IterativeImputer
+from sklearn.ensemble import RandomForestClassifier
+from src.data.preprocess import create_missing_indicators, MISSING_COLS
+from src.features.build_features import build_features, feature_engineering
+from src.models.inference_pipeline import InferencePipeline, save_inference_pipeline
+
+def test_inference_pipeline_matches_stagewise_path(tmp_path, monkeypatch):
+    """
+    Test that the fused pipeline gives the same probabilities as
+    preprocess -> build_features -> predict_proba, batched and row by row.
+    """
+    monkeypatch.setattr("src.features.build_features.ARTIFACTS_DIR", str(tmp_path))
+    df = pd.read_csv("data/diabetes.csv")
+    raw, y = df.drop(columns=["Outcome"]), df["Outcome"]
+
+    X = create_missing_indicators(raw)
+    for col in MISSING_COLS:
+        X[col] = X[col].replace(0, np.nan)
+    imputer = IterativeImputer(max_iter=5, random_state=42).fit(X)
+    X_clean = pd.DataFrame(imputer.transform(X), columns=X.columns)
+    X_clean['Insulin'] = X_clean['Insulin'].clip(lower=1.0)
+
+    X_scaled, _ = build_features(X_clean, is_training=True)
+    scaler = joblib.load(tmp_path / "scaler.pkl")
+    columns = list(feature_engineering(X_clean).columns)
+    model = RandomForestClassifier(n_estimators=10, max_depth=6, random_state=42).fit(X_scaled, y)
+
+    pipeline = InferencePipeline(imputer=imputer, scaler=scaler, columns=columns, model=model)
+    expected = model.predict_proba(X_scaled)[:, 1]
+    raw_matrix = raw.to_numpy(dtype=float)
+
+    np.testing.assert_allclose(pipeline.predict_proba(raw_matrix), expected, atol=1e-12)
+    single = np.array([pipeline.predict_proba(raw_matrix[i:i + 1])[0] for i in range(50)])
+    np.testing.assert_allclose(single, expected[:50], atol=1e-12)
+
+    # A memory-mapped reload (shared read-only pages across workers) scores identically
+    path = save_inference_pipeline(pipeline, str(tmp_path))
+    mapped = joblib.load(path, mmap_mode="r")
+    assert isinstance(mapped.forest.threshold, np.memmap)
+    np.testing.assert_array_equal(mapped.predict_proba(raw_matrix), pipeline.predict_proba(raw_matrix))
@@ -0,0 +1,32 @@
+from fastapi.testclient import TestClient
+from src.app.main import app
+from src.app.metrics import MetricsRegistry
+
+def test_histogram_renders_cumulative_prometheus_buckets():
+    """Test that histogram buckets are cumulative and _sum/_count are exported per label."""
+    registry = MetricsRegistry()
+    latency = registry.histogram("stage_seconds", "Stage latency.", (0.001, 0.01), ("stage",))
+    for value in (0.0005, 0.005, 0.5):
+        latency.observe(value, "model")
+    text = registry.render()
+
+    assert 'stage_seconds_bucket{stage="model",le="0.001"} 1' in text
+    assert 'stage_seconds_bucket{stage="model",le="0.01"} 2' in text
+    assert 'stage_seconds_bucket{stage="model",le="+Inf"} 3' in text
+    assert 'stage_seconds_count{stage="model"} 3' in text
+
+def test_metrics_endpoint_reports_requests_and_stages():
+    """Test that /metrics exposes request counts and per-stage timings after a prediction."""
+    client = TestClient(app)
+    payload = {
+        "Pregnancies": 2, "Glucose": 120, "BloodPressure": 72,
+        "SkinThickness": 25, "Insulin": 80, "BMI": 31.0,
+        "DiabetesPedigreeFunction": 0.5, "Age": 41
+    }
+    assert client.post("/predict/batch", json=[payload]).status_code == 200
+    text = client.get("/metrics").text
+
+    assert 'http_requests_total{route="/predict/batch",status="200"}' in text
+    for stage in ("parse", "preprocess", "features", "scaling", "model", "serialize"):
+        assert f'inference_stage_duration_seconds_count{{stage="{stage}"}}' in text
+    assert 'inference_batch_rows_count{source="batch"}' in text
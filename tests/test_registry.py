@@ -0,0 +1,47 @@
+import os
+import time
+import types
+import joblib
+from src.models.registry import ArtifactRegistry
+from src.models.inference_pipeline import PIPELINE_FILE
+
+
+def _publish(artifacts_dir, tag):
+    """Writes a fake inference pipeline whose parts are just tagged strings."""
+    pipeline = types.SimpleNamespace(
+        imputer=f"imputer-{tag}", scaler=f"scaler-{tag}", columns=["col_a", "col_b"],
+        model=f"model-{tag}", forest=f"forest-{tag}", version=tag,
+    )
+    joblib.dump(pipeline, os.path.join(artifacts_dir, PIPELINE_FILE))
+
+
+def test_registry_loads_once_and_hot_reloads(tmp_path):
+    """
+    Test that the registry hands out the same objects on every call and
+    swaps in a new artifact set only when the published files change.
+    """
+    _publish(tmp_path, "v1")
+    registry = ArtifactRegistry(str(tmp_path))
+
+    first = registry.get()
+    assert first is registry.get()
+    assert first.model == "model-v1"
+    assert registry.reload_if_changed() is False
+
+    time.sleep(0.01)
+    _publish(tmp_path, "v2")
+    assert registry.reload_if_changed() is True
+
+    second = registry.get()
+    assert second.pipeline.version == "v2"
+    assert second.version != first.version
+    # The old snapshot is untouched for requests still holding it
+    assert first.imputer == "imputer-v1"
+
+    # A candidate is loaded without being served until it is published
+    time.sleep(0.01)
+    _publish(tmp_path, "v3")
+    candidate = registry.load_if_changed()
+    assert candidate.pipeline.version == "v3" and registry.get() is second
+    registry.publish(candidate)
+    assert registry.get() is candidate and registry.load_if_changed() is None
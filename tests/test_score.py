@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+from score import score_file
+from src.models.inference_pipeline import save_inference_pipeline
+
+def test_score_file_keeps_row_order_across_workers(tmp_path, small_pipeline):
+    """
+    Test that sharded scoring over a process pool returns the same
+    predictions, in input order, as scoring the whole file in one batch.
+    """
+    save_inference_pipeline(small_pipeline, str(tmp_path))
+    raw = pd.read_csv("data/diabetes.csv").drop(columns=["Outcome"])
+    expected = small_pipeline.predict_proba(raw.to_numpy(dtype=np.float64))
+
+    stats = score_file("data/diabetes.csv", str(tmp_path / "scores.parquet"), str(tmp_path), workers=2, shard_size=100)
+    scores = pd.read_parquet(tmp_path / "scores.parquet")
+
+    assert stats["rows"] == 768 and stats["shards"] == 8
+    np.testing.assert_allclose(scores["probability"], expected, rtol=1e-6)
+    assert scores["prediction"].tolist() == (expected >= 0.40).astype(int).tolist()
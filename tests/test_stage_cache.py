@@ -0,0 +1,54 @@
+import os
+import shutil
+from src.pipeline.stage_cache import StageCache
+
+def test_stage_cache_hits_restore_outputs_and_artifacts(tmp_path):
+    """
+    Test that an unchanged stage is served from the cache (artifact files
+    restored after the artifacts folder is wiped), while new params or
+    --force rerun it.
+    """
+    artifacts_dir = tmp_path / "artifacts"
+    calls = []
+
+    def fit(values, scale=1):
+        calls.append(scale)
+        os.makedirs(artifacts_dir, exist_ok=True)
+        (artifacts_dir / "fitted.txt").write_text(f"scale={scale}")
+        return [v * scale for v in values]
+
+    def run(force=(), scale=1):
+        cache = StageCache(cache_dir=str(tmp_path / "cache"), artifacts_dir=str(artifacts_dir), force=force)
+        output, _ = cache.run(
+            "fit", fit, args=([1, 2],), kwargs={"scale": scale},
+            input_hashes=["data-v1"], params={"scale": scale}, artifacts=["fitted.txt"],
+        )
+        return output, cache.records[0]["status"]
+
+    assert run() == ([1, 2], "miss")
+    shutil.rmtree(artifacts_dir)
+    assert run() == ([1, 2], "hit")
+    assert (artifacts_dir / "fitted.txt").read_text() == "scale=1"
+    assert run(scale=3) == ([3, 6], "miss")
+    assert run(force=["fit"]) == ([1, 2], "forced")
+    assert calls == [1, 3, 1]
+
+def test_stage_cache_misses_when_a_code_dependency_changes(tmp_path, monkeypatch):
+    """Test that editing a module listed in `code=` (not the stage function's own file) invalidates the stage."""
+    import importlib
+    (tmp_path / "recipe_module.py").write_text("EDGES = [18.5, 25.0]\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    recipe = importlib.import_module("recipe_module")
+
+    def bin_values(values):
+        return [sum(v > edge for edge in recipe.EDGES) for v in values]
+
+    def run():
+        cache = StageCache(cache_dir=str(tmp_path / "cache"), artifacts_dir=str(tmp_path / "artifacts"))
+        cache.run("features", bin_values, args=([20.0, 30.0],), input_hashes=["data-v1"], code=[recipe])
+        return cache.records[0]["status"]
+
+    assert run() == "miss"
+    assert run() == "hit"
+    (tmp_path / "recipe_module.py").write_text("EDGES = [18.5, 24.9]\n")
+    assert run() == "miss"
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from src.data.load_data import load_data_chunks
+from src.data.streaming import stream_transform
+
+def test_stream_transform_matches_in_memory_transform(tmp_path, small_pipeline):
+    """
+    Test that chunked ingestion uses compact dtypes and that the streamed,
+    incrementally written output equals transforming the whole file at once.
+    """
+    df = pd.read_csv("data/diabetes.csv")
+    raw, y = df.drop(columns=["Outcome"]), df["Outcome"]
+
+    first = next(load_data_chunks("data/diabetes.csv", chunk_size=100))
+    assert len(first) == 100
+    assert first["Age"].dtype == np.float32 and first["BMI"].dtype == np.float32
+
+    stats = stream_transform("data/diabetes.csv", str(tmp_path / "out.csv"), pipeline=small_pipeline, chunk_size=100)
+    streamed = pd.read_csv(tmp_path / "out.csv")
+    expected = small_pipeline.transform(raw.to_numpy(dtype=np.float64)).astype(np.float32)
+
+    assert stats == {**stats, "rows": 768, "chunks": 8}
+    np.testing.assert_allclose(streamed[small_pipeline.columns].to_numpy(), expected, rtol=1e-6, atol=1e-6)
+    assert streamed["Outcome"].tolist() == y.tolist()
+
+def test_stream_transform_accepts_blank_cells(tmp_path, small_pipeline):
+    """Test that empty fields in a CSV export stream through as NaN (imputed like in memory) instead of failing."""
+    raw = pd.read_csv("data/diabetes.csv").head(20)
+    raw.loc[3, "Glucose"] = np.nan
+    raw.loc[5, "Insulin"] = np.nan
+    raw.loc[7, "Outcome"] = np.nan
+    raw.to_csv(tmp_path / "blanks.csv", index=False)
+    assert ",," in (tmp_path / "blanks.csv").read_text()
+
+    chunk = next(load_data_chunks(str(tmp_path / "blanks.csv"), chunk_size=100))
+    assert np.isnan(chunk.loc[3, "Glucose"]) and chunk["Outcome"].isna().sum() == 1
+
+    stream_transform(str(tmp_path / "blanks.csv"), str(tmp_path / "out.csv"), pipeline=small_pipeline, chunk_size=8)
+    streamed = pd.read_csv(tmp_path / "out.csv")
+    expected = small_pipeline.transform(
+        raw[small_pipeline.input_columns].to_numpy(dtype=np.float64)
+    ).astype(np.float32)
+    np.testing.assert_allclose(streamed[small_pipeline.columns].to_numpy(), expected, rtol=1e-6, atol=1e-6)
+
+def test_fit_streaming_matches_in_memory_fit(tmp_path, monkeypatch):
+    """
+    Test that the two-pass out-of-core fit (reservoir holding every row)
+    produces the same columns, imputer, scaler and drift reference profile
+    as the in-memory path.
+    """
+    import joblib
+    from src.data.preprocess import preprocess_data, mark_missing
+    from src.data.streaming import fit_streaming
+    from src.features.build_features import build_features
+    from src.monitoring.drift import load_reference_profile
+
+    monkeypatch.setattr("src.data.preprocess.ARTIFACTS_DIR", str(tmp_path / "memory"))
+    monkeypatch.setattr("src.features.build_features.ARTIFACTS_DIR", str(tmp_path / "memory"))
+    raw = pd.read_csv("data/diabetes.csv").drop(columns=["Outcome"])
+    build_features(preprocess_data(raw, is_training=True), is_training=True)
+
+    fit_streaming("data/diabetes.csv", str(tmp_path / "stream"), chunk_size=100, reservoir_size=1000)
+
+    load = lambda kind, name: joblib.load(tmp_path / kind / name)
+    assert load("stream", "columns.pkl") == load("memory", "columns.pkl")
+    marked = mark_missing(raw.astype(float))
+    np.testing.assert_allclose(
+        load("stream", "mice_imputer.pkl").transform(marked),
+        load("memory", "mice_imputer.pkl").transform(marked), rtol=1e-9,
+    )
+    np.testing.assert_allclose(load("stream", "scaler.pkl").mean_, load("memory", "scaler.pkl").mean_, rtol=1e-9)
+    np.testing.assert_allclose(load("stream", "scaler.pkl").scale_, load("memory", "scaler.pkl").scale_, rtol=1e-9)
+    streamed, in_memory = load_reference_profile(tmp_path / "stream"), load_reference_profile(tmp_path / "memory")
+    assert streamed["columns"] == in_memory["columns"]
+    for col in in_memory["columns"]:
+        np.testing.assert_allclose(streamed["features"][col]["edges"], in_memory["features"][col]["edges"], rtol=1e-9)
+        assert streamed["features"][col]["missing_rate"] == in_memory["features"][col]["missing_rate"]
@@ -0,0 +1,22 @@
+import pandas as pd
+from src.models.tune_model import tune_hyperparameters
+
+def test_parallel_search_matches_serial_search():
+    """
+    Test that the process-pool search scores every (params, threshold)
+    trial exactly like the in-process run and picks a grid candidate at
+    the served threshold (which is scored even if not listed).
+    """
+    df = pd.read_csv("data/diabetes.csv")
+    X, y = df.drop(columns=["Outcome"]), df["Outcome"]
+    grid = {"n_estimators": [10], "max_depth": [3, 6]}
+
+    serial = tune_hyperparameters(X, y, grid=grid, thresholds=[0.5], n_folds=3, n_workers=1)
+    parallel = tune_hyperparameters(X, y, grid=grid, thresholds=[0.5], n_folds=3, n_workers=2)
+
+    assert len(parallel["trials"]) == 4
+    assert [t["cv_f1"] for t in parallel["trials"]] == [t["cv_f1"] for t in serial["trials"]]
+    assert parallel["best_params"]["max_depth"] in (3, 6)
+    assert parallel["best_threshold"] == 0.4
+    served = [t for t in parallel["trials"] if t["threshold"] == 0.4]
+    assert parallel["best_cv_f1"] == max(t["cv_f1"] for t in served)
@@ -0,0 +1,45 @@
+import contextlib
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.validate_data import DIABETES_ENGINE, validate_data, validate_data_with_ge, validate_file
+
+def _verdict(fn, df):
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            fn(df)
+            return "pass"
+        except ValueError:
+            return "fail"
+
+@pytest.mark.parametrize("column, corrupt", [
+    (None, None),
+    ("Age", lambda col: np.where(np.arange(len(col)) < 62, 150, col)),        # 8% out of range
+    ("Age", lambda col: np.where(np.arange(len(col)) < 30, 150, col)),        # within mostly=0.95
+    ("Glucose", lambda col: col + 120),                                       # column min too high
+    ("Outcome", lambda col: np.where(np.arange(len(col)) == 5, 2, col)),      # not in set
+    ("BMI", lambda col: np.where(np.arange(len(col)) % 2 == 0, np.nan, col)), # nulls are ignored
+    ("Insulin", lambda col: col.clip(upper=100).astype("int8")),              # dtype not in list
+])
+def test_native_engine_matches_great_expectations(column, corrupt):
+    """Test that the vectorized engine reaches the same verdict as the GE suite."""
+    df = pd.read_csv("data/diabetes.csv")
+    if column is not None:
+        df[column] = corrupt(df[column])
+    assert _verdict(validate_data, df) == _verdict(validate_data_with_ge, df)
+
+def test_streaming_validation_matches_whole_frame(tmp_path):
+    """Test that chunked validation reports the same counts and global sample rows."""
+    df = pd.read_csv("data/diabetes.csv")
+    df.loc[[10, 500, 700], "Outcome"] = 3
+    df.to_csv(tmp_path / "data.csv", index=False)
+
+    whole = DIABETES_ENGINE.validate(df).to_dict()
+    with contextlib.redirect_stdout(io.StringIO()):
+        streamed = validate_file(str(tmp_path / "data.csv"), chunk_size=100).to_dict()
+
+    assert streamed == whole
+    outcome = next(r for r in streamed["results"] if r["rule"].startswith("Outcome in"))
+    assert outcome["unexpected_count"] == 3
+    assert [s["row"] for s in outcome["sample_rows"]] == [10, 500, 700]